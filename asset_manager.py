@@ -0,0 +1,282 @@
+import os
+import json
+import mmap
+import time
+import struct
+from pathlib import Path
+from collections import namedtuple
+
+import pygame
+
+import telemetry
+
+# --- CONFIGURATION ---
+BASE_DIR = Path(__file__).resolve().parent
+SCALE_MODES = {
+    "smooth": pygame.transform.smoothscale,  # Filtered; used for art shown much smaller than its source.
+    "fast": pygame.transform.scale,          # Nearest-neighbour; matches the old transform.scale calls.
+}
+FALLBACK_SIZE = (10, 10)
+BAKED_DIR = "assets/baked"          # Output of bake_assets.py.
+BAKED_INDEX = "atlas_index.json"
+BAKED_VERSION = 1
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# One image a screen will ask for; screens publish lists of these so they can be preloaded.
+AssetRequest = namedtuple("AssetRequest", "path size mode alpha fallback", defaults=(None, "smooth", True, None))
+
+# --- ASSET MANAGER ---
+class AssetManager:
+    """
+    Loads every image and sound once and hands out shared, display-ready copies.
+
+    Surfaces are cached by (path, size, scale mode, alpha), so the same asset
+    requested by several screens (or by the same screen on every visit) is
+    decoded, converted and scaled exactly once. Cached surfaces are shared:
+    callers must treat them as read-only and copy() before mutating.
+    """
+    def __init__(self, base_dir=BASE_DIR):
+        self.base_dir = Path(base_dir)
+        self.surfaces = {}   # (path, size, mode, alpha) -> pygame.Surface
+        self.sounds = {}     # (path, volume) -> pygame.mixer.Sound or None
+        self.sizes = {}      # path -> source (width, height)
+        self.atlases = []    # Baked atlas surfaces (and the mmaps backing raw ones) still borrowed by the cache.
+
+    def resolve(self, path):
+        """Returns an absolute path for a repo-relative asset path."""
+        path = Path(path)
+        return path if path.is_absolute() else self.base_dir / path
+
+    # --- Images ---
+    def image(self, path, size=None, mode="smooth", alpha=True, fallback=None):
+        """
+        Returns the image at `path`, converted for the display and scaled to `size`.
+        If the file cannot be loaded and `fallback` is an RGB(A) color, a solid
+        surface of that color is cached and returned instead of raising.
+        """
+        key = self.key_for(path, size, mode, alpha)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self._load(path, key[1], mode, alpha, fallback)
+            self.surfaces[key] = surface
+        return surface
+
+    def request(self, req):
+        """Returns the image described by an AssetRequest."""
+        return self.image(*req)
+
+    def key_for(self, path, size=None, mode="smooth", alpha=True):
+        """Returns the normalized cache key for an image request."""
+        size = (int(size[0]), int(size[1])) if size else None
+        if size and size == self.source_size(path, default=(0, 0)):
+            size = None  # Already the right size: share one entry whatever the scale mode.
+        return (str(path), size, mode if size else None, alpha)
+
+    def decode(self, key, source=None):
+        """
+        Loads and scales the image for a cache key without touching the display.
+        Safe to call from worker threads; the result still needs adopt().
+        An already-decoded `source` surface may be passed to skip the file read.
+        """
+        path, size, mode, _ = key
+        started = time.perf_counter()
+        img = source if source is not None else pygame.image.load(self.resolve(path).as_posix())
+        self.sizes[path] = img.get_size()
+        if size and size != img.get_size():
+            if mode == "smooth" and img.get_bitsize() < 24:
+                # smoothscale takes 24/32-bit surfaces only: widen paletted and grayscale
+                # PNGs first (a blit works without a display and keeps a colorkey as alpha).
+                wide = pygame.Surface(img.get_size(), pygame.SRCALPHA, 32)
+                wide.blit(img, (0, 0))
+                img = wide
+            img = SCALE_MODES[mode](img, size)
+        telemetry.emit("asset", path=path, size=size, ms=round((time.perf_counter() - started) * 1000, 3),
+                       decoded=source is None)
+        return img
+
+    def adopt(self, key, surface):
+        """Converts a decoded (or atlas) surface for the display and caches it (main thread only)."""
+        if pygame.display.get_surface():
+            surface = surface.convert_alpha() if key[3] else surface.convert()
+        self.surfaces[key] = surface
+        return surface
+
+    def fit(self, path, box, mode="smooth", alpha=True, fallback=None):
+        """Returns the image scaled to fit inside `box` while keeping its aspect ratio."""
+        return self.image(path, self.fit_size(path, box, fallback is not None), mode, alpha, fallback)
+
+    def fit_size(self, path, box, allow_missing=False):
+        """The size fit() scales an image to, computed from its header."""
+        iw, ih = self.source_size(path, FALLBACK_SIZE if allow_missing else None)
+        s = min(box[0] / iw, box[1] / ih)
+        return (int(iw * s), int(ih * s))
+
+    def _load(self, path, size, mode, alpha, fallback):
+        started = time.perf_counter()
+        try:
+            img = pygame.image.load(self.resolve(path).as_posix())
+        except (pygame.error, FileNotFoundError) as exc:
+            if fallback is None:
+                raise
+            # Log a warning but do not crash if an optional asset is missing.
+            print(f"[assets] warning ({path}): {exc}")
+            telemetry.emit("asset", path=str(path), size=size, missing=True, error=str(exc))
+            img = pygame.Surface(size or FALLBACK_SIZE, pygame.SRCALPHA)
+            img.fill(fallback)
+            return img
+
+        self.sizes[str(path)] = img.get_size()
+        if pygame.display.get_surface():
+            img = img.convert_alpha() if alpha else img.convert()
+        if size and size != img.get_size():
+            if mode == "smooth" and img.get_bitsize() < 24:
+                # smoothscale takes 24/32-bit surfaces only: widen paletted and grayscale
+                # PNGs first (a blit works without a display and keeps a colorkey as alpha).
+                wide = pygame.Surface(img.get_size(), pygame.SRCALPHA, 32)
+                wide.blit(img, (0, 0))
+                img = wide
+            img = SCALE_MODES[mode](img, size)
+        telemetry.emit("asset", path=str(path), size=size, ms=round((time.perf_counter() - started) * 1000, 3))
+        return img
+
+    def source_size(self, path, default=None):
+        """
+        Returns the unscaled (width, height) of an image.
+        PNG dimensions are read from the file header, without decoding any pixels.
+        """
+        key = str(path)
+        if key in self.sizes:
+            return self.sizes[key]
+        try:
+            with open(self.resolve(path), "rb") as fh:
+                header = fh.read(24)
+            if header[:8] == PNG_SIGNATURE and header[12:16] == b"IHDR":
+                size = struct.unpack(">II", header[16:24])
+            else:
+                size = pygame.image.load(self.resolve(path).as_posix()).get_size()
+        except (OSError, pygame.error):
+            if default is None:
+                raise
+            return default
+        self.sizes[key] = size
+        return size
+
+    # --- Baked atlases ---
+    def load_baked(self, baked_dir=BAKED_DIR, use_raw=True):
+        """
+        Fills the cache from the atlases written by bake_assets.py.
+
+        Raw RGBA blobs are memory-mapped and wrapped without decoding; otherwise
+        the atlas PNGs are loaded. Entries whose source file changed since the
+        bake are skipped (they load normally on request). Returns the number of
+        cache entries filled.
+
+        The trade-off is a copy for speed: with a display, every entry is
+        converted to the display's pixel format (what every blit of it wants),
+        and the atlases and mappings are then released, so memory holds the
+        converted surfaces only. Without a display the entries stay
+        subsurfaces of the atlases, which keep their mappings.
+        """
+        baked_dir = self.resolve(baked_dir)
+        try:
+            with open(baked_dir / BAKED_INDEX, encoding="utf-8") as fh:
+                index = json.load(fh)
+        except (OSError, ValueError):
+            return 0
+        if index.get("version") != BAKED_VERSION:
+            return 0
+
+        fresh = {}
+        for path, info in index["sources"].items():
+            try:
+                stat = os.stat(self.resolve(path))
+            except OSError:
+                continue
+            if stat.st_mtime == info["mtime"] and stat.st_size == info["bytes"]:
+                fresh[path] = tuple(info["size"])
+
+        atlases = []
+        for info in index["atlases"]:
+            size = tuple(info["size"])
+            raw = baked_dir / info["raw"] if use_raw and "raw" in info else None
+            if raw is not None and raw.exists():
+                with open(raw, "rb") as fh:
+                    blob = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+                atlas = pygame.image.frombuffer(blob, size, "RGBA")  # Borrows the mapping.
+            else:
+                atlas, blob = pygame.image.load((baked_dir / info["file"]).as_posix()), None
+            atlases.append((atlas, blob))
+
+        filled = 0
+        for entry in index["entries"]:
+            path = entry["path"]
+            if path not in fresh:
+                continue
+            size = tuple(entry["size"]) if entry["size"] else None
+            key = (path, size, entry["mode"], entry["alpha"])
+            if key in self.surfaces:
+                continue
+            self.sizes[path] = fresh[path]
+            self.adopt(key, atlases[entry["atlas"]][0].subsurface(pygame.Rect(entry["rect"])))
+            filled += 1
+
+        if pygame.display.get_surface():
+            # Every entry is a converted copy now: drop the atlas surfaces, which
+            # borrow the mappings, then unmap the blobs instead of keeping their pages resident.
+            blobs = [blob for _, blob in atlases if blob is not None]
+            atlases.clear()
+            for blob in blobs:
+                blob.close()
+        else:
+            self.atlases.extend(atlases)
+        return filled
+
+    # --- Sounds ---
+    def sound(self, path, volume=1.0):
+        """Returns a cached Sound at the given volume, or None if audio is unavailable."""
+        key = (str(path), volume)
+        if key not in self.sounds:
+            try:
+                snd = pygame.mixer.Sound(self.resolve(path).as_posix())
+                snd.set_volume(volume)
+            except (pygame.error, FileNotFoundError):
+                snd = None
+            self.sounds[key] = snd
+        return self.sounds[key]
+
+    # --- Bookkeeping ---
+    def memory_usage(self):
+        """Returns [(key, bytes)] for every cached surface, largest first."""
+        usage = [
+            (key, surf.get_width() * surf.get_height() * surf.get_bytesize())
+            for key, surf in self.surfaces.items()
+        ]
+        return sorted(usage, key=lambda item: item[1], reverse=True)
+
+    def total_bytes(self):
+        """Total pixel memory held by the surface cache."""
+        return sum(nbytes for _, nbytes in self.memory_usage())
+
+    def clear(self):
+        """Drops every cached surface and sound (e.g. after the display mode changes)."""
+        self.surfaces.clear()
+        self.sounds.clear()
+
+# --- SHARED INSTANCE ---
+ASSETS = AssetManager()
+
+def image(path, size=None, mode="smooth", alpha=True, fallback=None):
+    """Shortcut for ASSETS.image()."""
+    return ASSETS.image(path, size, mode, alpha, fallback)
+
+def fit(path, box, mode="smooth", alpha=True, fallback=None):
+    """Shortcut for ASSETS.fit()."""
+    return ASSETS.fit(path, box, mode, alpha, fallback)
+
+def source_size(path, default=None):
+    """Shortcut for ASSETS.source_size()."""
+    return ASSETS.source_size(path, default)
+
+def sound(path, volume=1.0):
+    """Shortcut for ASSETS.sound()."""
+    return ASSETS.sound(path, volume)
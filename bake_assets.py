@@ -0,0 +1,136 @@
+"""
+Offline asset bake.
+
+Pre-scales every image the game requests to the exact size it is drawn at and
+packs the results into a few RGBA atlases plus a JSON rect index. At startup
+asset_manager.AssetManager.load_baked() slices the atlases straight into the
+surface cache, so no source PNG is decoded or rescaled at runtime:
+
+    python bake_assets.py            # assets/baked/atlas_N.png + atlas_index.json
+    python bake_assets.py --raw      # also write uncompressed, mmap-able atlas_N.rgba blobs
+
+Re-run it after changing any art or layout size; stale entries (source file
+changed since the bake) are ignored at runtime and loaded the slow way.
+"""
+import os
+import sys
+import json
+import argparse
+
+import pygame
+
+import headless
+import asset_manager
+
+DEFAULT_OUT_DIR = asset_manager.BAKED_DIR
+MAX_ATLAS_SIZE = 2048
+PADDING = 1  # Transparent gutter between packed images.
+
+# --- PACKING ---
+def pack_shelves(sizes, max_size=MAX_ATLAS_SIZE, padding=PADDING):
+    """
+    Packs rectangles into as few atlases as needed with a simple shelf packer.
+    Returns [(atlas index, x, y)] in input order and the list of atlas sizes.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (sizes[i][1], sizes[i][0]), reverse=True)
+    placements = [None] * len(sizes)
+    atlases = []  # {"shelves": [[y, height, cursor_x]], "next_y", "width"}
+
+    def place(atlas, w, h):
+        for shelf in atlas["shelves"]:
+            if h <= shelf[1] and shelf[2] + w <= max_size:
+                x, shelf[2] = shelf[2], shelf[2] + w
+                atlas["width"] = max(atlas["width"], shelf[2])
+                return x, shelf[0]
+        if atlas["next_y"] + h <= max_size and w <= max_size:
+            y = atlas["next_y"]
+            atlas["shelves"].append([y, h, w])
+            atlas["next_y"] += h
+            atlas["width"] = max(atlas["width"], w)
+            return 0, y
+        return None
+
+    for i in order:
+        w, h = sizes[i][0] + padding, sizes[i][1] + padding
+        for index, atlas in enumerate(atlases):
+            spot = place(atlas, w, h)
+            if spot:
+                placements[i] = (index, *spot)
+                break
+        else:
+            atlases.append({"shelves": [], "next_y": 0, "width": 0})
+            placements[i] = (len(atlases) - 1, *place(atlases[-1], w, h))
+    return placements, [(a["width"], a["next_y"]) for a in atlases]
+
+# --- BAKE ---
+def collect_requests():
+    """Every image request the game makes, at the default 1280x720 layout."""
+    import preload
+    from main import menu_asset_requests
+    return preload.collect_requests(headless.SCREEN_SIZE, menu_asset_requests(), include_special=True)
+
+def bake(out_dir=DEFAULT_OUT_DIR, write_raw=False, max_size=MAX_ATLAS_SIZE):
+    """Renders all requests into atlases and writes the index. Returns the index dict."""
+    manager = asset_manager.AssetManager()
+    os.makedirs(out_dir, exist_ok=True)
+
+    images, skipped = [], []
+    for req in collect_requests():
+        key = manager.key_for(req.path, req.size, req.mode, req.alpha)
+        try:
+            images.append((key, manager.decode(key)))
+        except (pygame.error, OSError) as exc:
+            skipped.append((req.path, str(exc)))
+
+    placements, atlas_sizes = pack_shelves([surf.get_size() for _, surf in images], max_size)
+    atlases = [pygame.Surface(size, pygame.SRCALPHA) for size in atlas_sizes]
+    for atlas in atlases:
+        atlas.fill((0, 0, 0, 0))
+
+    entries, sources = [], {}
+    for (key, surf), (index, x, y) in zip(images, placements):
+        atlas = atlases[index]
+        atlas.blit(surf, (x, y))
+        path, size, mode, alpha = key
+        entries.append({
+            "path": path, "size": size, "mode": mode, "alpha": alpha,
+            "atlas": index, "rect": [x, y, *surf.get_size()],
+        })
+        stat = os.stat(manager.resolve(path))
+        sources[path] = {"mtime": stat.st_mtime, "bytes": stat.st_size, "size": manager.sizes[path]}
+
+    atlas_info = []
+    for index, atlas in enumerate(atlases):
+        png_name = f"atlas_{index}.png"
+        pygame.image.save(atlas, os.path.join(out_dir, png_name))
+        info = {"file": png_name, "size": list(atlas.get_size())}
+        if write_raw:
+            raw_name = f"atlas_{index}.rgba"
+            with open(os.path.join(out_dir, raw_name), "wb") as fh:
+                fh.write(pygame.image.tobytes(atlas, "RGBA"))
+            info["raw"] = raw_name
+        atlas_info.append(info)
+
+    index = {"version": asset_manager.BAKED_VERSION, "atlases": atlas_info, "entries": entries, "sources": sources}
+    with open(os.path.join(out_dir, asset_manager.BAKED_INDEX), "w", encoding="utf-8") as fh:
+        json.dump(index, fh, indent=1)
+    return index, skipped
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-scale and pack every game image into atlases.")
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help="Output directory (default assets/baked).")
+    parser.add_argument("--raw", action="store_true", help="Also write uncompressed RGBA blobs for mmap loading.")
+    parser.add_argument("--max-size", type=int, default=MAX_ATLAS_SIZE, help="Maximum atlas edge in pixels.")
+    args = parser.parse_args(argv)
+
+    headless.enable_dummy_drivers()
+    index, skipped = bake(args.out, args.raw, args.max_size)
+    pixels = sum(w * h for w, h in (a["size"] for a in index["atlases"]))
+    print(f"baked {len(index['entries'])} images into {len(index['atlases'])} atlases "
+          f"({pixels * 4 / 2**20:.1f}MiB RGBA) in {args.out}")
+    for path, error in skipped:
+        print(f"  skipped {path}: {error}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
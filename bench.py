@@ -0,0 +1,325 @@
+"""
+Benchmark suite for the generation, rendering and game-frame hot paths.
+
+Runs headless (SDL dummy drivers) with pinned seeds, at several board sizes
+and snake counts, and reports ops/s, p50/p95 latency and peak traced memory
+per benchmark. Results can be saved as a baseline; later runs are compared
+against it and the process exits non-zero when a benchmark's p50 regresses
+by more than the threshold:
+
+    python bench.py --save-baseline
+    python bench.py --threshold 0.15
+    python bench.py --filter render_board
+    python bench.py --filter backend.frame  # surface vs texture render backends
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from contextlib import contextmanager
+
+import headless
+
+DEFAULT_BASELINE = "bench_baseline.json"
+DEFAULT_THRESHOLD = 0.20   # Allowed p50 slowdown before a benchmark counts as regressed.
+MIN_SECONDS = 0.5          # Minimum timed duration per benchmark.
+MIN_ROUNDS = 5
+WARMUP_ROUNDS = 2
+MEMORY_ROUNDS = 3          # Calls made under tracemalloc (kept separate from timing).
+SEED = 1234
+
+CELL_SIZES = (40, 60, 80)
+SNAKE_COUNTS = (4, 8, 12)
+BEZIER_SEGMENTS = (1, 3, 6)
+PLAYER_COUNTS = (2, 4)
+FRAME_SCENES = ("main_menu", "select_player", "game")
+RENDER_BACKENDS = ("surface", "texture")
+PARTICLE_COUNTS = (500, 2000, 4000)
+
+# --- HELPERS ---
+@contextmanager
+def board_geometry(cell_size=None, snakes=None):
+    """Temporarily changes the generator's cell size and/or snake count."""
+    import board_generator as bg
+    saved = (bg.CELL_SIZE, bg.WIDTH, bg.HEIGHT, bg.MIN_SNAKES_TO_GENERATE, bg.MAX_SNAKES_TO_GENERATE)
+    try:
+        if cell_size is not None:
+            bg.CELL_SIZE = cell_size
+            bg.WIDTH = bg.HEIGHT = cell_size * bg.GRID_SIZE + bg.MARGIN * 2
+        if snakes is not None:
+            bg.MIN_SNAKES_TO_GENERATE = bg.MAX_SNAKES_TO_GENERATE = snakes
+        yield bg
+    finally:
+        (bg.CELL_SIZE, bg.WIDTH, bg.HEIGHT,
+         bg.MIN_SNAKES_TO_GENERATE, bg.MAX_SNAKES_TO_GENERATE) = saved
+
+def measure(fn, min_seconds=MIN_SECONDS):
+    """Times fn() repeatedly and returns ops/s, latency percentiles and peak memory."""
+    for _ in range(WARMUP_ROUNDS):
+        fn()
+
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < MIN_ROUNDS or time.perf_counter() - start < min_seconds:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    for _ in range(MEMORY_ROUNDS):
+        fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "rounds": len(samples),
+        "ops_per_sec": len(samples) / sum(samples),
+        "p50_ms": 1000 * pick(0.50),
+        "p95_ms": 1000 * pick(0.95),
+        "peak_kib": peak / 1024,
+    }
+
+# --- BENCHMARKS ---
+def bench_generate_board_state(snakes):
+    def setup():
+        headless.seed_everything(SEED)
+        def run():
+            with board_geometry(snakes=snakes) as bg:
+                bg.generate_board_state()
+        return run
+    return setup
+
+def bench_render_board_surface(cell_size):
+    def setup():
+        import pygame
+        with board_geometry(cell_size=cell_size) as bg:
+            headless.seed_everything(SEED)
+            state = bg.generate_board_state()
+            target = pygame.Surface((bg.WIDTH, bg.HEIGHT), pygame.SRCALPHA)
+        def run():
+            with board_geometry(cell_size=cell_size):
+                bg.render_board_surface(*state, target_surface=target, background_color=(0, 0, 0, 0))
+        return run
+    return setup
+
+def bench_draw_board(cell_size):
+    def setup():
+        import pygame
+        with board_geometry(cell_size=cell_size) as bg:
+            target = pygame.Surface((bg.WIDTH, bg.HEIGHT))
+        def run():
+            with board_geometry(cell_size=cell_size):
+                bg.draw_board(target)
+        return run
+    return setup
+
+def bench_draw_snake(snakes):
+    def setup():
+        import pygame
+        with board_geometry(snakes=snakes) as bg:
+            headless.seed_everything(SEED)
+            _, _, defs, curves, patterns, _ = bg.generate_board_state()
+            heads = [bg.load_snake_head(d["head_path"], d["colors"][0]) for d in defs]
+            target = pygame.Surface((bg.WIDTH, bg.HEIGHT), pygame.SRCALPHA)
+        def run():
+            for snake_def, curve, head, pattern in zip(defs, curves, heads, patterns):
+                bg.draw_snake(target, curve, snake_def["colors"], head, pattern)
+        return run
+    return setup
+
+def bench_cubic_bezier(segments):
+    def setup():
+        import board_generator as bg
+        rng = random.Random(SEED)
+        points = [(rng.uniform(50, 650), rng.uniform(50, 650)) for _ in range(segments * 3 + 1)]
+        return lambda: bg.cubic_bezier(points)
+    return setup
+
+def bench_game_draw(players):
+    def setup():
+        import pygame
+        from game import SnakeLaddersGame
+        screen = pygame.display.get_surface()
+        headless.seed_everything(SEED)
+        infos = [{"avatar": headless.DEFAULT_AVATARS[i % 4]} for i in range(players)]
+        game = SnakeLaddersGame(screen, infos, mode="special", time_source=headless.VirtualClock())
+        return game.draw
+    return setup
+
+def bench_snake_layer(snakes):
+    def setup():
+        import snake_animation
+        with board_geometry(snakes=snakes):
+            layer = snake_animation.generate_animated_board_assets((640, 640), seed=SEED)[1]
+        clock = iter(range(10 ** 9))
+        return lambda: layer.frame(next(clock) / 60)
+    return setup
+
+def bench_particles(count):
+    def setup():
+        import pygame
+        from particles import ParticleSystem
+        screen = pygame.display.get_surface()
+        system = ParticleSystem(seed=SEED)
+        # Very long lives keep the pool at count for the whole run.
+        for style in system.styles.values():
+            style.life = (1e6, 1e6)
+        for i, style in enumerate(("confetti", "dust", "sparkle")):
+            system.emit(style, (640, 360), count // 3 + (count % 3 if i == 0 else 0), spread=300)
+        def frame():
+            system.update(1 / 60)
+            system.draw(screen)
+        return frame
+    return setup
+
+def bench_frame(scene, backend):
+    """A full frame (draw + present) of one screen through one render_backend backend."""
+    def setup():
+        import pygame
+        import render_backend
+        from scenes import SceneManager
+        screen = pygame.display.get_surface()
+        headless.seed_everything(SEED)
+        if backend == "texture":
+            # SDL's software renderer: the comparison needs no GPU.
+            target = render_backend.TextureBackend(size=headless.SCREEN_SIZE, software=True, hidden=True)
+        else:
+            target = render_backend.SurfaceBackend(screen)
+        manager = SceneManager(screen)
+        if scene == "game":
+            from game import SnakeLaddersGame
+            infos = [{"avatar": avatar} for avatar in headless.DEFAULT_AVATARS]
+            draw = SnakeLaddersGame(screen, infos, mode="special", time_source=headless.VirtualClock()).draw
+        elif scene == "main_menu":
+            from main import MainMenuScene
+            draw = MainMenuScene(manager).draw
+        else:
+            from select_player import PlayerSelectScene
+            draw = PlayerSelectScene(manager).draw
+        def frame():
+            draw(target)
+            target.present()
+        return frame
+    return setup
+
+def bench_snapshot(action):
+    def setup():
+        import snapshot
+        import game_state
+        from game import SnakeLaddersGame
+        import pygame
+        infos = [{"avatar": headless.DEFAULT_AVATARS[i]} for i in range(4)]
+        game = SnakeLaddersGame(pygame.display.get_surface(), infos, mode="special",
+                                time_source=headless.VirtualClock(), seed=SEED)
+        game.state.rolls = 60  # A late-game snapshot: restore replays 60 rolls of rng draws.
+        data = snapshot.take_snapshot(game)
+        if action == "take":
+            return lambda: snapshot.take_snapshot(game)
+        def restore():
+            snap = snapshot.read_snapshot(data)
+            game_state.rng_after(snap.seed, snap.mode, snap.rolls)
+            snapshot.board_layout(snap)
+        return restore
+    return setup
+
+def bench_board_optimizer(action):
+    def setup():
+        import board_optimizer
+        from board_generator import generate_raw_layout
+        snakes, ladders, roles = generate_raw_layout(SEED)
+        if action == "score":
+            return lambda: board_optimizer.game_length(snakes, ladders)
+        return lambda: board_optimizer.optimize_board(snakes, ladders, 40.0, 18.0, seed=SEED, roles=roles)
+    return setup
+
+def build_suite():
+    """Returns an ordered mapping of benchmark name -> setup function."""
+    suite = {}
+    for n in SNAKE_COUNTS:
+        suite[f"generate_board_state[snakes={n}]"] = bench_generate_board_state(n)
+    for c in CELL_SIZES:
+        suite[f"render_board_surface[cell={c}]"] = bench_render_board_surface(c)
+    for c in CELL_SIZES:
+        suite[f"draw_board[cell={c}]"] = bench_draw_board(c)
+    for n in SNAKE_COUNTS:
+        suite[f"draw_snake[snakes={n}]"] = bench_draw_snake(n)
+    for k in BEZIER_SEGMENTS:
+        suite[f"cubic_bezier[segments={k}]"] = bench_cubic_bezier(k)
+    for p in PLAYER_COUNTS:
+        suite[f"SnakeLaddersGame.draw[players={p}]"] = bench_game_draw(p)
+    for n in SNAKE_COUNTS:
+        suite[f"SnakeLayer.frame[snakes={n}]"] = bench_snake_layer(n)
+    for n in PARTICLE_COUNTS:
+        suite[f"ParticleSystem.frame[particles={n}]"] = bench_particles(n)
+    for scene in FRAME_SCENES:
+        for backend in RENDER_BACKENDS:
+            suite[f"backend.frame[{scene},backend={backend}]"] = bench_frame(scene, backend)
+    suite["snapshot.take"] = bench_snapshot("take")
+    suite["snapshot.restore_logic"] = bench_snapshot("restore")
+    suite["board_optimizer.game_length"] = bench_board_optimizer("score")
+    suite["board_optimizer.optimize_board"] = bench_board_optimizer("optimize")
+    return suite
+
+# --- REPORTING ---
+def compare(results, baseline, threshold):
+    """Returns a list of (name, old_p50, new_p50) for benchmarks that regressed."""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old and result["p50_ms"] > old["p50_ms"] * (1 + threshold):
+            regressions.append((name, old["p50_ms"], result["p50_ms"]))
+    return regressions
+
+def format_row(name, result, old=None):
+    delta = ""
+    if old:
+        delta = f"  {100 * (result['p50_ms'] / old['p50_ms'] - 1):+6.1f}%"
+    return (f"{name:<40} {result['ops_per_sec']:>10.1f} ops/s  p50 {result['p50_ms']:>8.3f}ms  "
+            f"p95 {result['p95_ms']:>8.3f}ms  peak {result['peak_kib']:>8.1f}KiB{delta}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the generation and rendering hot paths.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file.")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Fail when p50 is this fraction slower than the baseline (default 0.20).")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this.")
+    parser.add_argument("--min-time", type=float, default=MIN_SECONDS, help="Seconds timed per benchmark.")
+    args = parser.parse_args(argv)
+
+    import pygame
+    headless.enable_dummy_drivers()
+    pygame.display.set_mode(headless.SCREEN_SIZE)
+
+    try:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)["results"]
+    except (OSError, ValueError, KeyError):
+        baseline = {}
+
+    results = {}
+    for name, setup in build_suite().items():
+        if args.filter not in name:
+            continue
+        results[name] = measure(setup(), args.min_time)
+        print(format_row(name, results[name], baseline.get(name)), flush=True)
+
+    if args.save_baseline:
+        merged = dict(baseline)
+        merged.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump({"seed": SEED, "results": merged}, fh, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, old, new in regressions:
+        print(f"REGRESSION {name}: p50 {old:.3f}ms -> {new:.3f}ms (threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -3,9 +3,13 @@ import random
 import math
 import numpy as np
 import os
+import time
 from pathlib import Path
-
-pygame.init()
+from contextlib import contextmanager
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asset_manager
+import telemetry
 
 # Configuration & Constants
 
@@ -60,6 +64,9 @@ MIN_ITEM_LENGTH_CELLS = 10
 SNAKE_MAX_X_DISTANCE_CELLS = 5
 LADDER_MAX_X_DISTANCE_CELLS = 5    # Maximum horizontal span for ladders to prevent them from looking too flat
 
+# Difficulty: (expected rolls to finish, spread) every board is tuned toward, or None for raw random boards
+TARGET_DIFFICULTY = (40.0, 18.0)
+
 # --- Feature Toggles (Debug & Display) ---
 GENERATE_BOARD_ON_STARTUP = True
 ENABLE_SPACEBAR_REGENERATION = True
@@ -73,9 +80,18 @@ LADDER_ON_TOP = False              # Render Order: If True, ladders are drawn ov
 # --- Quadrant Constants (For spatial distribution) ---
 TOP_LEFT, TOP_RIGHT, BOTTOM_LEFT, BOTTOM_RIGHT = 0, 1, 2, 3
 
+# --- Item Roles (the rules each item was placed under; see generate_random_positions) ---
+TOP_SNAKE = "top_snake"        # Critical snake starting on the top row.
+EARLY_LADDER = "early_ladder"  # Critical ladder near the start.
+SNAKE = "snake"                # Regular items, spread across the quadrants.
+LADDER = "ladder"
+
 # Cells where items cannot start or end (Start, Winner, etc.)
 FORBIDDEN_CELLS = {1, 2, 3, 99, 100}
 
+# Candidates thrown away while placing items and drawing curves (reported through telemetry).
+REJECTIONS = {"placement": 0, "curve": 0}
+
 
 # Helper Functions
 
@@ -83,32 +99,15 @@ def darken(color, factor=0.7):
     """Returns a darker version of the given RGB tuple."""
     return tuple(max(0, int(c * factor)) for c in color)
 
-# Cache for loaded images to prevent reloading from disk every frame
+# Snake heads come from the shared asset cache, so they are decoded and scaled once
 BASE_HEAD_SIZE = 50
-SNAKE_HEAD_CACHE: dict[str, pygame.Surface] = {}
 
 def load_snake_head(rel_path: str, fallback_color: tuple[int, int, int]) -> pygame.Surface:
     """
     Loads a snake head image from disk, resizing it to standard size.
     Returns a colored square if the image file is missing.
     """
-    if rel_path in SNAKE_HEAD_CACHE:
-        return SNAKE_HEAD_CACHE[rel_path]
-    
-    abs_path = BASE_DIR / rel_path
-    try:
-        img = pygame.image.load(abs_path.as_posix())
-        if pygame.display.get_surface():
-            img = img.convert_alpha()
-        head = pygame.transform.smoothscale(img, (BASE_HEAD_SIZE, BASE_HEAD_SIZE))
-    except Exception as exc:
-        # Log warning but do not crash if asset is missing
-        print(f"[snake-head] warning ({abs_path}): {exc}")
-        head = pygame.Surface((BASE_HEAD_SIZE, BASE_HEAD_SIZE), pygame.SRCALPHA)
-        head.fill(fallback_color)
-    
-    SNAKE_HEAD_CACHE[rel_path] = head
-    return head
+    return asset_manager.image(rel_path, (BASE_HEAD_SIZE, BASE_HEAD_SIZE), fallback=fallback_color)
 
 def draw_board(target_surface=None):
     """
@@ -116,6 +115,10 @@ def draw_board(target_surface=None):
     """
     surface = target_surface if target_surface is not None else pygame.Surface((WIDTH, HEIGHT))
     pastel_len = len(PASTEL_COLORS)
+    try:
+        font = pygame.font.SysFont("ArcadeClassic", 28)
+    except Exception:
+        font = pygame.font.Font(None, 24)
 
     def lighten(color, factor=0.2):
         return tuple(int(c + (255 - c) * factor) for c in color)
@@ -140,11 +143,6 @@ def draw_board(target_surface=None):
                 cell_num = (row_from_bottom * GRID_SIZE) + (GRID_SIZE - col)
             
             # Render Text
-            try:
-                font = pygame.font.SysFont("ArcadeClassic", 28)
-            except Exception:
-                font = pygame.font.Font(None, 24)
-            
             text = font.render(str(cell_num), True, (80, 80, 80))
             text_rect = text.get_rect(center=(x + CELL_SIZE/2, y + CELL_SIZE/2))
             surface.blit(text, text_rect)
@@ -240,6 +238,7 @@ def generate_items_in_quadrants(num_items, item_type, all_used_points, existing_
     
     for target_quadrant in targets:
         attempts = 300
+        placed = False
         while attempts > 0:
             attempts -= 1
             
@@ -287,7 +286,9 @@ def generate_items_in_quadrants(num_items, item_type, all_used_points, existing_
             existing_items_of_same_type.append((start, end))
             all_used_points.add(start)
             all_used_points.add(end)
+            placed = True
             break
+        REJECTIONS["placement"] += 300 - attempts - placed
             
     return items
 
@@ -295,11 +296,14 @@ def generate_random_positions(num_snakes, num_ladders, exclusion_radius):
     """
     Main coordinator for generating board logic.
     Guarantees specific difficultly features (e.g., top-row snakes).
+    Returns (snakes, ladders, roles); roles maps each item's start cell to the
+    role it was placed as (TOP_SNAKE, SNAKE, EARLY_LADDER or LADDER).
     """
     all_used_points = set()
     snakes = []
     ladders = []
     existing_items_of_same_type = []
+    top_row_snakes = 0
 
     # --- 1. Generate Critical Snakes (Top Row) ---
     if num_snakes > 0:
@@ -328,6 +332,7 @@ def generate_random_positions(num_snakes, num_ladders, exclusion_radius):
             all_used_points.add(end)
         
         existing_items_of_same_type.extend(snakes)
+        top_row_snakes = len(snakes)
 
         # --- 2. Generate Remaining Snakes ---
         remaining_snakes = num_snakes - len(snakes)
@@ -365,11 +370,14 @@ def generate_random_positions(num_snakes, num_ladders, exclusion_radius):
             first_ladder_generated = True
 
     # --- 4. Generate Remaining Ladders ---
+    early_ladders = len(ladders)
     remaining_ladders = num_ladders - len(ladders)
     if remaining_ladders > 0:
         ladders.extend(generate_items_in_quadrants(remaining_ladders, 'ladder', all_used_points, ladders, exclusion_radius))
-    
-    return snakes, ladders
+
+    roles = {start: TOP_SNAKE if i < top_row_snakes else SNAKE for i, (start, _) in enumerate(snakes)}
+    roles.update((start, EARLY_LADDER if i < early_ladders else LADDER) for i, (start, _) in enumerate(ladders))
+    return snakes, ladders, roles
 
 # Logic: Curve & Visual Generation
 
@@ -511,14 +519,112 @@ def draw_snake(surf, curve, colors, head_img, pattern_positions):
     surf.blit(rotated_head, rect)
 
 
-def generate_board_state():
-    """Generates all logic data for a new board (Snake positions, Ladder positions, etc.)."""
+@contextmanager
+def seeded_random(seed):
+    """
+    Seeds the random and numpy.random sources the generator draws from, and
+    restores their previous states afterwards, so one seed always yields the
+    same board without disturbing anyone else's random sequence.
+    """
+    global _active_seed
+    if seed is None:
+        yield
+        return
+    py_state, np_state = random.getstate(), np.random.get_state()
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+    outer_seed, _active_seed = _active_seed, seed
+    try:
+        yield
+    finally:
+        _active_seed = outer_seed
+        random.setstate(py_state)
+        np.random.set_state(np_state)
+
+# --- DIFFICULTY CALIBRATION ---
+# Calibrating a board (board_optimizer) only needs its raw positions and one
+# seed, so it can run ahead of time on a worker thread: prefetch_layout(seed)
+# starts it for a board that is about to be generated, and the generator then
+# picks up the finished result instead of calibrating on the spot.
+PREFETCHED_LAYOUTS = 8  # Calibrations kept, oldest dropped first.
+_active_seed = None  # Seed of the innermost seeded_random() block.
+_prefetched = OrderedDict()  # Board seed -> Future of its calibrated positions.
+_calibrator = None  # ThreadPoolExecutor, created on first prefetch.
+
+def _draw_positions():
+    """The raw snake and ladder positions, their roles and the calibration seed, drawn from the seeded rngs."""
     num_snakes_to_generate = np.random.randint(MIN_SNAKES_TO_GENERATE, MAX_SNAKES_TO_GENERATE + 1) if GENERATE_SNAKES else 0
     num_ladders = np.random.randint(MIN_LADDERS_TO_GENERATE, MAX_LADDERS_TO_GENERATE + 1) if GENERATE_LADDERS else 0
 
-    snake_positions, ladder_positions = generate_random_positions(
-        num_snakes_to_generate, num_ladders, EXCLUSION_ZONE_RADIUS
-    )
+    snake_positions, ladder_positions, roles = generate_random_positions(
+        num_snakes_to_generate, num_ladders, EXCLUSION_ZONE_RADIUS)
+    calibration_seed = random.getrandbits(32) if TARGET_DIFFICULTY is not None else None
+    return snake_positions, ladder_positions, roles, calibration_seed
+
+def _calibrate(snake_positions, ladder_positions, roles, calibration_seed):
+    """Tunes raw positions toward TARGET_DIFFICULTY (thread-safe: no shared rng)."""
+    from board_optimizer import optimize_board
+    snakes, ladders, _ = optimize_board(dict(snake_positions), dict(ladder_positions),
+                                        *TARGET_DIFFICULTY, seed=calibration_seed, roles=roles)
+    return list(snakes.items()), list(ladders.items())
+
+def prefetch_layout(seed):
+    """Starts calibrating the board seed will produce, on a worker thread. Call from the main thread."""
+    global _calibrator
+    if TARGET_DIFFICULTY is None or seed is None or seed in _prefetched:
+        return
+    with seeded_random(seed):
+        raw = _draw_positions()
+    if _calibrator is None:
+        import board_optimizer  # Imported here once, not by the worker mid-import.
+        _calibrator = ThreadPoolExecutor(max_workers=1, thread_name_prefix="board-calibration")
+    _prefetched[seed] = _calibrator.submit(_calibrate, *raw)
+    while len(_prefetched) > PREFETCHED_LAYOUTS:
+        _prefetched.popitem(last=False)
+
+def _generate_positions(calibrated=True):
+    """
+    Draws the snake and ladder (start, end) cells; the first thing a new board
+    consumes from the rngs. Unless calibrated is False, the board is then tuned
+    toward TARGET_DIFFICULTY, or the calibration prefetch_layout() started for
+    this seed is used.
+    """
+    snake_positions, ladder_positions, roles, calibration_seed = _draw_positions()
+    if TARGET_DIFFICULTY is None or not calibrated:
+        return snake_positions, ladder_positions
+    future = _prefetched.get(_active_seed)
+    if future is not None:
+        return future.result()  # Usually finished long ago; otherwise waits for the rest.
+    return _calibrate(snake_positions, ladder_positions, roles, calibration_seed)
+
+def generate_raw_layout(seed):
+    """
+    The uncalibrated snakes and ladders maps of the board seed produces, and
+    the role of each item by start cell (what board_optimizer needs).
+    """
+    with seeded_random(seed):
+        snake_positions, ladder_positions, roles, _ = _draw_positions()
+    return dict(snake_positions), dict(ladder_positions), roles
+
+def generate_board_layout(seed, calibrated=True):
+    """
+    The snakes and ladders maps of the board that seed produces, without
+    generating curves or rendering anything (for logic-only restores).
+    """
+    with seeded_random(seed):
+        snake_positions, ladder_positions = _generate_positions(calibrated)
+    return dict(snake_positions), dict(ladder_positions)
+
+def board_state(seed):
+    """generate_board_state() for seed; the result is plain data, so a worker process can return it."""
+    with seeded_random(seed):
+        return generate_board_state()
+
+def generate_board_state():
+    """Generates all logic data for a new board (Snake positions, Ladder positions, etc.)."""
+    started = time.perf_counter()
+    REJECTIONS["placement"] = REJECTIONS["curve"] = 0
+    snake_positions, ladder_positions = _generate_positions()
 
     num_snakes = len(snake_positions)
 
@@ -554,6 +660,7 @@ def generate_board_state():
             for existing_curve in snake_curves:
                 if do_curves_intersect(new_curve, existing_curve, SNAKE_MIN_BODY_DISTANCE):
                     is_valid_curve = False
+                    REJECTIONS["curve"] += 1
                     break
             
             if is_valid_curve:
@@ -568,6 +675,9 @@ def generate_board_state():
             snake_patterns.append(generate_pattern_positions(final_curve))
             snake_control_points.append(points)
 
+    telemetry.emit("board", ms=round((time.perf_counter() - started) * 1000, 3), snakes=len(snake_positions),
+                   ladders=len(ladder_positions), placement_rejections=REJECTIONS["placement"],
+                   curve_rejections=REJECTIONS["curve"], calibrated=TARGET_DIFFICULTY is not None)
     return snake_positions, ladder_positions, snake_defs, snake_curves, snake_patterns, snake_control_points
 
 
@@ -642,32 +752,45 @@ def render_board_surface(
     return surface
 
 
-def generate_space_board_assets():
+def generate_space_board_assets(include_curves=False, seed=None):
     """
     External API hook: Generates board logic and returns the rendered image surface
     plus mapping data (useful if importing this module into another game file).
+
+    With include_curves=True a fifth item is returned: a mapping of each snake's
+    head cell to its sampled body curve (head to tail, in board pixels), so
+    tokens can slide along the snake that was actually drawn. Passing a seed
+    makes the board reproducible (see seeded_random).
     """
-    snake_pos, ladder_pos, snake_defs, snake_curves, snake_patterns, snake_control_points = generate_board_state()
-    
-    board_surface = render_board_surface(
-        snake_pos,
-        ladder_pos,
-        snake_defs,
-        snake_curves,
-        snake_patterns,
-        snake_control_points,
-        draw_background=True,
-        ladder_on_top=LADDER_ON_TOP,
-        background_color=None,
-    ).convert_alpha()
+    with seeded_random(seed):
+        state = generate_board_state()
+    return board_assets(state, render_board_state(state).convert_alpha(), include_curves)
 
+def render_board_state(state):
+    """
+    Renders a generate_board_state() result the way generate_space_board_assets
+    does. It draws no random numbers, so it may run on a worker thread.
+    """
+    return render_board_surface(*state, draw_background=True, ladder_on_top=LADDER_ON_TOP, background_color=None)
+
+def board_assets(state, board_surface, include_curves=False):
+    """The generate_space_board_assets tuple for a board state and its rendered surface."""
+    snake_pos, ladder_pos, _, snake_curves, _, _ = state
+    snakes_map, ladders_map, grid_map, curves_map = board_maps(snake_pos, ladder_pos, snake_curves)
+    if include_curves:
+        return board_surface, snakes_map, ladders_map, grid_map, curves_map
+    return board_surface, snakes_map, ladders_map, grid_map
+
+def board_maps(snake_pos, ladder_pos, snake_curves):
+    """The (snakes, ladders, grid, curves) maps the game reads from a generated board."""
     snakes_map = {start: end for start, end in snake_pos}
     ladders_map = {start: end for start, end in ladder_pos}
     grid_map = {cell: grid_to_pixel(cell) for cell in range(1, GRID_SIZE * GRID_SIZE + 1)}
-    
-    return board_surface, snakes_map, ladders_map, grid_map
+    curves_map = {start: curve for (start, _), curve in zip(snake_pos, snake_curves)}
+    return snakes_map, ladders_map, grid_map, curves_map
 
 def main():
+    pygame.init()
     pygame.display.set_caption("Snake & Ladder Board Generator")
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     clock = pygame.time.Clock()
@@ -0,0 +1,278 @@
+"""
+Difficulty-targeted board search for special mode.
+
+A board's difficulty is scored analytically: one token's walk over the board
+is an absorbing Markov chain, so the expected number of rolls to reach 100
+and its standard deviation come from the chain's fundamental matrix instead
+of simulated games. Simulated annealing then moves snake and ladder
+endpoints, keeping every placement rule of board_generator (lengths,
+horizontal spans, exclusion zones, forbidden cells, the top-row snakes and
+the early ladder), until the board's scores are close to a target.
+
+The search never solves the chain again after the start. Moving one item
+only redirects the rolls that land on its old and new start cell, which is
+two rank-1 changes to the chain, so each candidate is scored by updating the
+fundamental matrix in place (Sherman-Morrison, a few 99x99 vector products)
+rather than by two fresh 99x99 solves. With the small step budget a whole
+calibration takes a few milliseconds. board_generator runs it on every
+special board when TARGET_DIFFICULTY is set, and callers that know the next
+board's seed can run it ahead of time (see board_generator.prefetch_layout):
+
+    python board_optimizer.py --seed 7 --mean 35 --spread 20
+"""
+import sys
+import math
+import time
+import random
+import argparse
+
+import numpy as np
+
+from rules import FINAL_CELL
+from game_state import ROLL_STRIDE, LANDINGS, jump_table, move_table
+from board_generator import (
+    cell_to_grid, get_quadrant, is_too_close, FORBIDDEN_CELLS, EXCLUSION_ZONE_RADIUS,
+    MIN_ITEM_LENGTH_CELLS, MAX_ITEM_LENGTH_CELLS, SNAKE_MAX_X_DISTANCE_CELLS, LADDER_MAX_X_DISTANCE_CELLS,
+    TOP_SNAKE, EARLY_LADDER, SNAKE, LADDER,
+)
+
+DEFAULT_STEPS = 120
+START_TEMPERATURE = 0.05
+END_TEMPERATURE = 0.0005
+SPREAD_WEIGHT = 0.5  # How much the spread counts against the mean in the score.
+TOLERANCE = 0.0004  # Stop early once the score is this close (about 2% off the target).
+MUTATION_ATTEMPTS = 50  # Tries at finding a rule-abiding new spot for one item.
+
+# The (start, end) ranges of each role the generator places items under.
+ROLE_RANGES = {
+    TOP_SNAKE: ((91, 100), (2, 80)),
+    EARLY_LADDER: ((4, 10), (20, 40)),
+    SNAKE: ((20, FINAL_CELL - 1), (2, FINAL_CELL - 20)),
+    LADDER: ((2, FINAL_CELL - 20), (20, 90)),
+}
+
+# --- ANALYTIC SCORING ---
+_TRANSIENT = FINAL_CELL - 1  # Cells 1-99; row i of the chain is cell i + 1.
+_ROWS = np.repeat(np.arange(_TRANSIENT), ROLL_STRIDE - 1) * (FINAL_CELL + 1)
+_IDENTITY = np.eye(_TRANSIENT)
+
+def game_length(snakes, ladders):
+    """
+    (mean, standard deviation) of the number of rolls one token needs to get
+    from cell 1 to 100 on this board, from the fundamental matrix N of the chain.
+    """
+    moves = np.frombuffer(move_table(jump_table(snakes, ladders)), dtype=np.uint8)
+    targets = moves.reshape(FINAL_CELL + 1, ROLL_STRIDE)[1:FINAL_CELL, 1:].ravel()
+    counts = np.bincount(_ROWS + targets, minlength=_TRANSIENT * (FINAL_CELL + 1))
+    q = counts.reshape(_TRANSIENT, FINAL_CELL + 1)[:, 1:FINAL_CELL] / 6
+    a = _IDENTITY - q
+    # Expected rolls from every cell (t = N 1), and row 1 of N for the variance
+    # 2 N t - t - t^2 at cell 1; two solves are cheaper than inverting.
+    expected = np.linalg.solve(a, np.ones(_TRANSIENT))
+    from_start = np.linalg.solve(a.T, _IDENTITY[0])
+    mean = float(expected[0])
+    variance = 2 * float(from_start @ expected) - mean - mean ** 2
+    return mean, math.sqrt(max(variance, 0.0))
+
+# Rolls from each transient cell that land (before any jump) on each cell 0-100.
+_LAND_COUNTS = np.zeros((_TRANSIENT, FINAL_CELL + 1))
+for _cell in range(1, FINAL_CELL):
+    for _roll in range(1, ROLL_STRIDE):
+        _LAND_COUNTS[_cell - 1, LANDINGS[_cell * ROLL_STRIDE + _roll]] += 1
+_LAND_COUNTS /= 6
+
+class _Chain:
+    """
+    The fundamental matrix N = (I - Q)^-1 of a board, kept up to date as jumps
+    are redirected, and the (mean, spread) it gives.
+    """
+    def __init__(self, snakes, ladders):
+        moves = np.frombuffer(move_table(jump_table(snakes, ladders)), dtype=np.uint8)
+        targets = moves.reshape(FINAL_CELL + 1, ROLL_STRIDE)[1:FINAL_CELL, 1:].ravel()
+        counts = np.bincount(_ROWS + targets, minlength=_TRANSIENT * (FINAL_CELL + 1))
+        q = counts.reshape(_TRANSIENT, FINAL_CELL + 1)[:, 1:FINAL_CELL] / 6
+        self.n = np.linalg.inv(_IDENTITY - q)
+
+    def stats(self, n=None):
+        n = self.n if n is None else n
+        expected = n.sum(axis=1)  # t = N 1.
+        mean = float(expected[0])
+        variance = 2 * float(n[0] @ expected) - mean - mean ** 2
+        return mean, math.sqrt(max(variance, 0.0))
+
+    @staticmethod
+    def redirect(n, cell, old, new):
+        """
+        N after rolls landing on cell go to new instead of old (a jump added,
+        moved or removed; a cell with no jump goes to itself). None if the
+        update is numerically unsafe.
+        """
+        if old == new:
+            return n
+        u = _LAND_COUNTS[:, cell]
+        nu = n @ u
+        # v = e_new - e_old over the transient cells 1-99 (100 absorbs, so it has no column).
+        v_nu, v_n = 0.0, np.zeros(_TRANSIENT)
+        if new < FINAL_CELL:
+            v_nu += nu[new - 1]
+            v_n += n[new - 1]
+        if old < FINAL_CELL:
+            v_nu -= nu[old - 1]
+            v_n -= n[old - 1]
+        denom = 1.0 - v_nu
+        if abs(denom) < 1e-9:
+            return None
+        return n + np.outer(nu / denom, v_n)
+
+    def moved(self, old_item, new_item):
+        """N with one item moved from (start, end) to (start, end), or None."""
+        (old_start, old_end), (new_start, new_end) = old_item, new_item
+        n = self.redirect(self.n, old_start, old_end, old_start)
+        return None if n is None else self.redirect(n, new_start, new_start, new_end)
+
+def board_score(stats, target_mean, target_spread):
+    """Squared relative distance of (mean, spread) from the target; 0 is a perfect fit."""
+    mean, spread = stats
+    score = ((mean - target_mean) / target_mean) ** 2
+    if target_spread:
+        score += SPREAD_WEIGHT * ((spread - target_spread) / target_spread) ** 2
+    return score
+
+# --- PLACEMENT RULES ---
+def _fits_alone(role, start, end):
+    """The rules an item must meet on its own (direction, ranges, length and span)."""
+    (s_lo, s_hi), (e_lo, e_hi) = ROLE_RANGES[role]
+    if not (s_lo <= start <= s_hi and e_lo <= end <= e_hi):
+        return False
+    if start in FORBIDDEN_CELLS or end in FORBIDDEN_CELLS:
+        return False
+    is_snake = role in (SNAKE, TOP_SNAKE)
+    if (start <= end) if is_snake else (start >= end):
+        return False
+    if not MIN_ITEM_LENGTH_CELLS <= abs(start - end) <= MAX_ITEM_LENGTH_CELLS:
+        return False
+    (r1, c1), (r2, c2) = cell_to_grid(start), cell_to_grid(end)
+    if abs(c1 - c2) > (SNAKE_MAX_X_DISTANCE_CELLS if is_snake else LADDER_MAX_X_DISTANCE_CELLS):
+        return False
+    # The generator skips this check for the early ladder only.
+    return role == EARLY_LADDER or max(abs(r1 - r2), abs(c1 - c2)) >= EXCLUSION_ZONE_RADIUS
+
+def fits(role, start, end, used_points, same_kind):
+    """True if an item may go at (start, end) next to the other items of the board."""
+    return (_fits_alone(role, start, end)
+            and start not in used_points and end not in used_points
+            and not is_too_close(start, end, same_kind, EXCLUSION_ZONE_RADIUS))
+
+# --- SEARCH ---
+def _placements():
+    """
+    Every (start, end) each role may take on its own, grouped by the quadrant
+    of the start (regular items stay in their quadrant so the board keeps its
+    spread; the critical items may go anywhere in their ranges).
+    """
+    pools = {}
+    for role, ((s_lo, s_hi), (e_lo, e_hi)) in ROLE_RANGES.items():
+        for start in range(s_lo, s_hi + 1):
+            quadrant = get_quadrant(start) if role in (SNAKE, LADDER) else None
+            pool = pools.setdefault((role, quadrant), [])
+            pool.extend((start, end) for end in range(e_lo, e_hi + 1) if _fits_alone(role, start, end))
+    return pools
+
+# Built once, so a proposal only checks the rules that depend on the other items.
+_POOLS = _placements()
+_ALLOWED = {key: frozenset(pool) for key, pool in _POOLS.items()}
+
+def _propose(items, index, rng):
+    """A new (start, end) for items[index] that keeps every rule, or None."""
+    role, start, end = items[index]
+    others = items[:index] + items[index + 1:]
+    used_points = {cell for _, s, e in others for cell in (s, e)}
+    is_snake = role in (SNAKE, TOP_SNAKE)
+    same_kind = [(s, e) for r, s, e in others if (r in (SNAKE, TOP_SNAKE)) == is_snake]
+    key = (role, get_quadrant(start) if role in (SNAKE, LADDER) else None)
+    pool, allowed = _POOLS[key], _ALLOWED[key]
+    for _ in range(MUTATION_ATTEMPTS):
+        if rng.random() < 0.5:
+            # Nudge both endpoints a little, which keeps most moves small.
+            placement = (start + rng.randint(-3, 3), end + rng.randint(-3, 3))
+            if placement not in allowed:
+                continue
+        else:
+            placement = pool[rng.randrange(len(pool))]
+        new_start, new_end = placement
+        if placement == (start, end) or new_start in used_points or new_end in used_points:
+            continue
+        if not is_too_close(new_start, new_end, same_kind, EXCLUSION_ZONE_RADIUS):
+            return placement
+    return None
+
+def _maps(items):
+    snakes = {s: e for role, s, e in items if role in (SNAKE, TOP_SNAKE)}
+    ladders = {s: e for role, s, e in items if role in (LADDER, EARLY_LADDER)}
+    return snakes, ladders
+
+def optimize_board(snakes, ladders, target_mean, target_spread=None, steps=DEFAULT_STEPS, seed=None, roles=None):
+    """
+    Anneals a board toward a target expected game length (rolls for one
+    token) and spread. Returns (snakes, ladders, (mean, spread)); the item
+    counts and roles of the input board are kept. roles maps start cells to
+    the role the generator placed each item as (board_generator's
+    generate_random_positions); items it does not list are regular ones.
+    """
+    rng = random.Random(seed)
+    roles = roles or {}
+    items = [(roles.get(s, SNAKE), s, e) for s, e in snakes.items()]
+    items += [(roles.get(s, LADDER), s, e) for s, e in ladders.items()]
+    if not items:
+        return dict(snakes), dict(ladders), game_length(snakes, ladders)
+
+    chain = _Chain(*_maps(items))
+    stats = chain.stats()
+    score = board_score(stats, target_mean, target_spread)
+    best = (score, list(items), stats)
+    cooling = (END_TEMPERATURE / START_TEMPERATURE) ** (1 / max(steps - 1, 1))
+    temperature = START_TEMPERATURE
+    for _ in range(steps):
+        index = rng.randrange(len(items))
+        proposal = _propose(items, index, rng)
+        if proposal is not None:
+            candidate = list(items)
+            candidate[index] = (items[index][0], *proposal)
+            cand_n = chain.moved(items[index][1:], proposal)
+            if cand_n is None:
+                cand_n = _Chain(*_maps(candidate)).n
+            cand_stats = chain.stats(cand_n)
+            cand_score = board_score(cand_stats, target_mean, target_spread)
+            if cand_score <= score or rng.random() < math.exp((score - cand_score) / temperature):
+                items, score, stats, chain.n = candidate, cand_score, cand_stats, cand_n
+                if score < best[0]:
+                    best = (score, list(items), stats)
+                    if score <= TOLERANCE:
+                        break
+        temperature *= cooling
+    score, items, stats = best
+    snakes, ladders = _maps(items)
+    return snakes, ladders, game_length(snakes, ladders)  # Exact, free of update round-off.
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune a generated board toward a target difficulty.")
+    parser.add_argument("--seed", type=int, default=0, help="Board seed to start from.")
+    parser.add_argument("--mean", type=float, default=35.0, help="Target expected rolls to finish.")
+    parser.add_argument("--spread", type=float, default=None, help="Target standard deviation of that.")
+    parser.add_argument("--steps", type=int, default=DEFAULT_STEPS)
+    args = parser.parse_args(argv)
+
+    from board_generator import generate_raw_layout
+    snakes, ladders, roles = generate_raw_layout(args.seed)
+    before = game_length(snakes, ladders)
+    start = time.perf_counter()
+    snakes, ladders, after = optimize_board(snakes, ladders, args.mean, args.spread, args.steps, args.seed, roles)
+    elapsed = time.perf_counter() - start
+    print(f"before: mean {before[0]:.1f} rolls, spread {before[1]:.1f}")
+    print(f"after:  mean {after[0]:.1f} rolls, spread {after[1]:.1f}  ({elapsed * 1000:.0f}ms, at most {args.steps} steps)")
+    print(f"snakes:  {dict(sorted(snakes.items()))}")
+    print(f"ladders: {dict(sorted(ladders.items()))}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,39 @@
+"""
+Presentation layer: every screen draws to one fixed logical surface and SDL
+scales it to the window.
+
+The display is opened with pygame.SCALED, so the game only ever renders
+LOGICAL_SIZE pixels; SDL's renderer stretches the finished frame to the
+window or the monitor (nearest-neighbour or linear filtering) and maps mouse
+positions back to logical coordinates. No Python code scales the full frame,
+so a 4K fullscreen frame costs the same CPU as a 720p window.
+"""
+import os
+
+import pygame
+
+LOGICAL_SIZE = (1280, 720)
+LOGICAL_WIDTH, LOGICAL_HEIGHT = LOGICAL_SIZE
+SCALE_QUALITIES = ("nearest", "linear")
+
+def open_window(caption, fullscreen=False, scale_quality="linear", vsync=True):
+    """
+    Opens the scaled game window (or fullscreen display) and returns the
+    LOGICAL_SIZE screen surface every scene draws to.
+    """
+    if scale_quality not in SCALE_QUALITIES:
+        raise ValueError(f"scale_quality must be one of {SCALE_QUALITIES}")
+    # SDL reads its render hints from the environment when the renderer is created.
+    os.environ["SDL_RENDER_SCALE_QUALITY"] = scale_quality
+    flags = pygame.SCALED | (pygame.FULLSCREEN if fullscreen else 0)
+    try:
+        screen = pygame.display.set_mode(LOGICAL_SIZE, flags, vsync=int(vsync))
+    except pygame.error:
+        # Some drivers cannot vsync a scaled renderer; scaling matters more.
+        screen = pygame.display.set_mode(LOGICAL_SIZE, flags)
+    pygame.display.set_caption(caption)
+    return screen
+
+def toggle_fullscreen():
+    """Switches between window and fullscreen; the logical surface stays the same."""
+    pygame.display.toggle_fullscreen()
@@ -1,81 +1,189 @@
-import pygame, sys, random, time, math
-from transitions import curtain_transition
-from board_generator import generate_space_board_assets
+import pygame, random, time, math, functools, sys, importlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from tweens import Track, slide_times
+import asset_manager
+from asset_manager import AssetRequest
+from rules import FINAL_CELL
+from game_state import GameState, MOVE_PATHS, initial_board_seed, move_index
+from scenes import Scene
+import telemetry
+import stats_store
+from timeline import Timeline
+from display import LOGICAL_SIZE
+from net_protocol import ERROR_TEXT
 
 # --- CONFIGURATION ---
-SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
+SCREEN_WIDTH, SCREEN_HEIGHT = LOGICAL_SIZE
 BOARD_POS = (80, 80)
 CLASSIC_BOARD_SIZE = (600, 600)
 SPACE_BOARD_SIZE = (640, 640)
 DICE_POS = (990, 250)
 TURN_TEXT_POS = (950, 500)
 FONT_COLOR = (255, 255, 255)
+BG_IMAGE = "assets/bg/bg_play.png"
+CLASSIC_BOARD_IMAGE = "assets/board/Board_with_number.png"
+BACK_BUTTON = ("assets/button/back.png", (100, 75))
+DICE_SIZE = (150, 150)
+GAME_OVER_HOLD = 1.0  # Seconds the winner text stays up before the exit transition.
+PLAYER_SIZE = (80, 80)
+DUST_PARTICLES = 40          # Puffed out when the dice land.
+SPARKLES_PER_FRAME = 3       # Trailed by a token climbing a ladder.
+CONFETTI_PARTICLES = 1500    # Launched across the bottom of the screen on a win.
+NOTICE_SECONDS = 2.0         # How long a server error (e.g. a rejected roll) stays under the dice.
+NOTICE_COLOR = (255, 110, 110)
+UNDO_KEY = pygame.K_LEFT     # Takes back the last turn (or cancels a roll in progress).
+REDO_KEY = pygame.K_RIGHT    # Steps forward again through turns taken back.
+BOARD_VIEWS_KEPT = 16        # Special boards kept for stepping back over (about 1.6 MB of board image each).
 
 # --- UTILITY FUNCTIONS ---
+def _no_lap(phase):
+    """Stand-in for FrameProfiler.lap when no profiler is attached."""
+
+@functools.lru_cache(maxsize=32)
+def render_text(font, text, color):
+    """A cached text render: the labels change a few times per game, not every frame,
+    and a texture backend then uploads each one once."""
+    return font.render(text, True, color)
+
+@functools.lru_cache(maxsize=None)
+def sys_font(name, size):
+    return pygame.font.SysFont(name, size)
+
 def load_image(path, size=None):
-    """Loads an image, converts it for performance, and optionally rescales it."""
-    img = pygame.image.load(path).convert_alpha()
-    if size:
-        img = pygame.transform.smoothscale(img, size)
-    return img
+    """Returns a cached, display-converted image, optionally rescaled (see asset_manager)."""
+    return asset_manager.image(path, size)
+
+def dice_image_path(face):
+    """Path of the isometric dice image for a face value (1-6)."""
+    return f"assets/Dice/Isometric/dice_{face}_iso.png"
+
+def panel_avatar_size(num_players):
+    """Side length of each avatar in the turn indicator panel."""
+    max_panel_width = 440 # Panel padding.
+    spacing = 10
+    avatar_size = (max_panel_width - (num_players - 1) * spacing) / num_players if num_players > 0 else 0
+    return int(min(avatar_size, 150)) # Cap avatar size.
+
+def generate_space_board_assets(include_curves=False, seed=None):
+    """board_generator.generate_space_board_assets, imported on first use (special mode only)."""
+    from board_generator import generate_space_board_assets
+    return generate_space_board_assets(include_curves, seed)
+
+def prefetch_board(seed):
+    """board_generator.prefetch_layout, imported on first use (special mode only)."""
+    from board_generator import prefetch_layout
+    prefetch_layout(seed)
+
+# Spare boards are generated off the frame loop: the board state (which draws
+# from the generator's global rngs) in a worker process, the imports and the
+# rendering on a worker thread. Both are created on first use.
+_spare_thread = None
+_spare_process = None
+
+def in_spare_thread(fn, *args):
+    """Runs fn(*args) on the spare-board thread; only for work that draws no random numbers."""
+    global _spare_thread
+    if _spare_thread is None:
+        _spare_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spare-board")
+    return _spare_thread.submit(fn, *args)
+
+def spare_board_state(seed):
+    """A future of board_generator.board_state(seed), generated in the spare-board process."""
+    global _spare_process
+    if _spare_process is None:
+        _spare_process = ProcessPoolExecutor(max_workers=1)
+    return _spare_process.submit(_board_state, seed)
+
+def _board_state(seed):
+    """Runs in the spare-board process, which imports the generator on its first board."""
+    from board_generator import board_state
+    return board_state(seed)
+
+def asset_requests(avatar_paths, player_counts=(2, 3, 4)):
+    """Every image a classic game session may load, for the startup preloader."""
+    requests = [
+        AssetRequest(BG_IMAGE, (SCREEN_WIDTH, SCREEN_HEIGHT)),
+        AssetRequest(CLASSIC_BOARD_IMAGE, CLASSIC_BOARD_SIZE),
+        AssetRequest(*BACK_BUTTON),
+    ]
+    requests += [AssetRequest(dice_image_path(i), DICE_SIZE) for i in range(1, 7)]
+    for path in avatar_paths:
+        requests.append(AssetRequest(path, PLAYER_SIZE))
+        requests += [AssetRequest(path, (size, size)) for size in map(panel_avatar_size, player_counts)]
+    return requests
+
+def special_asset_requests():
+    """The extra images special mode loads (snake heads); imports the board generator."""
+    from board_generator import SNAKE_DEFINITIONS, BASE_HEAD_SIZE
+    return [
+        AssetRequest(d["head_path"], (BASE_HEAD_SIZE, BASE_HEAD_SIZE), fallback=d["colors"][0])
+        for d in SNAKE_DEFINITIONS
+    ]
 
 # --- PLAYER CLASS ---
 class Player:
     """Represents a player in the game, handling their position, movement, and appearance."""
     def __init__(self, image_path, start_pos):
-        self.image = load_image(image_path, (80, 80))
-        self.pos = 1  # Current tile number (1-100).
+        self.image_path = image_path
+        self.image = load_image(image_path, PLAYER_SIZE)
         self.rect = self.image.get_rect(center=start_pos)
-        self.move_path = []  # A list of screen coordinates to follow.
+        self.track = None  # The Track currently being followed, if any.
         self.is_moving = False
-        self.move_speed = 10 # Pixels per frame.
 
     def draw(self, screen):
         """Draws the player's avatar on the screen."""
         screen.blit(self.image, self.rect)
 
-    def move_along_path(self, path):
-        """Sets the movement path for the player to follow."""
-        self.move_path = path
-        if path:
-            self.is_moving = True
+    def follow(self, track):
+        """Starts following a precomputed movement track."""
+        self.track = track
+        self.is_moving = track is not None and track.duration > 0
+        if track is not None and not self.is_moving:
+            self.rect.center = track.end
 
-    def update(self):
-        """Updates the player's position if they are currently moving."""
-        if not self.is_moving:
+    def move_along_path(self, path, now=None):
+        """Hops through a list of screen points, one tile at a time."""
+        if not path:
             return
+        now = time.time() if now is None else now
+        self.follow(Track(now, self.rect.center).add_hops(path))
 
-        if not self.move_path:
-            self.is_moving = False
+    def update(self, now=None):
+        """Places the player on its track for the given time."""
+        if not self.is_moving:
             return
 
-        # Move towards the next point in the path.
-        target_pos = self.move_path[0]
-        dx = target_pos[0] - self.rect.centerx
-        dy = target_pos[1] - self.rect.centery
-        dist = (dx**2 + dy**2)**0.5
-
-        if dist < self.move_speed:
-            # Snap to the target if close enough.
-            self.rect.center = target_pos
-            self.move_path.pop(0)
-        else:
-            # Move at a constant speed.
-            self.rect.centerx += (dx / dist) * self.move_speed
-            self.rect.centery += (dy / dist) * self.move_speed
+        now = time.time() if now is None else now
+        self.rect.center = self.track.position(now)
+        if self.track.finished(now):
+            self.track = None
+            self.is_moving = False
 
 # --- GAME CLASS ---
 class SnakeLaddersGame:
-    """Manages the main game logic, state, and rendering for Snakes and Ladders."""
-    def __init__(self, screen, players, mode="classic"):
+    """
+    Renders and animates a game_state.GameState, which holds the rules state
+    (positions, turn, board, seed and rolls); this class adds the pygame side.
+    """
+    def __init__(self, screen, players, mode="classic", time_source=time.time, board_assets=None, seed=None,
+                 animated_board=False):
         self.screen = screen
-        self.clock = pygame.time.Clock()
+        self.state = GameState(len(players), mode, seed)
+        self.recorder = None  # Optional replay.ReplayWriter.
+        self.remote = None  # Optional netclient.NetClient; the server then owns rolls and boards.
+        self.notice = None  # (text, shown until) for a server error, drawn under the dice.
+        self.now = time_source  # Clock used by all animations; swappable for headless runs.
+        self.profiler = None  # Optional FrameProfiler; draw() laps its phases when set.
+        self.stats = None  # Optional stats_store.StatsStore; the result is queued on it at game over.
         self.font = pygame.font.SysFont('Pixeltype', 48)
         self.mode_font = pygame.font.SysFont('Pixeltype', 32)
-        self.bg = load_image("assets/bg/bg_play.png", (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.bg = load_image(BG_IMAGE, (SCREEN_WIDTH, SCREEN_HEIGHT))
         self.board_size = CLASSIC_BOARD_SIZE
-        self.board = load_image("assets/board/Board_with_number.png", self.board_size)
-        self.mode = mode
+        self.board = None  # Set by _configure_layouts() for the selected mode.
+        self.board_assets = board_assets  # Pre-generated board for initial_board_seed(seed), used instead of generating one.
+        self.animated_board = animated_board and mode == "special"  # Swaying snakes (see snake_animation).
+        self.snake_layer = None  # snake_animation.SnakeLayer drawn over the board when animated.
 
         # Dice assets
         self.dice_imgs = []
@@ -84,80 +192,151 @@ class SnakeLaddersGame:
         # Game state
         self.tiles = self.generate_tiles(10, 10, BOARD_POS, self.board_size)
         self.players = [Player(p["avatar"], self.tiles[1]) for p in players]
-        self.current_turn = 0
+        self.hits = [[0, 0] for _ in players]  # [snakes, ladders] hit per seat, for the stats store.
         self.dice_rolling = False
         self.player_moving = False
         self.roll_time = 0
         self.roll_value = 1
-        self.after_move_check = False # Flag to check for snakes/ladders after a move.
+        self.after_move_check = False # Flag to check for a win after a move.
         self.game_over = False
-        self.winner = None
-
-        # Classic board snakes and ladders
-        self.ladders = { 17: 36, 35: 67, 40: 42, 58: 76, 59: 80, 71: 89 }
-        self.snakes  = { 31: 14, 48: 28, 56: 22, 73: 21, 82: 42, 92: 75, 98: 66 }
+        self.game_over_time = None
+        self.snake_curves = {}  # Snake head cell -> body curve in screen space.
+        from particles import ParticleSystem  # Imported here so NumPy stays out of startup.
+        self.particles = ParticleSystem()
+        self.particle_time = self.now()  # Time the particles were last advanced to.
+        self.started_at = self.now()
+        self.climb = None  # (start, end) times of the current ladder climb, for its sparkles.
+        self.timeline = Timeline(len(players))  # The last turns, for undo and stepping (see restore()).
+        self.board_views = OrderedDict()  # Board seed -> _board_view() of recent boards, so stepping over them is instant.
 
         # Configure board and assets based on game mode.
         self._configure_layouts()
-        if not self.dice_imgs:
-            self.dice_imgs = self._load_dice_images()
         self.current_dice = self.dice_imgs[0]
         self.board_rect = self.board.get_rect(topleft=BOARD_POS)
 
         # UI Elements
-        self.back_button_img = load_image("assets/button/back.png", (100, 75))
+        self.back_button_img = load_image(*BACK_BUTTON)
         self.back_button_rect = self.back_button_img.get_rect(topleft=(20, 5))
 
-        # Sound Effects
-        self.dice_sound = None
-        try:
-            self.dice_sound = pygame.mixer.Sound("assets/audio/shuffle.mp3")
-            self.dice_sound.set_volume(0.7)
-        except pygame.error:
-            self.dice_sound = None
+        # Turn-panel avatars (bright for the current player, dimmed otherwise), built once.
+        self.panel_avatars = self._build_panel_avatars()
 
-        self.win_sound = None
-        try:
-            self.win_sound = pygame.mixer.Sound("assets/audio/winner.mp3")
-            self.win_sound.set_volume(0.8)
-        except pygame.error:
-            self.win_sound = None
+        # Sound Effects (None if audio is unavailable).
+        self.dice_sound = asset_manager.sound("assets/audio/shuffle.mp3", 0.7)
+        self.win_sound = asset_manager.sound("assets/audio/winner.mp3", 0.8)
+        self.record_snapshot(roll=0)
+
+    # --- State view ---
+    @property
+    def mode(self):
+        return self.state.mode
+
+    @mode.setter
+    def mode(self, mode):
+        self.state.mode = mode
+
+    @property
+    def seed(self):
+        return self.state.seed
+
+    @property
+    def rng(self):
+        return self.state.rng
+
+    @property
+    def board_seed(self):
+        return self.state.board_seed
+
+    @property
+    def rolls(self):
+        return self.state.rolls
+
+    @property
+    def current_turn(self):
+        return self.state.turn
+
+    @current_turn.setter
+    def current_turn(self, seat):
+        self.state.turn = seat
+
+    @property
+    def winner(self):
+        return self.state.winner
+
+    @property
+    def snakes(self):
+        return self.state.snakes
+
+    @property
+    def ladders(self):
+        return self.state.ladders
+
+    def place_players(self):
+        """Puts every token on the tile of its cell in the state."""
+        for player, cell in zip(self.players, self.state.positions):
+            player.rect.center = self.tiles[cell]
+
+    @property
+    def seeded_board(self):
+        """True while the board in play is the one generated from board_seed (not the classic fallback)."""
+        return self.board_size == SPACE_BOARD_SIZE
+
+    def attach_recorder(self, recorder):
+        """Starts logging this game (seed, board in play, then every roll) to a replay.ReplayWriter."""
+        self.recorder = recorder
+        recorder.start_game(self.mode, len(self.players), self.seed)
+        recorder.board(self.board_seed if self.mode == "special" else 0, self.snakes, self.ladders)
 
     def _configure_layouts(self):
         """Prepares board assets and layout based on the selected game mode."""
         if self.mode != "special":
             # Use the standard classic board.
             self.board_size = CLASSIC_BOARD_SIZE
-            self.board = load_image("assets/board/Board_with_number.png", self.board_size)
+            self.board = load_image(CLASSIC_BOARD_IMAGE, self.board_size)
             self.tiles = self.generate_tiles(10, 10, BOARD_POS, self.board_size)
-            for player in self.players:
-                player.rect.center = self.tiles[player.pos]
+            self.place_players()
             self.dice_imgs = self._load_dice_images()
             return
 
         # For "special" mode, generate a new board layout.
         self.board_size = SPACE_BOARD_SIZE
         try:
-            board_surface, snakes_map, ladders_map, grid_map = generate_space_board_assets()
-            src_size = board_surface.get_size()
-            self.board = pygame.transform.smoothscale(board_surface, self.board_size)
-            if snakes_map: self.snakes = snakes_map
-            if ladders_map: self.ladders = ladders_map
+            board_assets, self.board_assets = self.board_assets, None
+            grid_map, src_size = self._use_special_board(board_assets)
             if grid_map:
                 self.tiles = self._tiles_from_generator(grid_map, src_size)
             else: # Fallback if grid map is missing
                 self.tiles = self.generate_tiles(10, 10, BOARD_POS, self.board_size)
-            for player in self.players:
-                player.rect.center = self.tiles[player.pos]
+            self.place_players()
         except Exception:
             # Fallback to the default classic board if generation fails.
+            self.snake_layer = None
             self.board_size = CLASSIC_BOARD_SIZE
-            self.board = load_image("assets/board/Board_with_number.png", self.board_size)
+            self.board = load_image(CLASSIC_BOARD_IMAGE, self.board_size)
             self.tiles = self.generate_tiles(10, 10, BOARD_POS, self.board_size)
-            for player in self.players:
-                player.rect.center = self.tiles[player.pos]
+            self.place_players()
         self.dice_imgs = self._load_dice_images()
 
+    def _use_special_board(self, board_assets=None):
+        """
+        Puts the special board for board_seed in play (board image, snake layer,
+        jump table and snake curves), generating it unless board_assets already
+        holds it. Returns the generator's (grid_map, source size) for the tiles.
+        """
+        if self.animated_board:
+            from snake_animation import generate_animated_board_assets
+            self.board, self.snake_layer, snakes_map, ladders_map, grid_map, curves_map = (
+                generate_animated_board_assets(self.board_size, seed=self.board_seed))
+            src_size = self.snake_layer.source_size
+        else:
+            board_surface, snakes_map, ladders_map, grid_map, curves_map = (
+                board_assets or generate_space_board_assets(include_curves=True, seed=self.board_seed))
+            src_size = board_surface.get_size()
+            self.board = pygame.transform.smoothscale(board_surface, self.board_size)
+        self.state.set_board(snakes_map or self.snakes, ladders_map or self.ladders)
+        self.snake_curves = self._curves_from_generator(curves_map, src_size)
+        return grid_map, src_size
+
     def _tiles_from_generator(self, grid_map, source_size):
         """Converts grid coordinates from the generator into screen tile centers."""
         src_w, src_h = source_size
@@ -168,28 +347,65 @@ class SnakeLaddersGame:
             tiles[cell] = (BOARD_POS[0] + x * scale_x, BOARD_POS[1] + y * scale_y)
         return tiles
 
-    def regenerate_snakes_and_ladders(self):
-        """In 'special' mode, regenerates the board layout for a new game."""
+    def _curves_from_generator(self, curves_map, source_size):
+        """Converts generator snake curves into screen space, like the tile centers."""
+        src_w, src_h = source_size
+        scale_x = self.board_size[0] / src_w
+        scale_y = self.board_size[1] / src_h
+        return {
+            head: [(BOARD_POS[0] + x * scale_x, BOARD_POS[1] + y * scale_y) for x, y in curve]
+            for head, curve in curves_map.items()
+        }
+
+    def regenerate_snakes_and_ladders(self, seed=None):
+        """
+        In 'special' mode, regenerates the board layout for a new game.
+        The board seed comes from the game rng unless one is given (e.g. by the server).
+        """
         if self.mode != "special":
             return
-        try:
-            board_surface, snakes_map, ladders_map, grid_map = generate_space_board_assets()
-            src_size = board_surface.get_size()
-            self.board = pygame.transform.smoothscale(board_surface, self.board_size)
-            if snakes_map: self.snakes = snakes_map
-            if ladders_map: self.ladders = ladders_map
-            if grid_map: self.tiles = self._tiles_from_generator(grid_map, src_size)
-        except Exception:
-            # Fallback to default if generation fails.
-            self.board_size = CLASSIC_BOARD_SIZE
-            self.board = load_image("assets/board/Board_with_number.png", self.board_size)
-            self.tiles = self.generate_tiles(10, 10, BOARD_POS, self.board_size)
-            self.snakes  = { 31: 14, 48: 28, 56: 22, 73: 21, 82: 42, 92: 75, 98: 66 }
-            self.ladders = { 17: 36, 35: 67, 40: 42, 58: 76, 59: 80, 71: 89 }
+        if self.profiler:
+            self.profiler.note("regenerate")
+        self._keep_board_view()
+        if seed is None:
+            self.state.next_board_seed()
+        else:
+            self.state.board_seed = seed
+        kept = self.board_views.pop(self.board_seed, None)
+        if kept:
+            # Stepped back to (or rolled again onto) a recent board: no need to build it.
+            (_, self.board, self.snake_layer, self.board_size, self.tiles, self.snake_curves,
+             self.state.jumps, self.state.moves) = kept
+            self.board_rect = self.board.get_rect(topleft=BOARD_POS)
+        else:
+            try:
+                grid_map, src_size = self._use_special_board()
+                if grid_map: self.tiles = self._tiles_from_generator(grid_map, src_size)
+            except Exception:
+                # Fallback to default if generation fails.
+                self.snake_layer = None
+                self.board_size = CLASSIC_BOARD_SIZE
+                self.board = load_image(CLASSIC_BOARD_IMAGE, self.board_size)
+                self.tiles = self.generate_tiles(10, 10, BOARD_POS, self.board_size)
+                self.state.reset_board()
+                self.snake_curves = {}
+        if self.recorder:
+            self.recorder.board(self.board_seed, self.snakes, self.ladders)
+
+    def _build_panel_avatars(self):
+        """Pre-scales each player's panel avatar in its normal and dimmed forms."""
+        size = panel_avatar_size(len(self.players))
+        avatars = []
+        for player in self.players:
+            bright = asset_manager.image(player.image_path, (size, size))
+            dimmed = bright.copy()  # Cached surfaces are shared, so dim a private copy.
+            dimmed.set_alpha(100)
+            avatars.append((bright, dimmed))
+        return avatars
 
     def _load_dice_images(self):
         """Loads the isometric dice images used for the rolling animation."""
-        return [load_image(f"assets/Dice/Isometric/dice_{i}_iso.png", (150, 150)) for i in range(1, 7)]
+        return [load_image(dice_image_path(i), DICE_SIZE) for i in range(1, 7)]
 
     def generate_tiles(self, cols, rows, start, size):
         """Generates a dictionary of tile centers (1-100) for a standard board layout."""
@@ -210,51 +426,93 @@ class SnakeLaddersGame:
 
     def roll_dice(self):
         """Initiates the dice roll sequence."""
+        if self.remote:
+            # The server rolls; its MOVE delta starts the animation (see _apply_remote).
+            self.remote.send_roll()
+            return
         self.regenerate_snakes_and_ladders() # Regenerate board in special mode.
+        self.start_roll(self.state.rng.randint(1, 6))
+
+    def start_roll(self, value):
+        """Starts the dice animation for a known roll value."""
         self.dice_rolling = True
-        self.roll_time = time.time()
-        self.roll_value = random.randint(1, 6)
+        self.roll_time = self.now()
+        self.roll_value = value
+        self.state.rolls += 1
+        if self.recorder:
+            self.recorder.roll(self.current_turn, self.roll_value)
         if self.dice_sound:
             self.dice_sound.stop()
             self.dice_sound.play()
 
+    def _apply_remote(self):
+        """Applies queued server deltas while no roll or move is animating."""
+        self.remote.poll()
+        while not (self.dice_rolling or self.player_moving or self.game_over):
+            message = self.remote.next_message()
+            if message is None:
+                return
+            if message[0] == b"X":
+                # A rejected roll (not started, not this seat's turn, game over): tell the player.
+                text = ERROR_TEXT.get(message[1], f"Server error {message[1]}")
+                self.notice = (text, self.now() + NOTICE_SECONDS)
+                print(f"server: {text}", file=sys.stderr)
+            elif message[0] == b"B" and message[1] != self.board_seed:
+                self.regenerate_snakes_and_ladders(message[1])
+            elif message[0] == b"M":
+                _, seat, value, _, _, _ = message
+                self.current_turn = seat
+                self.start_roll(value)
+
     def update(self):
         """Main game state update logic, called every frame."""
+        if self.remote:
+            self._apply_remote()
+        current_time = self.now()
+        self.particles.update(current_time - self.particle_time)
+        self.particle_time = current_time
         if self.game_over:
             return
             
         # Update all player animations.
         for p in self.players:
-            p.update()
+            p.update(current_time)
 
         # Handle the dice rolling animation.
         if self.dice_rolling:
-            current_time = time.time()
             if current_time - self.roll_time > 1:  # Animation duration of 1 second.
                 self.dice_rolling = False
                 self.current_dice = self.dice_imgs[self.roll_value - 1]
+                dice_bottom = (DICE_POS[0], DICE_POS[1] + DICE_SIZE[1] // 3)
+                self.particles.emit("dust", dice_bottom, DUST_PARTICLES, spread=DICE_SIZE[0] // 4)
 
                 player = self.players[self.current_turn]
-                path = []
-                start_pos = player.pos
-                potential_pos = player.pos + self.roll_value
-
-                # Handle board wrap-around (overshooting 100).
-                if potential_pos > 100:
-                    overshoot = potential_pos - 100
-                    end_pos = 100 - overshoot
-                    # Create path to 100 and then back.
-                    path.extend(self.tiles[i] for i in range(start_pos + 1, 101))
-                    path.extend(self.tiles[i] for i in range(99, end_pos - 1, -1))
-                else:
-                    end_pos = potential_pos
-                    # Create a simple forward path.
-                    path.extend(self.tiles[i] for i in range(start_pos + 1, end_pos + 1))
-
-                player.pos = end_pos
-                player.move_along_path(path)
+                # Hop cells (bouncing off 100 on an overshoot) come precomputed from the move tables.
+                hops = MOVE_PATHS[move_index(self.state.positions[self.current_turn], self.roll_value)]
+                end_pos, cell = self.state.move(self.current_turn, self.roll_value)
+                path = [self.tiles[i] for i in hops]
+
+                # The whole move (hops plus any snake/ladder slide) is one track.
+                track = Track(current_time, player.rect.center).add_hops(path)
+                if cell > end_pos:  # Ladder.
+                    self.hits[self.current_turn][1] += 1
+                    climb_start = current_time + track.duration
+                    track.add_slide([self.tiles[cell]])
+                    self.climb = (climb_start, current_time + track.duration)
+                elif cell < end_pos:  # Snake.
+                    self.hits[self.current_turn][0] += 1
+                    curve = self.snake_curves.get(end_pos)
+                    if curve and self.snake_layer:
+                        # Swaying snakes: each point of the slide is where the body will be when the token gets there.
+                        layer, snake = self.snake_layer, list(self.snake_curves).index(end_pos)
+                        slide_start = current_time + track.duration
+                        times = slide_times([track.end] + (layer.rest[snake] + BOARD_POS).tolist())[1:]
+                        curve = (layer.trace(snake, [slide_start + t for t in times]) + BOARD_POS).tolist()
+                    track.add_slide(curve or [self.tiles[cell]])
+
+                player.follow(track)
                 self.player_moving = True
-                self.after_move_check = True # Flag to check for snakes/ladders after move.
+                self.after_move_check = True # Flag to check for a win once the move ends.
             else:
                 # Show a random dice face for the rolling effect.
                 if current_time - getattr(self, 'last_dice_frame', 0) > 0.05:
@@ -264,141 +522,309 @@ class SnakeLaddersGame:
         # Handle post-movement logic.
         elif self.player_moving:
             player = self.players[self.current_turn]
+            if self.climb and current_time >= self.climb[0]:
+                self.particles.emit("sparkle", player.rect.center, SPARKLES_PER_FRAME, spread=12)
+                if current_time >= self.climb[1]:
+                    self.climb = None
             if not player.is_moving:
                 if self.after_move_check:
                     self.after_move_check = False # Consume the flag.
-                    
+
                     # Check for win condition.
-                    if player.pos == 100:
+                    if self.state.positions[self.current_turn] == FINAL_CELL:
                         self.game_over = True
-                        self.winner = self.current_turn
+                        self.game_over_time = self.now()
+                        if self.recorder:
+                            self.recorder.end_game(self.winner)
+                        if self.stats:
+                            self.stats.record_game(stats_store.game_result(self))
+                        telemetry.emit("game", mode=self.mode, seed=self.seed, players=len(self.players),
+                                       winner=self.winner, rolls=self.rolls,
+                                       seconds=round(self.game_over_time - self.started_at, 2))
                         if self.win_sound: self.win_sound.play()
+                        self._celebrate()
+                        self.record_snapshot(self.roll_value)
                         return
 
-                    # Check for ladders and snakes.
-                    if player.pos in self.ladders:
-                        new_pos = self.ladders[player.pos]
-                        player.move_along_path([self.tiles[new_pos]])
-                        player.pos = new_pos
-                        return # Keep the turn until the final position is reached.
-                    elif player.pos in self.snakes:
-                        new_pos = self.snakes[player.pos]
-                        player.move_along_path([self.tiles[new_pos]])
-                        player.pos = new_pos
-                        return # Keep the turn.
-
-                # If no snake/ladder, end the turn.
+                # End the turn; snakes and ladders were already part of the track.
                 self.player_moving = False
-                self.current_turn = (self.current_turn + 1) % len(self.players)
+                self.state.end_turn()
+                self.record_snapshot(self.roll_value)
+
+    # --- Timeline ---
+    def record_snapshot(self, roll):
+        """
+        Adds the state after a turn (or the start of the game, roll 0) to the
+        timeline, and in special mode starts calibrating the board the next
+        roll will generate, so the roll itself does not wait for it.
+        """
+        current = self.timeline.current()
+        self.timeline.record(current.turn_index + 1 if current else 0, self.current_turn, roll,
+                             self.board_seed, self.rolls, self.state.positions, self.hits)
+        if self.mode == "special" and not self.remote and not self.game_over:
+            prefetch_board(self.state.peek_board_seed())
+
+    def _board_view(self):
+        """Everything that changes with the special board in play, for board_views."""
+        return (self.board_seed, self.board, self.snake_layer, self.board_size, self.tiles, self.snake_curves,
+                self.state.jumps, self.state.moves)
+
+    def _keep_board_view(self):
+        """Keeps the board in play in board_views before it is replaced, dropping the oldest past BOARD_VIEWS_KEPT."""
+        if self.board is None:
+            return  # The first board is not built yet.
+        self.board_views[self.board_seed] = self._board_view()
+        self.board_views.move_to_end(self.board_seed)
+        while len(self.board_views) > BOARD_VIEWS_KEPT:
+            self.board_views.popitem(last=False)
+
+    def can_rewind(self):
+        """Local games only: the server owns remote games, and a replay log cannot take moves back."""
+        return not (self.remote or self.recorder or self.game_over)
+
+    def rewind(self, steps=1):
+        """
+        Takes back turns (steps < 0 steps forward again). A roll still animating
+        is cancelled first, which counts as one step. Returns the restored
+        Snapshot, or None when there is nothing to step to.
+        """
+        if not self.can_rewind():
+            return None
+        timeline = self.timeline
+        if steps > 0 and (self.dice_rolling or self.player_moving):
+            snapshot, steps = timeline.current(), steps - 1
+        else:
+            snapshot = None
+        for _ in range(abs(steps)):
+            snapshot = (timeline.back() if steps > 0 else timeline.forward()) or snapshot
+        if snapshot:
+            self.restore(snapshot)
+            if self.mode == "special" and timeline.cursor > timeline.first:
+                # Start calibrating the board one more step back would need, unless it is still kept.
+                older = timeline.snapshot(timeline.cursor - 1).board_seed
+                if older not in self.board_views:
+                    prefetch_board(older)
+        return snapshot
+
+    def restore(self, snapshot):
+        """
+        Puts a timeline Snapshot back in play: positions, turn, hit counters,
+        roll count and board, with the tokens placed on their tiles and any
+        roll or move in progress dropped. The rng is rebuilt from the seed and
+        roll count on the next draw, so rolling again repeats the dice (and
+        boards) that followed the snapshot the first time.
+        """
+        self.dice_rolling = self.player_moving = self.after_move_check = False
+        self.climb = None
+        for player in self.players:
+            player.follow(None)
+        if snapshot.roll:
+            self.roll_value = snapshot.roll
+            self.current_dice = self.dice_imgs[snapshot.roll - 1]
+
+        if self.mode == "special" and snapshot.board_seed != self.board_seed:
+            # From board_views when it was played recently, else rebuilt from its seed.
+            self.regenerate_snakes_and_ladders(snapshot.board_seed)
+
+        state = self.state
+        state.rolls = snapshot.rolls
+        state.park()
+        for seat, cell in enumerate(snapshot.positions):
+            state.positions[seat] = cell
+        state.turn = snapshot.seat
+        state.winner = None
+        self.hits = [list(pair) for pair in snapshot.hits]
+        self.place_players()
+
+    def _celebrate(self):
+        """Fires confetti up from five spots along the bottom of the screen."""
+        for i in range(5):
+            origin = (SCREEN_WIDTH * (2 * i + 1) / 10, SCREEN_HEIGHT + 10)
+            self.particles.emit("confetti", origin, CONFETTI_PARTICLES // 5, spread=40)
+
+    def draw(self, target=None):
+        """Draws all game elements to the screen, or to target (any render_backend backend)."""
+        lap = self.profiler.lap if self.profiler else _no_lap
+        screen = target or self.screen
+        screen.blit(self.bg, (0, 0))
+        screen.blit(self.board, self.board_rect)
+        if self.snake_layer:
+            # Only the snakes are redrawn; the board under them is a cached image.
+            snakes = self.snake_layer.frame(self.now())
+            invalidate = getattr(screen, "invalidate", None)  # Texture backends cache by surface.
+            if invalidate: invalidate(snakes)
+            screen.blit(snakes, self.board_rect)
+        lap("board")
 
-    def draw(self):
-        """Draws all game elements to the screen."""
-        self.screen.blit(self.bg, (0, 0))
-        self.screen.blit(self.board, self.board_rect)
-        
         # Display game mode.
         mode_text = "Mode: Special" if self.mode == "special" else "Mode: Classic"
-        mode_label = self.mode_font.render(mode_text, True, FONT_COLOR)
-        self.screen.blit(mode_label, (BOARD_POS[0] + 45, BOARD_POS[1] - 45))
+        mode_label = render_text(self.mode_font, mode_text, FONT_COLOR)
+        screen.blit(mode_label, (BOARD_POS[0] + 45, BOARD_POS[1] - 45))
+        lap("text")
 
-        # Draw the dice.
-        self.screen.blit(self.current_dice, self.current_dice.get_rect(center=DICE_POS))
+        # Draw the dice, and any server notice under it.
+        screen.blit(self.current_dice, self.current_dice.get_rect(center=DICE_POS))
+        if self.notice and self.now() < self.notice[1]:
+            notice = render_text(self.mode_font, self.notice[0], NOTICE_COLOR)
+            screen.blit(notice, notice.get_rect(center=(DICE_POS[0], DICE_POS[1] + DICE_SIZE[1] // 2 + 30)))
+        lap("board")
 
         # Draw all players.
         for p in self.players:
-            p.draw(self.screen)
+            p.draw(screen)
+        lap("players")
+
+        self.particles.draw(screen)
+        lap("particles")
 
         # --- Turn Indicator Panel ---
         panel_rect = pygame.Rect(825, 450, 450, 200)
         
         # Display all player avatars in the panel.
         num_players = len(self.players)
-        max_panel_width = 440 # Panel padding.
         spacing = 10
-        avatar_size = (max_panel_width - (num_players - 1) * spacing) / num_players if num_players > 0 else 0
-        avatar_size = int(min(avatar_size, 150)) # Cap avatar size.
+        avatar_size = panel_avatar_size(len(self.players))
 
         total_width = num_players * avatar_size + (num_players - 1) * spacing
         start_x = panel_rect.centerx - total_width / 2
 
-        for i, player in enumerate(self.players):
-            avatar_scaled = pygame.transform.scale(player.image, (avatar_size, avatar_size))
-            
+        for i, (bright, dimmed) in enumerate(self.panel_avatars):
             # Dim the avatars of players whose turn it is not.
-            if i != self.current_turn:
-                avatar_scaled.set_alpha(100)
+            avatar_scaled = bright if i == self.current_turn else dimmed
 
             avatar_x = start_x + i * (avatar_size + spacing)
             avatar_rect = avatar_scaled.get_rect(center=(avatar_x, panel_rect.centery - 20))
-            self.screen.blit(avatar_scaled, avatar_rect)
+            screen.blit(avatar_scaled, avatar_rect)
+        lap("panel")
 
         # Display "Player X's Turn" text.
-        turn_text = self.font.render(f"Player {self.current_turn + 1}'s Turn", True, FONT_COLOR)
+        turn_text = render_text(self.font, f"Player {self.current_turn + 1}'s Turn", FONT_COLOR)
         text_rect = turn_text.get_rect(center=(panel_rect.left + 170, panel_rect.bottom - 220))
-        self.screen.blit(turn_text, text_rect)
+        screen.blit(turn_text, text_rect)
 
         # Display winner text if the game is over.
         if self.game_over:
-            win_font = pygame.font.SysFont('Pixeltype', 100)
-            win_text = win_font.render(f"Player {self.winner + 1} Wins!", True, (255, 215, 0))
+            win_text = render_text(sys_font('Pixeltype', 100), f"Player {self.winner + 1} Wins!", (255, 215, 0))
             win_rect = win_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
-            self.screen.blit(win_text, win_rect)
-        
-        self.screen.blit(self.back_button_img, self.back_button_rect)
+            screen.blit(win_text, win_rect)
+        lap("text")
+
+        screen.blit(self.back_button_img, self.back_button_rect)
+        lap("panel")
 
     def handle_event(self, event):
         """Handles user input events."""
         if self.game_over:
             return None
 
+        if event.type == pygame.KEYDOWN and event.key in (UNDO_KEY, REDO_KEY):
+            self.rewind(1 if event.key == UNDO_KEY else -1)
+
         if event.type == pygame.MOUSEBUTTONDOWN:
             dice_rect = self.current_dice.get_rect(center=DICE_POS)
             # Allow dice roll only if it's the player's turn and no animations are active.
-            if dice_rect.collidepoint(event.pos) and not self.dice_rolling and not self.player_moving:
+            my_turn = not self.remote or self.remote.can_roll(self.current_turn)
+            if dice_rect.collidepoint(event.pos) and my_turn and not self.dice_rolling and not self.player_moving:
                 self.roll_dice()
             
             if self.back_button_rect.collidepoint(event.pos):
                 return "back"
         return None
 
-    def run(self):
-        """The main game loop."""
-        running = True
-        return_value = None
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                
-                action = self.handle_event(event)
-                if action == "back":
-                    return_value = "back"
-                    running = False
-            
-            if not running:
-                break
-
-            self.update()
-            self.draw()
-            pygame.display.flip()
-            self.clock.tick(60)
-
-            # After the game ends, show winner screen and transition out.
-            if self.game_over:
-                pygame.time.wait(1000)  # Show winner text for 1 second.
-                game_over_snapshot = self.screen.copy()
-                black_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                black_surface.fill((0,0,0))
-                curtain_transition(self.screen, game_over_snapshot, black_surface, "assets/bg/transitions.png")
-                running = False
-        return return_value
-
-# --- ENTRY POINT ---
-def run_game(screen, player_infos, mode="classic"):
-    """Initializes and runs the Snake & Ladders game session."""
-    pygame.display.set_caption("ComSci Snakes & Ladders")
-    game = SnakeLaddersGame(screen, player_infos, mode=mode)
-    return game.run()
+# --- GAME SCENE ---
+class GameScene(Scene):
+    """
+    Hosts a SnakeLaddersGame inside the scene manager.
+
+    Resident: backing out to player select keeps the game, and reopening it
+    with the same players and mode resumes it as it was. warm_up() caches the
+    classic game images; warm_special(), once special mode is picked, caches
+    the snake heads and pre-generates a special board in the background.
+    """
+    resident = True
+
+    def __init__(self, manager):
+        super().__init__(manager)
+        self.game = None
+        self.key = None  # (avatar paths, mode, animated board) of the current game.
+        self.spare_seed = None  # Seed of the next game, whose first special board is generated during warm-up.
+        self.spare_board = None  # Its board assets, once ready.
+        self.leaving = False
+
+    def warm_up(self):
+        for req in asset_requests(()):
+            asset_manager.ASSETS.request(req)
+            yield
+
+    def warm_special(self):
+        """Queues the special-mode warm-up, unless a spare board is ready or on its way."""
+        if self.spare_seed is None:
+            self.spare_seed = random.getrandbits(32)
+            self.manager.warm("game", self._warm_special(self.spare_seed))
+
+    def _warm_special(self, seed):
+        """
+        Snake heads, then the first board of seed, a step per slice; the
+        heavy steps run in the spare-board process and thread meanwhile. If
+        either fails the spare board stays unset, and the game builds its
+        first board itself.
+        """
+        global _spare_process
+        try:
+            state = spare_board_state(initial_board_seed(seed))
+            imported = in_spare_thread(importlib.import_module, "board_generator")
+            while not imported.done():
+                yield
+            bg = imported.result()
+            for req in special_asset_requests():
+                asset_manager.ASSETS.request(req)
+                yield
+            while not state.done():
+                yield
+            state = state.result()
+            rendered = in_spare_thread(bg.render_board_state, state)
+            while not rendered.done():
+                yield
+            self.spare_board = bg.board_assets(state, rendered.result().convert_alpha(), include_curves=True)
+        except Exception as exc:
+            # E.g. a BrokenProcessPool: drop the pool so the next warm-up starts a fresh one.
+            print(f"spare board: {exc!r}", file=sys.stderr)
+            _spare_process = None
+            self.spare_seed = self.spare_board = None
+
+    def enter(self, payload=None):
+        player_infos, mode, animated = payload
+        key = (tuple(p["avatar"] for p in player_infos), mode, animated)
+        pygame.display.set_caption("ComSci Snakes & Ladders")
+        if self.game is None or key != self.key:
+            seed, board = None, None
+            if mode == "special" and self.spare_board:
+                seed, board, self.spare_seed, self.spare_board = self.spare_seed, self.spare_board, None, None
+            self.game = SnakeLaddersGame(self.screen, player_infos, mode=mode, board_assets=board, seed=seed,
+                                         animated_board=animated)
+            self.key = key
+        self.game.profiler = self.manager.profiler
+        self.game.stats = self.manager.stats
+        self.leaving = False
+
+    def exit(self):
+        if self.game.game_over:
+            self.game = None  # A finished game is never resumed.
+        profiler = self.manager.profiler
+        if profiler: profiler.export_json()
 
+    def handle_event(self, event):
+        if self.game.handle_event(event) == "back":
+            self.manager.switch("select_player")
+
+    def update(self, dt):
+        game = self.game
+        game.update()
+        # After the game ends, keep the winner text up for a moment, then curtain out.
+        if game.game_over and not self.leaving and game.now() - game.game_over_time >= GAME_OVER_HOLD:
+            self.leaving = True
+            self.manager.switch("main_menu", transition=True)
 
+    def draw(self, screen):
+        if self.game:
+            self.game.draw(screen)
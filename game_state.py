@@ -0,0 +1,182 @@
+"""
+Rendering-free state of one Snakes & Ladders table.
+
+GameState holds only what the rules need: positions in a byte array, the
+board as a 101-entry jump table (plus its precomputed move table) and the
+counters that rebuild the game rng.
+The rng itself is created on first use and can be dropped again with park(),
+so an idle table costs a few hundred bytes and one process can keep tens of
+thousands of them. SnakeLaddersGame (game.py) is one view over a GameState;
+server.py and replay.py use it directly.
+"""
+import sys
+import random
+from array import array
+
+from rules import CLASSIC_SNAKES, CLASSIC_LADDERS, FINAL_CELL, landing_cell
+
+# --- MOVES ---
+# Moves are indexed by pos * ROLL_STRIDE + roll: a flat (101, 7) table, since a
+# single index into a flat array is cheaper than nested lookups (roll 0 is unused).
+ROLL_STRIDE = 7
+
+def _move_path(pos, roll):
+    """Cells a token hops through for a roll, bouncing back off 100 when it overshoots."""
+    landing = landing_cell(pos, roll)
+    if pos + roll <= FINAL_CELL:
+        return tuple(range(pos + 1, landing + 1))
+    return tuple(range(pos + 1, FINAL_CELL + 1)) + tuple(range(FINAL_CELL - 1, landing - 1, -1))
+
+# Landing cells and hop paths do not depend on the board, so they are built once.
+LANDINGS = bytes(landing_cell(pos, roll) if roll else pos
+                 for pos in range(FINAL_CELL + 1) for roll in range(ROLL_STRIDE))
+MOVE_PATHS = tuple(_move_path(pos, roll) if roll else ()
+                   for pos in range(FINAL_CELL + 1) for roll in range(ROLL_STRIDE))
+
+def move_index(pos, roll):
+    return pos * ROLL_STRIDE + roll
+
+def move_table(jumps):
+    """Final cell of every (pos, roll) on a board, after any snake or ladder."""
+    # bytes.translate maps every landing cell through the jump table in C.
+    return LANDINGS.translate(bytes(jumps).ljust(256, b"\0"))
+
+# --- BOARDS ---
+def jump_table(snakes, ladders):
+    """A 101-entry byte array mapping each cell to where a token ends up after landing on it."""
+    table = array("B", range(FINAL_CELL + 1))
+    for start, end in snakes.items():
+        table[start] = end
+    for start, end in ladders.items():
+        table[start] = end
+    return table
+
+def board_maps(jumps):
+    """The (snakes, ladders) maps behind a jump table."""
+    snakes, ladders = {}, {}
+    for cell, end in enumerate(jumps):
+        if end < cell:
+            snakes[cell] = end
+        elif end > cell:
+            ladders[cell] = end
+    return snakes, ladders
+
+# Shared by every classic table; boards are replaced, never edited in place.
+CLASSIC_JUMPS = jump_table(CLASSIC_SNAKES, CLASSIC_LADDERS)
+CLASSIC_MOVES = move_table(CLASSIC_JUMPS)
+
+# --- RNG ---
+def initial_board_seed(seed):
+    """The seed of the first board a game with this seed plays on (its first rng draw)."""
+    return random.Random(seed).getrandbits(32)
+
+def rng_after(seed, mode, rolls):
+    """The game rng as it is after `rolls` rolls (mirrors the draws a game makes)."""
+    rng = random.Random(seed)
+    rng.getrandbits(32)  # Initial board seed.
+    for _ in range(rolls):
+        if mode == "special":
+            rng.getrandbits(32)  # Board regenerated before each roll.
+        rng.randint(1, 6)
+    return rng
+
+# --- STATE ---
+class GameState:
+    """
+    One table's rules state. Every roll and special board comes from the
+    game's seeded rng, so (seed, mode, players) determine the whole game.
+    """
+    __slots__ = ("mode", "seed", "board_seed", "rolls", "turn", "winner", "positions", "jumps", "moves", "_rng")
+
+    def __init__(self, players, mode="classic", seed=None):
+        self.mode = mode
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.board_seed = initial_board_seed(self.seed)  # Seed of the special board in play.
+        self.rolls = 0  # Rolls made so far; with the seed this rebuilds the rng.
+        self.turn = 0
+        self.winner = None
+        self.positions = array("B", [1] * players)
+        self.jumps = CLASSIC_JUMPS
+        self.moves = CLASSIC_MOVES  # Final cell per (pos, roll); see move_index.
+        self._rng = None  # Created on first use (see rng).
+
+    @property
+    def players(self):
+        return len(self.positions)
+
+    @property
+    def rng(self):
+        if self._rng is None:
+            self._rng = rng_after(self.seed, self.mode, self.rolls)
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng):
+        self._rng = rng
+
+    def park(self):
+        """Drops the rng (about 2.5 KB) until the next draw rebuilds it."""
+        self._rng = None
+
+    def footprint(self):
+        """Approximate bytes held by this state (the shared classic board is not counted)."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.positions)
+        if self.jumps is not CLASSIC_JUMPS:
+            size += sys.getsizeof(self.jumps) + sys.getsizeof(self.moves)
+        if self._rng is not None:
+            size += sys.getsizeof(self._rng.getstate()[1])
+        return size
+
+    # --- Board ---
+    @property
+    def snakes(self):
+        return board_maps(self.jumps)[0]
+
+    @property
+    def ladders(self):
+        return board_maps(self.jumps)[1]
+
+    def set_board(self, snakes, ladders):
+        self.jumps = jump_table(snakes, ladders)
+        self.moves = move_table(self.jumps)
+
+    def reset_board(self):
+        self.jumps, self.moves = CLASSIC_JUMPS, CLASSIC_MOVES
+
+    def next_board_seed(self):
+        """Draws the seed of the next special board."""
+        self.board_seed = self.rng.getrandbits(32)
+        return self.board_seed
+
+    def peek_board_seed(self):
+        """The seed next_board_seed() will draw, without drawing it."""
+        rng = random.Random()
+        rng.setstate(self.rng.getstate())
+        return rng.getrandbits(32)
+
+    # --- Turns ---
+    def draw_roll(self):
+        """Draws a die value and counts the roll (the move is applied separately)."""
+        value = self.rng.randint(1, 6)
+        self.rolls += 1
+        return value
+
+    def move(self, seat, value):
+        """Moves a seat's token for a roll and returns (landing cell, final cell)."""
+        index = self.positions[seat] * ROLL_STRIDE + value
+        landing, cell = LANDINGS[index], self.moves[index]
+        self.positions[seat] = cell
+        if cell == FINAL_CELL and self.winner is None:
+            self.winner = seat
+        return landing, cell
+
+    def end_turn(self):
+        self.turn = (self.turn + 1) % len(self.positions)
+
+    def play_roll(self, value):
+        """Moves the current seat and passes the turn unless it won. Returns (seat, landing, cell)."""
+        seat = self.turn
+        landing, cell = self.move(seat, value)
+        if self.winner is None:
+            self.end_turn()
+        return seat, landing, cell
@@ -0,0 +1,241 @@
+"""
+Headless benchmark runner.
+
+Runs the real game and board-generator render paths against SDL's dummy
+video and audio drivers, with scripted input and no frame cap, and reports
+per-frame update/draw timings. Usable from CI or the perf lab:
+
+    python headless.py --target game --mode special --players 4 --seed 7
+    python headless.py --target generator --frames 300
+    python main.py --headless --games 5
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+import pygame
+
+from display import LOGICAL_SIZE
+
+SCREEN_SIZE = LOGICAL_SIZE
+FRAME_STEP = 1 / 60  # Simulated seconds per frame, so animations finish in a fixed frame count.
+DEFAULT_AVATARS = [
+    "assets/players/player_kao.png",
+    "assets/players/player_king.png",
+    "assets/players/player_phum.png",
+    "assets/players/player_sorkhaw.png",
+]
+
+# --- SETUP ---
+def enable_dummy_drivers():
+    """Switches SDL to the dummy video/audio drivers and (re)initializes pygame."""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    # Modules imported earlier may already have initialized real drivers.
+    if pygame.display.get_init():
+        pygame.display.quit()
+    if pygame.mixer.get_init():
+        pygame.mixer.quit()
+    pygame.init()
+
+def seed_everything(seed):
+    """Seeds every random source the game and the board generator draw from."""
+    random.seed(seed)
+    try:
+        import numpy as np
+        np.random.seed(seed % 2**32)
+    except ImportError:
+        pass
+
+class VirtualClock:
+    """A clock that advances by a fixed step per frame instead of following wall time."""
+    def __init__(self, step=FRAME_STEP):
+        self.step = step
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+    def advance(self):
+        self.time += self.step
+
+class AutoDicePolicy:
+    """Scripted input: clicks the dice as soon as the game is ready for a roll."""
+    def __init__(self, dice_pos):
+        self.dice_pos = dice_pos
+
+    def post_events(self, game):
+        if game.game_over or game.dice_rolling or game.player_moving:
+            return
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=self.dice_pos, button=1))
+
+# --- TIMING REPORT ---
+def summarize(samples):
+    """Returns mean/p50/p95/max (milliseconds) for a list of durations in seconds."""
+    if not samples:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "mean": 1000 * sum(ordered) / len(ordered),
+        "p50": 1000 * pick(0.50),
+        "p95": 1000 * pick(0.95),
+        "max": 1000 * ordered[-1],
+    }
+
+def format_report(report):
+    """Formats a session report as a small human-readable table."""
+    lines = [
+        f"target={report['target']} frames={report['frames']} "
+        f"wall={report['wall_seconds']:.2f}s fps={report['fps']:.1f}"
+    ]
+    for phase in ("update", "draw"):
+        stats = report[phase]
+        lines.append(
+            f"  {phase:<7} mean {stats['mean']:.3f}ms  p50 {stats['p50']:.3f}ms  "
+            f"p95 {stats['p95']:.3f}ms  max {stats['max']:.3f}ms"
+        )
+    for key in ("games", "winners"):
+        if key in report:
+            lines.append(f"  {key}: {report[key]}")
+    return "\n".join(lines)
+
+# --- SESSIONS ---
+def run_game_session(mode="special", players=2, seed=0, games=1, max_frames=None, record_path=None,
+                     animated_board=False, stats_path=None):
+    """
+    Plays full games through SnakeLaddersGame's event/update/draw path as fast as possible.
+    With record_path, every game is appended to that replay log (see replay.py).
+    animated_board turns on swaying snakes in special mode.
+    With stats_path, finished games are recorded in that stats store (see stats_store.py).
+    """
+    from game import SnakeLaddersGame, DICE_POS
+    from replay import ReplayWriter
+    from stats_store import StatsStore
+
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    seed_everything(seed)
+    player_infos = [{"avatar": DEFAULT_AVATARS[i % len(DEFAULT_AVATARS)]} for i in range(players)]
+    policy = AutoDicePolicy(DICE_POS)
+    update_times, draw_times, winners = [], [], []
+    frames = 0
+    recorder = ReplayWriter(record_path) if record_path else None
+    stats = StatsStore(stats_path) if stats_path else None
+
+    start = time.perf_counter()
+    for _ in range(games):
+        clock = VirtualClock()
+        game = SnakeLaddersGame(screen, player_infos, mode=mode, time_source=clock, animated_board=animated_board)
+        if recorder:
+            game.attach_recorder(recorder)
+        game.stats = stats
+        while not game.game_over:
+            if max_frames is not None and frames >= max_frames:
+                break
+            policy.post_events(game)
+
+            t0 = time.perf_counter()
+            for event in pygame.event.get():
+                game.handle_event(event)  # Rolls (and special-mode regeneration) happen here.
+            game.update()
+            t1 = time.perf_counter()
+            game.draw()
+            pygame.display.flip()
+            t2 = time.perf_counter()
+
+            update_times.append(t1 - t0)
+            draw_times.append(t2 - t1)
+            clock.advance()
+            frames += 1
+        winners.append(game.winner)
+    wall = time.perf_counter() - start
+    if recorder:
+        recorder.close()
+    if stats:
+        stats.close()
+
+    return {
+        "target": f"game:{mode}",
+        "frames": frames,
+        "wall_seconds": wall,
+        "fps": frames / wall if wall else 0.0,
+        "update": summarize(update_times),
+        "draw": summarize(draw_times),
+        "games": games,
+        "winners": winners,
+    }
+
+def run_generator_session(frames=300, seed=0, regenerate_every=30):
+    """Drives board_generator's render loop, pressing SPACE every few frames."""
+    import board_generator as bg
+
+    screen = pygame.display.set_mode((bg.WIDTH, bg.HEIGHT))
+    seed_everything(seed)
+    state = bg.generate_board_state()
+    update_times, draw_times = [], []
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        if regenerate_every and frame and frame % regenerate_every == 0:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+
+        t0 = time.perf_counter()
+        for event in pygame.event.get():
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                state = bg.generate_board_state()
+        t1 = time.perf_counter()
+        bg.render_board_surface(
+            *state,
+            draw_background=bg.DRAW_BOARD_BACKGROUND,
+            ladder_on_top=bg.LADDER_ON_TOP,
+            background_color=(0, 0, 0),
+            target_surface=screen,
+        )
+        pygame.display.flip()
+        t2 = time.perf_counter()
+
+        update_times.append(t1 - t0)
+        draw_times.append(t2 - t1)
+    wall = time.perf_counter() - start
+
+    return {
+        "target": "generator",
+        "frames": frames,
+        "wall_seconds": wall,
+        "fps": frames / wall if wall else 0.0,
+        "update": summarize(update_times),
+        "draw": summarize(draw_times),
+    }
+
+# --- ENTRY POINT ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a scripted, windowless benchmark session.")
+    parser.add_argument("--target", choices=("game", "generator"), default="game")
+    parser.add_argument("--mode", choices=("classic", "special"), default="special")
+    parser.add_argument("--players", type=int, default=2, choices=range(1, 5))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--frames", type=int, default=None,
+                        help="Frame limit (game) or frame count (generator, default 300).")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("--record", metavar="PATH", help="Append every game to a replay log (game target).")
+    parser.add_argument("--animated-board", action="store_true", help="Swaying snakes (special mode).")
+    parser.add_argument("--stats-db", metavar="PATH", help="Record finished games in this stats store (game target).")
+    args = parser.parse_args(argv)
+
+    enable_dummy_drivers()
+    if args.target == "game":
+        report = run_game_session(args.mode, args.players, args.seed, args.games, args.frames, args.record,
+                                  args.animated_board, args.stats_db)
+    else:
+        report = run_generator_session(args.frames or 300, args.seed)
+    pygame.quit()
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return report
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,101 @@
+"""
+Load test for server.py with simulated clients.
+
+Starts the server in a child process on a free localhost port, seats
+--tables x --players asyncio clients that roll as soon as it is their turn,
+and reports per-message latency (roll intent -> MOVE delta) and how many
+tables one server core could sustain at that pace:
+
+    python loadtest.py --tables 200 --players 4 --games 3
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import resource
+
+import net_protocol as proto
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+
+# --- SIMULATED CLIENT ---
+async def play_client(host, port, table_id, players, mode, games, latencies):
+    """Joins a table, rolls whenever it is this seat's turn, for `games` games."""
+    reader, writer = await asyncio.open_connection(host, port)
+    for game in range(games):
+        # Each game gets a fresh table id so finished tables are never reused.
+        writer.write(proto.JOIN.pack(b"J", table_id * games + game, players, proto.MODES.index(mode)))
+        seat, turn, sent = None, 0, None
+        while True:
+            message = await proto.read_message(reader)
+            tag = message[0]
+            if tag == b"W":
+                seat = message[2]
+            elif tag == b"M":
+                if message[1] == seat and sent is not None:
+                    latencies.append(time.perf_counter() - sent)
+                    sent = None
+                turn = message[5]
+            elif tag == b"E":
+                break
+            elif tag == b"X":
+                raise RuntimeError(f"server error {message[1]} at table {table_id}")
+            if tag in (b"S", b"M") and turn == seat and sent is None:
+                sent = time.perf_counter()
+                writer.write(proto.ROLL.pack(b"R"))
+            await writer.drain()
+        # Leave the table so the server can drop it, then reconnect for the next game.
+        writer.close()
+        await writer.wait_closed()
+        if game + 1 < games:
+            reader, writer = await asyncio.open_connection(host, port)
+    if not writer.is_closing():
+        writer.close()
+
+async def run(tables, players, mode, games):
+    server = await asyncio.create_subprocess_exec(
+        sys.executable, SERVER_SCRIPT, "--port", "0", stdout=asyncio.subprocess.PIPE)
+    line = (await server.stdout.readline()).decode()
+    port = int(line.rsplit(":", 1)[1])
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        play_client("127.0.0.1", port, table, players, mode, games, latencies)
+        for table in range(1, tables + 1)
+        for _ in range(players)
+    ))
+    wall = time.perf_counter() - start
+
+    server.terminate()
+    await server.wait()
+    server_cpu = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return latencies, wall, server_cpu.ru_utime + server_cpu.ru_stime
+
+# --- REPORT ---
+def report(latencies, wall, server_cpu, tables, games):
+    ordered = sorted(latencies)
+    pick = lambda q: 1000 * ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    busy = server_cpu / wall if wall else 0.0
+    return "\n".join([
+        f"{tables} tables x {games} games: {len(ordered)} rolls in {wall:.2f}s "
+        f"({len(ordered) / wall:.0f} rolls/s)",
+        f"  latency p50 {pick(0.50):.2f}ms  p95 {pick(0.95):.2f}ms  p99 {pick(0.99):.2f}ms  max {pick(1.0):.2f}ms",
+        f"  server cpu {server_cpu:.2f}s ({busy:.0%} of one core) "
+        f"-> ~{tables / busy if busy else float('inf'):.0f} tables per core at this roll rate",
+    ])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the game server with simulated clients.")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--players", type=int, default=2, choices=range(1, 5))
+    parser.add_argument("--mode", choices=proto.MODES, default="classic")
+    parser.add_argument("--games", type=int, default=1, help="Games played per table.")
+    args = parser.parse_args(argv)
+    latencies, wall, server_cpu = asyncio.run(run(args.tables, args.players, args.mode, args.games))
+    print(report(latencies, wall, server_cpu, args.tables, args.games))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
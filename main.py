@@ -1,34 +1,62 @@
-import pygame
 import sys
-import math
-from select_player import run_player_select
-from transitions import curtain_transition
-from howtoplay import run_how_to
-from game import run_game
+import startup
+# Timed before anything heavy is imported (see --profile-startup).
+startup.begin(__name__ == "__main__" and "--profile-startup" in sys.argv[1:])
+
+import pygame
+import argparse
+import select_player
+from select_player import PlayerSelectScene
+from howtoplay import HowToScene
+from stats_screen import StatsScene
+from game import GameScene
+from scenes import Scene, SceneManager
+from profiler import FrameProfiler
+import time
+import asset_manager
+import preload
+import telemetry
+import stats_store
+import display
+from asset_manager import AssetRequest
+from sprite_cache import PulseAnimation
+
+# --- Menu Assets ---
+MENU_BG = AssetRequest("assets/bg/bg_main.png", display.LOGICAL_SIZE, "fast", False)
+LOGO_PATH = "assets/logo/logo.png"
+LOGO_SCALE = 1.2
+START_BUTTON = ("assets/button/button_start.png", (300, 150))
+HOW_BUTTON = ("assets/button/button_how_to_play.png", (275, 125))
+STATS_KEY = pygame.K_s  # Opens the statistics screen.
+
+def menu_asset_requests():
+    """Every image the main menu loads, for the startup preloader."""
+    logo_w, logo_h = asset_manager.source_size(LOGO_PATH)
+    return [
+        MENU_BG,
+        AssetRequest(LOGO_PATH, (int(logo_w * LOGO_SCALE), int(logo_h * LOGO_SCALE)), "fast"),
+        AssetRequest(*START_BUTTON, "fast"),
+        AssetRequest(*HOW_BUTTON, "fast"),
+    ]
 
 # --- Button Class ---
 class Button:
     """A UI button class that handles rendering, collision, and a pulsing animation."""
     def __init__(self, image_path, center_pos, size, pulse=False):
-        self.image_original = pygame.image.load(image_path).convert_alpha()
-        self.image_original = pygame.transform.scale(self.image_original, size)
+        self.image_original = asset_manager.image(image_path, size, mode="fast")
         self.image = self.image_original
         self.rect = self.image.get_rect(center=center_pos)
         self.center_pos = center_pos
-        self.pulse = pulse
         self.base_size = size
         self.time_elapsed = 0
+        # One sine period of pulse frames is scaled up front; effect() only picks one.
+        self.pulse = PulseAnimation(self.image_original, center_pos, amplitude=0.05, speed=3) if pulse else None
 
     def effect(self, dt):
         """Applies a pulsing size effect to the button if enabled."""
         if self.pulse:
             self.time_elapsed += dt
-            # Use a sine wave to create a smooth pulsing effect.
-            scale_factor = 1 + 0.05 * math.sin(self.time_elapsed * 3)
-            new_size = (int(self.base_size[0] * scale_factor),
-                        int(self.base_size[1] * scale_factor))
-            self.image = pygame.transform.scale(self.image_original, new_size)
-            self.rect = self.image.get_rect(center=self.center_pos)
+            self.image, self.rect = self.pulse.frame_at(self.time_elapsed)
 
     def draw(self, surface):
         """Draws the button on the given surface."""
@@ -40,132 +68,149 @@ class Button:
                 event.button == 1 and
                 self.rect.collidepoint(event.pos))
 
-# --- Main Menu Class ---
-class MainMenu:
-    """Manages the main menu screen, including its buttons and animations."""
-    def __init__(self, screen):
-        self.screen = screen
-        self.clock = pygame.time.Clock()
+# --- Main Menu Scene ---
+class MainMenuScene(Scene):
+    """The main menu, with its pulsing start button. Resident, so returning to it is free."""
+    resident = True
 
-        # Load and scale background and logo assets.
-        self.bg = pygame.image.load("assets/bg/bg_main.png").convert()
-        self.bg = pygame.transform.scale(self.bg, (1280, 720))
+    def __init__(self, manager):
+        super().__init__(manager)
 
-        self.logo = pygame.image.load("assets/logo/logo.png").convert_alpha()
-        self.logo = pygame.transform.scale(
-            self.logo,
-            (int(self.logo.get_width() * 1.2), int(self.logo.get_height() * 1.2))
-        )
-        self.logo_rect = self.logo.get_rect(center=(1280 // 2, 200))
+        # Load and scale background and logo assets.
+        bg_request, logo_request = menu_asset_requests()[:2]
+        self.bg = asset_manager.ASSETS.request(bg_request)
+        self.logo = asset_manager.ASSETS.request(logo_request)
+        self.logo_rect = self.logo.get_rect(center=(display.LOGICAL_WIDTH // 2, 200))
 
         # Initialize menu buttons.
         self.start_button = Button(
-            "assets/button/button_start.png",
-            center_pos=(1280 // 2, 450),
-            size=(300, 150),
+            START_BUTTON[0],
+            center_pos=(display.LOGICAL_WIDTH // 2, 450),
+            size=START_BUTTON[1],
             pulse=True  # Enable the pulsing effect for the start button.
         )
         self.how_button = Button(
-            "assets/button/button_how_to_play.png",
-            center_pos=(1280 // 2, 550),
-            size=(275, 125)
+            HOW_BUTTON[0],
+            center_pos=(display.LOGICAL_WIDTH // 2, 550),
+            size=HOW_BUTTON[1]
         )
 
-    def render(self):
-        """Renders the complete main menu to a new surface, used for transitions."""
-        surface = pygame.Surface((1280, 720))
-        surface.blit(self.bg, (0, 0))
-        surface.blit(self.logo, self.logo_rect)
-        self.start_button.draw(surface)
-        self.how_button.draw(surface)
-        return surface
-
-    def run(self):
-        """
-        Runs the main menu loop, handling events and drawing.
-        Returns 'start' when the start button is clicked.
-        """
-        while True:
-            dt = self.clock.tick(60) / 1000.0
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                if self.start_button.is_clicked(event):
-                    return "start"
-
-                if self.how_button.is_clicked(event):
-                    # Navigate to the 'How to Play' screen and wait for it to finish.
-                    run_how_to(self.screen)
-
-            # Update button effects.
-            self.start_button.effect(dt)
-
-            # Draw all menu elements.
-            self.screen.blit(self.bg, (0, 0))
-            self.screen.blit(self.logo, self.logo_rect)
-            self.start_button.draw(self.screen)
-            self.how_button.draw(self.screen)
-            pygame.display.flip()
-
-def main():
+    def handle_event(self, event):
+        if self.start_button.is_clicked(event):
+            # Player select assets are warmed while the curtain hides the screen.
+            self.manager.switch("select_player", transition=True, on_covered=select_player.warm_assets)
+        elif self.how_button.is_clicked(event):
+            # 'How to Play' opens over the menu and pops back to it.
+            self.manager.push("how_to")
+        elif event.type == pygame.KEYDOWN and event.key == STATS_KEY:
+            self.manager.push("stats")
+
+    def update(self, dt):
+        # Update button effects.
+        self.start_button.effect(dt)
+
+    def draw(self, screen):
+        # Draw all menu elements.
+        screen.blit(self.bg, (0, 0))
+        screen.blit(self.logo, self.logo_rect)
+        self.start_button.draw(screen)
+        self.how_button.draw(screen)
+
+def main(profile_path=None, preload_report=False, profile_startup=False, fullscreen=False, scale_quality="linear",
+         stats_path=stats_store.DEFAULT_PATH, renderer="surface"):
     """
-    The main entry point and state machine for the application.
-    Manages transitions between the main menu, player selection, and the game itself.
+    The main entry point.
+    Registers every screen with a single SceneManager loop, which handles the
+    transitions between the main menu, player selection, and the game itself.
+    If profile_path is given, the frame profile is written there as JSON when a game ends.
+    Finished games are recorded in the SQLite stats store at stats_path (None turns it off).
+    Every screen draws at the logical 1280x720 and SDL scales it to the window (see display.py).
+    renderer="texture" draws every frame through render_backend.TextureBackend instead.
     """
-    pygame.init()
-
-    screen = pygame.display.set_mode((1280, 720))
-    pygame.display.set_caption("ComSci Snakes & Ladders")
-
-    # Initialize and play background music.
-    pygame.mixer.music.load("assets/audio/background.ogg")
-    pygame.mixer.music.set_volume(0.7)
-    pygame.mixer.music.play(-1)
-
-    # Application state management
-    state = "main_menu"
-    player_infos = None
-    selected_mode = "classic"
-    menu = MainMenu(screen)
-
-    while True:
-        if state == "main_menu":
-            choice = menu.run()
-            if choice == "start":
-                # Create a snapshot of the menu for the transition effect.
-                menu_snapshot = menu.render()
-                temp_surface = pygame.Surface((1280, 720))
-                curtain_transition(
-                    screen,
-                    menu_snapshot,
-                    temp_surface,
-                    "assets/bg/transitions.png",
-                    duration=0.5
-                )
-                state = "select_player"
-
-        elif state == "select_player":
-            pygame.event.clear() # Clear event queue before entering a new state.
-            selection = run_player_select(screen)
-            if selection is None:
-                # User backed out of player select, return to menu.
-                state = "main_menu"
-            else:
-                # User confirmed selection, proceed to game.
-                player_infos, selected_mode = selection
-                state = "game"
-
-        elif state == "game":
-            game_result = run_game(screen, player_infos, mode=selected_mode)
-            if game_result == "back":
-                # User backed out of the game, return to player select.
-                state = "select_player"
-            else:
-                # Game finished (or user quit), return to the main menu.
-                state = "main_menu"
+    startup_began = time.perf_counter()
+    startup.mark("imports")
+    pygame.init()  # The only init: no module initializes pygame on import.
+    startup.mark("pygame.init")
+
+    target = None
+    if renderer == "texture":
+        import render_backend
+        screen, target = render_backend.open_texture_window("ComSci Snakes & Ladders", fullscreen, scale_quality)
+    else:
+        screen = display.open_window("ComSci Snakes & Ladders", fullscreen, scale_quality)
+    startup.mark("display")
+
+    # Take whatever bake_assets.py pre-scaled, then decode and pre-scale the rest
+    # in parallel behind a loading screen, so screen transitions never wait on image I/O.
+    asset_manager.ASSETS.load_baked()
+    startup.mark("baked atlases")
+    requests = preload.collect_requests(screen.get_size(), menu_asset_requests())
+    report = preload.run_loading_screen(screen, requests, present=target.show if target else None)
+    startup.mark("preload")
+
+    # Initialize and play background music (skipped if there is no audio device).
+    try:
+        pygame.mixer.music.load("assets/audio/background.ogg")
+        pygame.mixer.music.set_volume(0.7)
+        pygame.mixer.music.play(-1)
+    except pygame.error:
+        pass
+    startup.mark("music")
+
+    # Application scenes; the frame profiler overlay is available everywhere (F3).
+    stats = stats_store.StatsStore(stats_path) if stats_path else None
+    manager = SceneManager(screen, profiler=FrameProfiler(export_path=profile_path), stats=stats, target=target)
+    manager.register("main_menu", MainMenuScene)
+    manager.register("how_to", HowToScene)
+    manager.register("stats", StatsScene)
+    manager.register("select_player", PlayerSelectScene)
+    manager.register("game", GameScene)
+    manager.push("main_menu")
+    startup.mark("scenes")
+    if preload_report:
+        print(preload.format_report(report, time.perf_counter() - startup_began))
+
+    def first_frame():
+        startup.mark("first menu frame")
+        if profile_startup:
+            print(startup.report())
+    manager.run(first_frame)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="ComSci Snakes & Ladders")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run a scripted, windowless benchmark session (see headless.py for options).")
+    parser.add_argument("--profile-json", metavar="PATH",
+                        help="Write the frame profile (F3 overlay) to PATH when a game ends.")
+    parser.add_argument("--preload-report", action="store_true",
+                        help="Print startup time and per-asset decode times after preloading.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print an import/init timing breakdown up to the first menu frame.")
+    parser.add_argument("--fullscreen", action="store_true", help="Start fullscreen (F11 toggles).")
+    parser.add_argument("--scale-quality", choices=display.SCALE_QUALITIES, default="linear",
+                        help="How SDL filters the 1280x720 frame up to the window size.")
+    parser.add_argument("--renderer", choices=("surface", "texture"), default="surface",
+                        help="Draw with software blits onto the display (default) or with SDL textures.")
+    parser.add_argument("--telemetry", metavar="PATH",
+                        help="Append JSON-lines telemetry (frames, boards, assets, scenes, games) to PATH.")
+    parser.add_argument("--telemetry-sample", type=float, default=telemetry.DEFAULT_SAMPLE_RATE,
+                        help="Fraction of frame times recorded (default 0.05).")
+    parser.add_argument("--telemetry-max-mb", type=float, default=telemetry.DEFAULT_MAX_BYTES / 2**20,
+                        help="Rotate the telemetry log at this size.")
+    parser.add_argument("--telemetry-backups", type=int, default=telemetry.DEFAULT_BACKUPS,
+                        help="Rotated telemetry logs to keep.")
+    parser.add_argument("--stats-db", metavar="PATH", default=stats_store.DEFAULT_PATH,
+                        help="SQLite file finished games are recorded in (default stats.sqlite3).")
+    parser.add_argument("--no-stats", action="store_true", help="Do not record game statistics.")
+    args, extra = parser.parse_known_args()
+    if args.telemetry:
+        telemetry.start(args.telemetry, args.telemetry_sample, int(args.telemetry_max_mb * 2**20),
+                        args.telemetry_backups)
+    if args.headless:
+        import headless
+        headless.main(extra)
+    else:
+        main(profile_path=args.profile_json, preload_report=args.preload_report,
+             profile_startup=args.profile_startup, fullscreen=args.fullscreen,
+             scale_quality=args.scale_quality, stats_path=None if args.no_stats else args.stats_db,
+             renderer=args.renderer)
@@ -0,0 +1,95 @@
+"""
+Binary wire protocol shared by server.py, netclient.py and loadtest.py.
+
+Every message is a one-byte tag followed by a fixed struct (BOARD adds its
+snake/ladder byte pairs). The server sends only deltas: a MOVE says who
+rolled what and where the token ended up, a BOARD is sent only when the
+special board changes, and clients never receive the full state again.
+"""
+import struct
+
+MODES = ("classic", "special")
+
+# Client -> server.
+JOIN = struct.Struct("<cIBB")      # b"J", table id, table size (players), mode index
+ROLL = struct.Struct("<c")         # b"R"
+
+# Server -> client.
+WELCOME = struct.Struct("<cIBBBQ") # b"W", table id, your seat, players, mode index, game seed
+START = struct.Struct("<c")        # b"S": every seat is taken, seat 0 rolls first
+BOARD = struct.Struct("<cIBB")     # b"B", board seed, snake count, ladder count; then (start, end) byte pairs
+MOVE = struct.Struct("<cBBBBB")    # b"M", seat, roll, landing cell, final cell, next seat to roll
+WIN = struct.Struct("<cB")         # b"E", winning seat
+ERROR = struct.Struct("<cB")       # b"X", error code
+
+FIXED = {b"J": JOIN, b"R": ROLL, b"W": WELCOME, b"S": START, b"M": MOVE, b"E": WIN, b"X": ERROR}
+
+# Error codes.
+ERR_TABLE_FULL = 1
+ERR_NOT_YOUR_TURN = 2
+ERR_NOT_STARTED = 3
+ERR_GAME_OVER = 4
+ERR_BAD_MESSAGE = 5
+ERR_IN_PROGRESS = 6
+ERROR_TEXT = {
+    ERR_TABLE_FULL: "Table is full",
+    ERR_NOT_YOUR_TURN: "Not your turn",
+    ERR_NOT_STARTED: "Waiting for players",
+    ERR_GAME_OVER: "Game is over",
+    ERR_BAD_MESSAGE: "Bad message",
+    ERR_IN_PROGRESS: "Game already in progress",
+}
+
+# --- ENCODING ---
+def encode_board(seed, snakes, ladders):
+    pairs = bytes(cell for pair in snakes.items() for cell in pair)
+    pairs += bytes(cell for pair in ladders.items() for cell in pair)
+    return BOARD.pack(b"B", seed, len(snakes), len(ladders)) + pairs
+
+def decode_board_pairs(header, pairs):
+    """Returns (seed, snakes, ladders) from a BOARD header tuple and its pair bytes."""
+    _, seed, n_snakes, _ = header
+    snakes = dict(zip(pairs[0:2 * n_snakes:2], pairs[1:2 * n_snakes:2]))
+    ladders = dict(zip(pairs[2 * n_snakes::2], pairs[2 * n_snakes + 1::2]))
+    return seed, snakes, ladders
+
+# --- DECODING ---
+def split_messages(buf):
+    """
+    Splits as many complete messages as possible off the front of `buf`.
+    Returns ([(tag, fields...)], bytes consumed); BOARD messages come back as
+    (b"B", seed, snakes, ladders).
+    """
+    messages, pos, end = [], 0, len(buf)
+    while pos < end:
+        tag = bytes(buf[pos:pos + 1])
+        if tag == b"B":
+            if pos + BOARD.size > end:
+                break
+            header = BOARD.unpack_from(buf, pos)
+            size = BOARD.size + 2 * (header[2] + header[3])
+            if pos + size > end:
+                break
+            messages.append((tag, *decode_board_pairs(header, bytes(buf[pos + BOARD.size:pos + size]))))
+            pos += size
+            continue
+        layout = FIXED.get(tag)
+        if layout is None:
+            raise ValueError(f"unknown message {tag!r}")
+        if pos + layout.size > end:
+            break
+        messages.append(layout.unpack_from(buf, pos))
+        pos += layout.size
+    return messages, pos
+
+async def read_message(reader):
+    """Reads one message from an asyncio StreamReader (see split_messages for the shape)."""
+    tag = await reader.readexactly(1)
+    if tag == b"B":
+        header = BOARD.unpack(tag + await reader.readexactly(BOARD.size - 1))
+        pairs = await reader.readexactly(2 * (header[2] + header[3]))
+        return (tag, *decode_board_pairs(header, pairs))
+    layout = FIXED.get(tag)
+    if layout is None:
+        raise ValueError(f"unknown message {tag!r}")
+    return layout.unpack(tag + await reader.readexactly(layout.size - 1))
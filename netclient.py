@@ -0,0 +1,128 @@
+"""
+Thin network client: SnakeLaddersGame renders the server's deltas and sends
+"roll" intents instead of rolling itself (see server.py).
+
+    python netclient.py --port 8765 --table 1 --players 2 --mode special
+"""
+import sys
+import time
+import socket
+import argparse
+from collections import deque
+
+import net_protocol as proto
+from server import DEFAULT_HOST, DEFAULT_PORT
+
+RECV_SIZE = 4096
+
+# --- CLIENT ---
+class NetClient:
+    """
+    A non-blocking connection to the game server, polled once per frame.
+    WELCOME and START are handled here; every other message is queued for the game.
+    """
+    def __init__(self, host, port, table_id, players, mode):
+        self.sock = socket.create_connection((host, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.sendall(proto.JOIN.pack(b"J", table_id, players, proto.MODES.index(mode)))
+        self.sock.setblocking(False)
+        self.buf = bytearray()
+        self.inbox = deque()
+        self.welcome = None  # (table id, seat, players, mode, seed) once seated.
+        self.started = False
+        self.roll_pending = False
+        self.closed = False
+
+    @property
+    def seat(self):
+        return self.welcome[1] if self.welcome else None
+
+    def poll(self):
+        """Reads whatever has arrived without blocking."""
+        while not self.closed:
+            try:
+                data = self.sock.recv(RECV_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                self.closed = True
+                break
+            self.buf += data
+        messages, used = proto.split_messages(self.buf)
+        del self.buf[:used]
+        for message in messages:
+            tag = message[0]
+            if tag == b"W":
+                _, table_id, seat, players, mode, seed = message
+                self.welcome = (table_id, seat, players, proto.MODES[mode], seed)
+            elif tag == b"S":
+                self.started = True
+            else:
+                if (tag == b"M" and message[1] == self.seat) or tag == b"X":
+                    self.roll_pending = False
+                self.inbox.append(message)
+
+    def next_message(self):
+        return self.inbox.popleft() if self.inbox else None
+
+    def can_roll(self, current_turn):
+        return self.started and not self.roll_pending and current_turn == self.seat
+
+    def send_roll(self):
+        self.roll_pending = True
+        self.sock.sendall(proto.ROLL.pack(b"R"))
+
+    def close(self):
+        self.closed = True
+        self.sock.close()
+
+# --- ENTRY POINT ---
+def play(host, port, table_id, players, mode):
+    """Joins a table and plays it in a window until the game ends or the window closes."""
+    import pygame
+    import display
+    from game import SnakeLaddersGame
+    from select_player import AVATAR_FILES
+
+    client = NetClient(host, port, table_id, players, mode)
+    while client.welcome is None and not client.closed:
+        client.poll()
+        time.sleep(0.01)
+    if client.welcome is None:
+        raise SystemExit("server closed the connection")
+    _, seat, players, mode, seed = client.welcome
+
+    pygame.init()
+    screen = display.open_window(f"ComSci Snakes & Ladders - table {table_id}, player {seat + 1}")
+    infos = [{"avatar": AVATAR_FILES[i % len(AVATAR_FILES)]} for i in range(players)]
+    game = SnakeLaddersGame(screen, infos, mode=mode, seed=seed)
+    game.remote = client
+    font = pygame.font.SysFont("Pixeltype", 48)
+    clock = pygame.time.Clock()
+
+    while not client.closed:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or game.handle_event(event) == "back":
+                client.close()
+        game.update()
+        game.draw()
+        if not client.started:
+            label = font.render("Waiting for players...", True, (255, 255, 255))
+            screen.blit(label, label.get_rect(center=(640, 40)))
+        pygame.display.flip()
+        clock.tick(60)
+    pygame.quit()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Join a table on a Snakes & Ladders server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--table", type=int, default=1)
+    parser.add_argument("--players", type=int, default=2, choices=range(1, 5))
+    parser.add_argument("--mode", choices=proto.MODES, default="classic")
+    args = parser.parse_args(argv)
+    play(args.host, args.port, args.table, args.players, args.mode)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
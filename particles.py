@@ -0,0 +1,242 @@
+"""
+Pooled particle effects: confetti on a win, dust when the dice land and
+sparkles on a ladder climb.
+
+All particle state lives in preallocated NumPy arrays of a fixed capacity.
+Free slots are kept on a stack of indices, and the live ones in a packed
+index buffer in emission order: emit() moves slots from the stack to the
+buffer, and update() compacts the buffer and pushes dead slots back.
+update() integrates every particle in one vectorized step with in-place
+array operations. draw() picks sprite frames and positions for the live
+particles into preallocated scratch arrays (out= throughout) and hands the
+whole frame to a single blits() call, using small pre-rendered sprites:
+rotation frames for confetti and fade frames for dust and sparkles. The
+pool never grows, and the per-frame NumPy work allocates only in proportion
+to the particles that die; the Python objects blits() needs (one sprite and
+one position per drawn particle) are the only other per-frame cost, and at
+most max_drawn particles, the newest, are drawn.
+"""
+import math
+
+import numpy as np
+import pygame
+
+DEFAULT_CAPACITY = 4096
+DEFAULT_MAX_DRAWN = 2048  # Particles blitted per frame (a win's confetti is 1500); above it the oldest are skipped.
+
+# --- EFFECT STYLES ---
+class Style:
+    """How one kind of particle is launched, moves and looks."""
+    def __init__(self, name, speed, angle, life, gravity, drag, frames, loop_rate=0.0):
+        self.name = name
+        self.speed = speed        # (min, max) launch speed, pixels per second.
+        self.angle = angle        # (min, max) launch direction, degrees (0 = right, 90 = up).
+        self.life = life          # (min, max) seconds.
+        self.gravity = gravity    # Downward acceleration, pixels per second squared.
+        self.drag = drag          # Fraction of velocity kept after one second.
+        self.frames = frames      # The sprites it animates through.
+        self.loop_rate = loop_rate  # Frames per second when looping (confetti spin); 0 fades over the life.
+
+def _confetti_frames():
+    """Spinning paper: each color squashed through half a turn. Opaque, so they blit fastest."""
+    colors = [(255, 87, 87), (255, 200, 60), (90, 200, 110), (80, 160, 255), (200, 110, 240)]
+    frames = []
+    for color in colors:
+        for step in range(8):
+            frame = pygame.Surface((max(1, round(8 * abs(math.cos(step * math.pi / 8)))), 6))
+            frame.fill(color)
+            frames.append(frame)
+    return [frames[i:i + 8] for i in range(0, len(frames), 8)]
+
+def _dust_frames():
+    """A soft gray puff that grows and fades."""
+    frames = []
+    for step in range(8):
+        radius = 4 + step
+        frame = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+        pygame.draw.circle(frame, (200, 190, 175, 170 - 20 * step), (radius, radius), radius)
+        frames.append(frame)
+    return [frames]
+
+def _sparkle_frames():
+    """A four-point star that twinkles out."""
+    frames = []
+    for step in range(8):
+        alpha = 255 - 30 * step
+        size = 9 - step // 2
+        frame = pygame.Surface((2 * size + 1, 2 * size + 1), pygame.SRCALPHA)
+        color = (255, 245, 170, alpha)
+        pygame.draw.line(frame, color, (size, 0), (size, 2 * size), 2)
+        pygame.draw.line(frame, color, (0, size), (2 * size, size), 2)
+        pygame.draw.circle(frame, (255, 255, 255, alpha), (size, size), 2)
+        frames.append(frame)
+    return [frames]
+
+def default_styles():
+    """The game's three effects. Sprites are built here, so call it after pygame.init()."""
+    return {
+        "confetti": Style("confetti", speed=(600, 1100), angle=(60, 120), life=(2.5, 4.0),
+                          gravity=420, drag=0.35, frames=_confetti_frames(), loop_rate=14),
+        "dust": Style("dust", speed=(40, 120), angle=(-20, 200), life=(0.35, 0.7),
+                      gravity=-30, drag=0.05, frames=_dust_frames()),
+        "sparkle": Style("sparkle", speed=(20, 90), angle=(0, 360), life=(0.3, 0.6),
+                         gravity=-60, drag=0.2, frames=_sparkle_frames()),
+    }
+
+# --- PARTICLE SYSTEM ---
+class ParticleSystem:
+    """A fixed-capacity pool of particles; emits beyond capacity are dropped."""
+    def __init__(self, capacity=DEFAULT_CAPACITY, styles=None, seed=None, max_drawn=DEFAULT_MAX_DRAWN):
+        self.capacity = capacity
+        self.max_drawn = max_drawn
+        self.styles = styles if styles is not None else default_styles()
+        # Its own rng: effects must never draw from (or shift) the game's seeded sequences.
+        self.rng = np.random.default_rng(seed)
+
+        # One flat sprite table; a particle animates through sprites[first:first + count].
+        self.sprites = []
+        self.variants = {}  # Style name -> [(first, count)] per sprite variant (e.g. confetti color).
+        for name, style in self.styles.items():
+            self.variants[name] = []
+            for frames in style.frames:
+                self.variants[name].append((len(self.sprites), len(frames)))
+                self.sprites.extend(frames)
+        half_sizes = [(s.get_width() / 2, s.get_height() / 2) for s in self.sprites]
+        self.sprite_offsets = np.array(half_sizes, dtype=np.float32)
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.life = np.ones(capacity, dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.drag = np.ones(capacity, dtype=np.float32)
+        self.first = np.zeros(capacity, dtype=np.int32)   # First sprite of the particle's variant.
+        self.count = np.ones(capacity, dtype=np.int32)    # Sprites in that variant.
+        self.rate = np.zeros(capacity, dtype=np.float32)  # Sprite frames per second.
+        self.loop = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Free list: a stack of unused slots, free[:free_top] are available.
+        self.free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self.free_top = capacity
+        # Live slots, packed in emission order: live[:live_count] (compacted into _spare_live).
+        self.live = np.zeros(capacity, dtype=np.int32)
+        self._spare_live = np.zeros(capacity, dtype=np.int32)
+        self.live_count = 0
+
+        # Per-frame scratch, allocated once.
+        self._step = np.zeros((capacity, 2), dtype=np.float32)
+        self._scalar = np.zeros(capacity, dtype=np.float32)
+        self._dead = np.zeros(capacity, dtype=bool)
+        self._live_flags = np.zeros(capacity, dtype=bool)
+        self._frame = np.zeros(capacity, dtype=np.float32)
+        self._looped = np.zeros(capacity, dtype=np.float32)
+        self._rate = np.zeros(capacity, dtype=np.float32)
+        self._count = np.zeros(capacity, dtype=np.int32)
+        self._sprite = np.zeros(capacity, dtype=np.int32)
+        self._first = np.zeros(capacity, dtype=np.int32)
+        self._xy = np.zeros((capacity, 2), dtype=np.float32)
+        self._offset = np.zeros((capacity, 2), dtype=np.float32)
+        self._topleft = np.zeros((capacity, 2), dtype=np.int32)
+
+    def __len__(self):
+        return self.live_count
+
+    def emit(self, style_name, origin, count, spread=0.0):
+        """
+        Launches up to count particles of a style from origin (or from a random
+        spot within spread pixels of it). Returns how many fit in the pool.
+        """
+        count = min(count, self.free_top)
+        if count <= 0:
+            return 0
+        style = self.styles[style_name]
+        rng = self.rng
+        self.free_top -= count
+        slots = self.free[self.free_top:self.free_top + count]
+
+        angle = np.radians(rng.uniform(*style.angle, count))
+        speed = rng.uniform(*style.speed, count)
+        self.pos[slots] = origin
+        if spread:
+            self.pos[slots] += rng.uniform(-spread, spread, (count, 2))
+        self.vel[slots, 0] = np.cos(angle) * speed
+        self.vel[slots, 1] = -np.sin(angle) * speed  # Screen y points down.
+        self.age[slots] = 0.0
+        self.life[slots] = rng.uniform(*style.life, count)
+        self.gravity[slots] = style.gravity
+        self.drag[slots] = style.drag
+
+        variants = np.array(self.variants[style_name], dtype=np.int32)
+        picked = variants[rng.integers(len(variants), size=count)]
+        self.first[slots], self.count[slots] = picked[:, 0], picked[:, 1]
+        if style.loop_rate:
+            self.rate[slots] = style.loop_rate * rng.uniform(0.6, 1.4, count)
+            self.loop[slots] = True
+        else:
+            self.rate[slots] = self.count[slots] / self.life[slots]  # One pass over the life.
+            self.loop[slots] = False
+        self.alive[slots] = True
+        self.live[self.live_count:self.live_count + count] = slots
+        self.live_count += count
+        return count
+
+    def update(self, dt):
+        """Advances every live particle by dt seconds and frees the ones that expired."""
+        if not self.live_count or dt <= 0:
+            return
+        alive, scratch = self.alive, self._scalar
+        np.multiply(self.gravity, dt, out=scratch)
+        self.vel[:, 1] += scratch
+        np.power(self.drag, dt, out=scratch)
+        self.vel *= scratch[:, None]
+        np.multiply(self.vel, dt, out=self._step)
+        self.pos += self._step
+        self.age += dt
+
+        # Expired particles leave the live buffer and go back on the free stack.
+        np.greater_equal(self.age, self.life, out=self._dead)
+        count = self.live_count
+        live = self.live[:count]
+        dying = np.take(self._dead, live, out=self._live_flags[:count])
+        deaths = int(np.count_nonzero(dying))
+        if deaths:
+            dead = live[dying]  # The only allocation: one index per dying particle.
+            alive[dead] = False
+            self.free[self.free_top:self.free_top + deaths] = dead
+            self.free_top += deaths
+            np.logical_not(dying, out=dying)
+            np.compress(dying, live, out=self._spare_live[:count - deaths])
+            self.live, self._spare_live = self._spare_live, self.live
+            self.live_count = count - deaths
+
+    def clear(self):
+        """Frees every particle."""
+        self.alive[:] = False
+        self.free[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self.free_top = self.capacity
+        self.live_count = 0
+
+    def draw(self, screen):
+        """Draws the live particles (the newest max_drawn of them) with one blits() call."""
+        n = min(self.live_count, self.max_drawn)
+        if not n:
+            return
+        live = self.live[self.live_count - n:self.live_count]
+        # Sprite frame: looping styles wrap around, fading ones stop on their last frame.
+        frame = np.take(self.age, live, out=self._frame[:n])
+        frame *= np.take(self.rate, live, out=self._rate[:n])
+        count = np.take(self.count, live, out=self._count[:n])
+        np.fmod(frame, count, out=self._looped[:n])
+        count -= 1
+        np.minimum(frame, count, out=frame)
+        np.copyto(frame, self._looped[:n], where=np.take(self.loop, live, out=self._live_flags[:n]))
+        sprite = self._sprite[:n]
+        np.copyto(sprite, frame, casting="unsafe")
+        sprite += np.take(self.first, live, out=self._first[:n])
+
+        xy = np.take(self.pos, live, axis=0, out=self._xy[:n])
+        xy -= np.take(self.sprite_offsets, sprite, axis=0, out=self._offset[:n])
+        topleft = self._topleft[:n]
+        np.copyto(topleft, xy, casting="unsafe")
+        screen.blits(zip(map(self.sprites.__getitem__, sprite.tolist()), topleft.tolist()), doreturn=False)
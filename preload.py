@@ -0,0 +1,172 @@
+import sys
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+import asset_manager
+
+# --- CONFIGURATION ---
+DEFAULT_WORKERS = 4
+LOADING_BG_COLOR = (18, 18, 18)
+LOADING_BAR_COLOR = (255, 220, 120)
+LOADING_BAR_SIZE = (480, 24)
+
+# --- MANIFEST ---
+def collect_requests(screen_size, menu_requests=(), include_special=False):
+    """
+    Gathers the image requests of every screen, without duplicate cache keys.
+    Special-mode images are left to the game scene's warm-up unless include_special
+    is set, so startup never imports the board generator.
+    """
+    import select_player, howtoplay, transitions, game
+
+    requests = list(menu_requests)
+    requests += select_player.asset_requests()
+    requests += howtoplay.asset_requests(screen_size)
+    requests.append(transitions.curtain_request(screen_size))
+    requests += game.asset_requests(select_player.AVATAR_FILES)
+    if include_special:
+        requests += game.special_asset_requests()
+
+    unique, seen = [], set()
+    for req in requests:
+        key = asset_manager.ASSETS.key_for(req.path, req.size, req.mode, req.alpha)
+        if key not in seen and key not in asset_manager.ASSETS.surfaces:
+            seen.add(key)
+            unique.append(req)
+    return unique
+
+# --- PRELOADER ---
+def _decode(manager, keys):
+    """Worker-thread job: decode one file once and pre-scale it to every requested size."""
+    t0 = time.perf_counter()
+    source = pygame.image.load(manager.resolve(keys[0][0]).as_posix())
+    surfaces = [manager.decode(key, source) for key in keys]
+    return surfaces, time.perf_counter() - t0
+
+class Preloader:
+    """
+    Decodes and pre-scales images on a thread pool, then hands them to the main thread.
+
+    pygame releases the GIL while decoding PNGs and smoothscaling, so workers
+    run in parallel; poll() (main thread) converts finished surfaces for the
+    display and stores them in the asset cache.
+    """
+    def __init__(self, requests, manager=asset_manager.ASSETS, workers=DEFAULT_WORKERS):
+        self.manager = manager
+        self.requests = list(requests)
+        self.pending = {}   # Future -> [(AssetRequest, cache key)] for one file
+        self.timings = []   # (path, sizes, decode seconds)
+        self.failures = []  # (path, error message)
+        self.started = time.perf_counter()
+        self.finished = None
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preload")
+        by_path = {}
+        for req in self.requests:
+            key = manager.key_for(req.path, req.size, req.mode, req.alpha)
+            by_path.setdefault(str(req.path), []).append((req, key))
+        self.total_jobs = len(by_path)
+        for jobs in by_path.values():
+            future = self.executor.submit(_decode, manager, [key for _, key in jobs])
+            self.pending[future] = jobs
+
+    @property
+    def progress(self):
+        """Fraction of files that have been handed to the cache."""
+        return 1.0 if not self.total_jobs else 1 - len(self.pending) / self.total_jobs
+
+    @property
+    def done(self):
+        return not self.pending
+
+    def poll(self):
+        """Adopts every finished decode into the asset cache (call from the main thread)."""
+        for future in [f for f in self.pending if f.done()]:
+            jobs = self.pending.pop(future)
+            path = jobs[0][0].path
+            try:
+                surfaces, seconds = future.result()
+            except (pygame.error, OSError) as exc:
+                self.failures.append((path, str(exc)))
+                for req, _ in jobs:
+                    if req.fallback is not None:
+                        self.manager.request(req)  # Caches the fallback surface.
+                continue
+            for (_, key), surface in zip(jobs, surfaces):
+                self.manager.adopt(key, surface)
+            self.timings.append((path, [key[1] for _, key in jobs], seconds))
+        if self.done and self.finished is None:
+            self.finished = time.perf_counter()
+            self.executor.shutdown(wait=False)
+
+    def report(self):
+        """Returns total wall time and per-asset decode timings."""
+        end = self.finished or time.perf_counter()
+        return {
+            "wall_seconds": end - self.started,
+            "decode_seconds": sum(t for _, _, t in self.timings),
+            "assets": sorted(self.timings, key=lambda item: item[2], reverse=True),
+            "failures": self.failures,
+            "cache_bytes": self.manager.total_bytes(),
+        }
+
+def format_report(report, startup_seconds=None):
+    """Formats a preload report for the terminal."""
+    lines = []
+    if startup_seconds is not None:
+        lines.append(f"startup: {startup_seconds * 1000:.1f}ms to first menu frame")
+    lines.append(
+        f"preload: {len(report['assets'])} files in {report['wall_seconds'] * 1000:.1f}ms wall "
+        f"({report['decode_seconds'] * 1000:.1f}ms decode), cache {report['cache_bytes'] / 2**20:.1f}MiB"
+    )
+    for path, sizes, seconds in report["assets"]:
+        shown = ", ".join(f"{s[0]}x{s[1]}" if s else "native" for s in sizes)
+        lines.append(f"  {seconds * 1000:8.2f}ms  {path} [{shown}]")
+    for path, error in report["failures"]:
+        lines.append(f"  FAILED     {path}: {error}")
+    return "\n".join(lines)
+
+# --- LOADING SCREEN ---
+def run_loading_screen(screen, requests, workers=DEFAULT_WORKERS, present=None):
+    """
+    Shows an animated loading bar until every request is decoded and cached.
+    Frames are drawn on screen and shown with present(screen) when given (a
+    render backend's show), otherwise with pygame.display.flip().
+    """
+    preloader = Preloader(requests, workers=workers)
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont("Pixeltype", 48)
+    sw, sh = screen.get_size()
+    bar = pygame.Rect(0, 0, *LOADING_BAR_SIZE)
+    bar.center = (sw // 2, sh // 2 + 40)
+    elapsed = 0.0
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or event.type == pygame.WINDOWCLOSE:
+                pygame.quit()
+                sys.exit()
+
+        preloader.poll()
+
+        screen.fill(LOADING_BG_COLOR)
+        dots = "." * (1 + int(elapsed * 3) % 3)
+        label = font.render(f"Loading{dots}", True, (255, 255, 255))
+        screen.blit(label, label.get_rect(midbottom=(sw // 2, bar.top - 16)))
+        pygame.draw.rect(screen, (255, 255, 255), bar, 3)
+        fill = bar.inflate(-8, -8)
+        fill.width = int(fill.width * preloader.progress)
+        pygame.draw.rect(screen, LOADING_BAR_COLOR, fill)
+        # A small bobbing marker keeps the screen visibly alive while waiting on big files.
+        marker_x = bar.left + (bar.width * (0.5 + 0.5 * math.sin(elapsed * 4)))
+        pygame.draw.circle(screen, LOADING_BAR_COLOR, (int(marker_x), bar.bottom + 20), 6)
+        if present:
+            present(screen)
+        else:
+            pygame.display.flip()
+
+        if preloader.done:
+            return preloader.report()
+        elapsed += clock.tick(60) / 1000.0
@@ -0,0 +1,162 @@
+import json
+import time
+from array import array
+
+import pygame
+
+# --- CONFIGURATION ---
+PHASES = ("events", "update", "board", "players", "particles", "panel", "text", "flip", "tick")
+DEFAULT_CAPACITY = 300          # Frames kept in the ring buffer (5 seconds at 60 FPS).
+TOGGLE_KEY = pygame.K_F3
+OVERLAY_POS = (10, 90)
+OVERLAY_SIZE = (300, 190)
+SPARKLINE_BUDGET_MS = 33.3      # Sparkline full height; 16.7ms is drawn as a guide line.
+
+# --- FRAME PROFILER ---
+class FrameProfiler:
+    """
+    Records per-phase frame timings into a fixed-size ring buffer.
+
+    Call begin_frame() at the top of a frame, lap(phase) after each phase and
+    end_frame() at the bottom. Nothing is allocated per frame: timings live in
+    preallocated arrays, and labels (e.g. "regenerate") are attached to the
+    frame they happened in so hitches can be traced back to their cause.
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY, phases=PHASES, export_path=None):
+        self.capacity = capacity
+        self.phases = phases
+        self.phase_index = {name: i for i, name in enumerate(phases)}
+        self.samples = array("d", [0.0]) * (capacity * len(phases))
+        self.totals = array("d", [0.0]) * capacity
+        self.labels = [None] * capacity
+        self.count = 0      # Total frames recorded (the buffer holds the last `capacity`).
+        self.index = 0      # Slot of the frame currently being recorded.
+        self.visible = False
+        self.export_path = export_path
+        self._frame_start = 0.0
+        self._last_lap = 0.0
+        self._font = None
+
+    # --- Recording ---
+    def begin_frame(self):
+        """Starts timing a new frame and clears its slot."""
+        base = self.index * len(self.phases)
+        for i in range(len(self.phases)):
+            self.samples[base + i] = 0.0
+        self.labels[self.index] = None
+        self._frame_start = self._last_lap = time.perf_counter()
+
+    def lap(self, phase):
+        """Adds the time since the previous lap to the given phase."""
+        now = time.perf_counter()
+        self.samples[self.index * len(self.phases) + self.phase_index[phase]] += now - self._last_lap
+        self._last_lap = now
+
+    def note(self, label):
+        """Attaches an event label to the frame being recorded."""
+        current = self.labels[self.index]
+        self.labels[self.index] = label if current is None else f"{current},{label}"
+
+    def end_frame(self):
+        """Stores the frame's total time and advances the ring buffer."""
+        self.totals[self.index] = time.perf_counter() - self._frame_start
+        self.index = (self.index + 1) % self.capacity
+        self.count += 1
+
+    # --- Queries ---
+    def _ordered_slots(self):
+        """Slot indices of the recorded frames, oldest first."""
+        size = min(self.count, self.capacity)
+        start = (self.index - size) % self.capacity
+        return [(start + i) % self.capacity for i in range(size)]
+
+    def frame_times(self):
+        """Recorded frame totals in seconds, oldest first."""
+        return [self.totals[slot] for slot in self._ordered_slots()]
+
+    def percentiles(self, qs=(0.5, 0.95, 0.99)):
+        """Returns {q: frame time in ms} over the buffered frames, plus 'max'."""
+        ordered = sorted(self.frame_times())
+        if not ordered:
+            return {q: 0.0 for q in qs} | {"max": 0.0}
+        result = {q: 1000 * ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in qs}
+        result["max"] = 1000 * ordered[-1]
+        return result
+
+    def phase_means(self):
+        """Mean time per phase in ms over the buffered frames."""
+        slots = self._ordered_slots()
+        n = len(self.phases)
+        if not slots:
+            return {name: 0.0 for name in self.phases}
+        return {
+            name: 1000 * sum(self.samples[slot * n + i] for slot in slots) / len(slots)
+            for i, name in enumerate(self.phases)
+        }
+
+    def export_json(self, path=None):
+        """Writes the buffered frames (oldest first) to a JSON file."""
+        path = path or self.export_path
+        if not path:
+            return None
+        n = len(self.phases)
+        frames = []
+        first_frame = self.count - min(self.count, self.capacity)
+        for offset, slot in enumerate(self._ordered_slots()):
+            frame = {"frame": first_frame + offset, "total_ms": 1000 * self.totals[slot]}
+            frame.update({name: 1000 * self.samples[slot * n + i] for i, name in enumerate(self.phases)})
+            if self.labels[slot]:
+                frame["labels"] = self.labels[slot]
+            frames.append(frame)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({
+                "phases": list(self.phases),
+                "percentiles_ms": {str(k): v for k, v in self.percentiles().items()},
+                "frames": frames,
+            }, fh, indent=1)
+        return path
+
+    # --- Overlay ---
+    def handle_event(self, event):
+        """Toggles the overlay with F3. Returns True if the event was consumed."""
+        if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.visible = not self.visible
+            return True
+        return False
+
+    def draw(self, surface):
+        """Draws percentile stats, per-phase means and a frame-time sparkline."""
+        if not self.visible:
+            return
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+
+        # Everything is drawn onto the panel, which is blitted once, so any render backend can show it.
+        w, h = OVERLAY_SIZE
+        panel = pygame.Surface((w, h), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        pct = self.percentiles()
+        lines = [f"p50 {pct[0.5]:.1f}  p95 {pct[0.95]:.1f}  p99 {pct[0.99]:.1f}  max {pct['max']:.1f} ms"]
+        means = self.phase_means()
+        lines += [
+            "  ".join(f"{name} {means[name]:.2f}" for name in self.phases[i:i + 3])
+            for i in range(0, len(self.phases), 3)
+        ]
+        for i, text in enumerate(lines):
+            panel.blit(self._font.render(text, True, (255, 255, 255)), (8, 6 + i * 18))
+
+        # Sparkline of the buffered frame times, with a 60 FPS guide line.
+        times = self.frame_times()
+        graph = pygame.Rect(8, 90, w - 16, h - 100)
+        budget_y = graph.bottom - graph.height * min(1.0, 16.7 / SPARKLINE_BUDGET_MS)
+        pygame.draw.line(panel, (90, 200, 90), (graph.left, budget_y), (graph.right, budget_y))
+        if len(times) > 1:
+            step = graph.width / (self.capacity - 1)
+            points = [
+                (graph.left + i * step,
+                 graph.bottom - graph.height * min(1.0, 1000 * t / SPARKLINE_BUDGET_MS))
+                for i, t in enumerate(times)
+            ]
+            pygame.draw.lines(panel, (255, 200, 60), False, points)
+        surface.blit(panel, OVERLAY_POS)
@@ -0,0 +1,154 @@
+"""
+Render backends: where a scene's draw() calls end up.
+
+Every draw method only calls blit(source, dest, area=None) on its target, so
+it can draw to either backend:
+
+- SurfaceBackend is the classic path: software Surface.blit onto the
+  display surface, then pygame.display.flip().
+- TextureBackend is built on pygame._sdl2.video. Each source surface is
+  uploaded to a Texture the first time it is drawn and cached for as long as
+  the surface lives; a blit is then a renderer copy. Static layers (the
+  background, the board, the dice faces, avatars) are uploaded once and never
+  touch the CPU-side pixels again. It also runs on SDL's software renderer
+  (software=True), so machines without a GPU can use it.
+
+Source surfaces are treated as immutable once drawn: code that redraws into
+a surface it has already shown must call invalidate(surface) (the game builds
+a new surface for every special board, so it never needs to). bench.py
+compares the two backends on the menu, player select and game frames, and
+`main.py --renderer texture` (open_texture_window) plays the whole game
+through a TextureBackend.
+"""
+import os
+import weakref
+
+import pygame
+from pygame._sdl2.video import Window, Renderer, Texture
+
+from display import LOGICAL_SIZE, SCALE_QUALITIES
+
+BLENDMODE_NONE = 0  # SDL_BLENDMODE_NONE: copy the texture's pixels as they are.
+
+class SurfaceBackend:
+    """Draws straight onto a Surface (the display surface by default)."""
+    name = "surface"
+
+    def __init__(self, surface=None):
+        self.surface = surface or pygame.display.get_surface()
+
+    def blit(self, source, dest, area=None):
+        return self.surface.blit(source, dest, area)
+
+    def blits(self, sequence, doreturn=True):
+        return self.surface.blits(sequence, doreturn)
+
+    def fill(self, color):
+        self.surface.fill(color)
+
+    def get_size(self):
+        return self.surface.get_size()
+
+    def get_rect(self, **kwargs):
+        return self.surface.get_rect(**kwargs)
+
+    def present(self):
+        pygame.display.flip()
+
+class TextureBackend:
+    """
+    Draws with an SDL renderer into its own window, LOGICAL_SIZE logical
+    pixels scaled to the window. software=True asks SDL for its software
+    renderer instead of a GPU one.
+    """
+    name = "texture"
+
+    def __init__(self, caption="Snakes and Ladders", size=LOGICAL_SIZE, software=False, vsync=False, hidden=False,
+                 fullscreen=False):
+        self.size = tuple(size)
+        self.fullscreen = fullscreen
+        self.window = Window(caption, size=self.size, hidden=hidden, fullscreen_desktop=fullscreen)
+        self.renderer = Renderer(self.window, accelerated=0 if software else -1, vsync=vsync)
+        self.renderer.logical_size = self.size
+        self.textures = weakref.WeakKeyDictionary()  # Source surface -> its uploaded Texture.
+        self.uploads = 0
+
+    def texture(self, source, opaque=False):
+        """
+        The Texture for source, uploading it on first use. An opaque texture is
+        copied without blending, which the software renderer does much faster.
+        """
+        texture = self.textures.get(source)
+        if texture is None:
+            texture = self.textures[source] = Texture.from_surface(self.renderer, source)
+            if opaque:
+                texture.blend_mode = BLENDMODE_NONE
+            self.uploads += 1
+        return texture
+
+    def invalidate(self, source):
+        """Drops the cached Texture of a surface that was drawn into since it was shown."""
+        self.textures.pop(source, None)
+
+    def blit(self, source, dest, area=None):
+        """Surface.blit's contract: dest is a position or a rect (only its topleft counts)."""
+        area = pygame.Rect(area) if area is not None else source.get_rect()
+        x, y = dest[0], dest[1]
+        target = pygame.Rect(x, y, area.width, area.height)
+        # A full-frame background covers everything drawn before it, so it need not blend.
+        background = target.topleft == (0, 0) and target.size == self.size
+        self.texture(source, opaque=background).draw(srcrect=area, dstrect=target)
+        return target
+
+    def blits(self, sequence, doreturn=True):
+        """Surface.blits: (source, dest) or (source, dest, area) items, drawn in order."""
+        rects = [self.blit(*item) for item in sequence]
+        return rects if doreturn else None
+
+    def fill(self, color):
+        self.renderer.draw_color = color
+        self.renderer.clear()
+
+    def get_size(self):
+        return self.size
+
+    def get_rect(self, **kwargs):
+        rect = pygame.Rect((0, 0), self.size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)  # Same keywords as Surface.get_rect(center=...).
+        return rect
+
+    def present(self):
+        self.renderer.present()
+
+    def show(self, surface):
+        """Presents a frame drawn on the CPU into surface (the loading screen, which draws shapes)."""
+        self.invalidate(surface)
+        self.blit(surface, (0, 0))
+        self.present()
+
+    def toggle_fullscreen(self):
+        """Switches between window and desktop fullscreen; the logical size stays the same."""
+        self.fullscreen = not self.fullscreen
+        if self.fullscreen:
+            self.window.set_fullscreen(desktop=True)
+        else:
+            self.window.set_windowed()
+
+    def close(self):
+        self.textures.clear()
+        self.window.destroy()
+
+def open_texture_window(caption, fullscreen=False, scale_quality="linear", vsync=True):
+    """
+    display.open_window for the texture renderer: returns (screen, backend).
+    Scenes still get a LOGICAL_SIZE screen Surface (their size, and the frame
+    the curtain covers is drawn there), but every frame goes through the
+    backend. A hidden 1x1 display mode is opened too, for convert().
+    """
+    if scale_quality not in SCALE_QUALITIES:
+        raise ValueError(f"scale_quality must be one of {SCALE_QUALITIES}")
+    os.environ["SDL_RENDER_SCALE_QUALITY"] = scale_quality
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    backend = TextureBackend(caption, fullscreen=fullscreen, vsync=vsync)
+    return pygame.Surface(LOGICAL_SIZE), backend
@@ -0,0 +1,211 @@
+"""
+Multi-process render farm for special boards.
+
+Worker processes run board_generator's generate_board_state and
+render_board_surface off-screen, drawing straight into
+multiprocessing.shared_memory blocks; the parent wraps each block with
+pygame.image.frombuffer, so no pixels are pickled or copied between
+processes. Gallery mode tiles thousands of boards into contact-sheet PNGs,
+with every worker drawing its thumbnails straight into the shared sheet:
+
+    python render_farm.py --boards 200
+    python render_farm.py --boards 2000 --gallery gallery/ --columns 10 --thumb 140
+"""
+import os
+import sys
+import time
+import argparse
+from collections import namedtuple
+from multiprocessing import Pool, resource_tracker, shared_memory
+
+import pygame
+
+DEFAULT_COLUMNS = 10
+DEFAULT_THUMB = 140   # Thumbnail side in pixels.
+SHEET_BACKGROUND = (20, 20, 30, 255)
+BLOCKS_PER_WORKER = 2  # Shared pixel blocks in flight per worker.
+
+RenderedBoard = namedtuple("RenderedBoard", "seed surface snakes ladders")
+
+# --- WORKER SIDE ---
+def _init_worker():
+    """Gives each worker a headless pygame; convert_alpha() needs a display mode."""
+    import headless
+    headless.enable_dummy_drivers()
+    pygame.display.set_mode((1, 1))
+
+def _attach(name):
+    """Opens a block the parent created. The parent owns (and unlinks) it, so the
+    attach must not be tracked here too, or the tracker reports it as leaked."""
+    block = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+def _draw_board(seed, target):
+    """Generates the board for seed and renders it onto target; returns its (snakes, ladders) maps."""
+    import board_generator as bg
+    with bg.seeded_random(seed):
+        state = bg.generate_board_state()
+    target.fill((0, 0, 0, 0))
+    bg.render_board_surface(*state, draw_background=True, ladder_on_top=bg.LADDER_ON_TOP, target_surface=target)
+    snake_pos, ladder_pos = state[0], state[1]
+    return dict(snake_pos), dict(ladder_pos)
+
+def _render_into_block(seed, block_name, size):
+    """Renders one board directly into a shared block of size[0] * size[1] RGBA pixels."""
+    block = _attach(block_name)
+    try:
+        target = pygame.image.frombuffer(block.buf, size, "RGBA")
+        maps = _draw_board(seed, target)
+        del target  # Release the buffer export before closing the block.
+    finally:
+        block.close()
+    return seed, maps
+
+def _render_into_sheet(seeds, sheet_name, sheet_size, tiles, thumb):
+    """Renders boards and draws each thumbnail into its tile of a shared contact sheet."""
+    import board_generator as bg
+    board = pygame.Surface((bg.WIDTH, bg.HEIGHT), pygame.SRCALPHA)
+    thumbnail = pygame.Surface((thumb, thumb), pygame.SRCALPHA)
+    block = _attach(sheet_name)
+    try:
+        sheet = pygame.image.frombuffer(block.buf, sheet_size, "RGBA")
+        for seed, topleft in zip(seeds, tiles):
+            _draw_board(seed, board)
+            pygame.transform.smoothscale(board, (thumb, thumb), thumbnail)
+            sheet.blit(thumbnail, topleft)
+        del sheet
+    finally:
+        block.close()
+    return len(seeds)
+
+def _save_sheet(sheet_name, sheet_size, path):
+    """PNG-encodes a finished shared sheet (run on a worker, so encoding is parallel too)."""
+    block = _attach(sheet_name)
+    try:
+        sheet = pygame.image.frombuffer(block.buf, sheet_size, "RGBA")
+        pygame.image.save(sheet, path)
+        del sheet
+    finally:
+        block.close()
+    return path
+
+# --- FARM ---
+class RenderFarm:
+    """A pool of board-rendering worker processes. Use it as a context manager."""
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = Pool(self.workers, initializer=_init_worker)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def render(self, seeds):
+        """
+        Yields a RenderedBoard per seed, in order. Each surface wraps a shared
+        block that is reused once the consumer asks for the next board, so
+        copy() any surface that must outlive its iteration step.
+        """
+        import board_generator as bg
+        size = (bg.WIDTH, bg.HEIGHT)
+        seeds = list(seeds)
+        blocks = [shared_memory.SharedMemory(create=True, size=size[0] * size[1] * 4)
+                  for _ in range(min(len(seeds), self.workers * BLOCKS_PER_WORKER))]
+        try:
+            free, pending, next_seed = list(blocks), [], 0
+            while next_seed < len(seeds) or pending:
+                # Keep every free block busy, then hand boards back in seed order.
+                while free and next_seed < len(seeds):
+                    block = free.pop()
+                    job = self.pool.apply_async(_render_into_block, (seeds[next_seed], block.name, size))
+                    pending.append((block, job))
+                    next_seed += 1
+                block, job = pending.pop(0)
+                seed, (snakes, ladders) = job.get()
+                surface = pygame.image.frombuffer(block.buf, size, "RGBA")
+                yield RenderedBoard(seed, surface, snakes, ladders)
+                del surface
+                free.append(block)
+        finally:
+            for _, job in pending:
+                job.wait()  # A consumer that stopped early must not unlink blocks still being drawn.
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def gallery(self, seeds, out_dir, columns=DEFAULT_COLUMNS, thumb=DEFAULT_THUMB):
+        """
+        Tiles the boards for seeds into columns x columns contact sheets under
+        out_dir. Returns the list of PNG paths written.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        seeds = list(seeds)
+        per_sheet = columns * columns
+        sheet_size = (columns * thumb, columns * thumb)
+        sheets, jobs = [], []
+        try:
+            for first in range(0, len(seeds), per_sheet):
+                block = shared_memory.SharedMemory(create=True, size=sheet_size[0] * sheet_size[1] * 4)
+                sheet = pygame.image.frombuffer(block.buf, sheet_size, "RGBA")
+                sheet.fill(SHEET_BACKGROUND)
+                del sheet
+                path = os.path.join(out_dir, f"sheet_{first // per_sheet:04d}.png")
+                sheets.append((block, path))
+
+                # One job per sheet row spreads a sheet across every worker.
+                sheet_seeds = seeds[first:first + per_sheet]
+                rows = [sheet_seeds[i:i + columns] for i in range(0, len(sheet_seeds), columns)]
+                row_jobs = [
+                    self.pool.apply_async(_render_into_sheet, (
+                        row, block.name, sheet_size, [(c * thumb, r * thumb) for c in range(len(row))], thumb))
+                    for r, row in enumerate(rows)
+                ]
+                jobs.append((block, path, row_jobs))
+
+            # Each sheet is encoded on a worker as soon as all of its rows are drawn.
+            saves = []
+            for block, path, row_jobs in jobs:
+                for job in row_jobs:
+                    job.get()
+                saves.append(self.pool.apply_async(_save_sheet, (block.name, sheet_size, path)))
+            return [save.get() for save in saves]
+        finally:
+            for block, _ in sheets:
+                block.close()
+                block.unlink()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render special boards on every core.")
+    parser.add_argument("--boards", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0, help="First board seed; boards use seed, seed + 1, ...")
+    parser.add_argument("--workers", type=int, default=None, help="Defaults to one per core.")
+    parser.add_argument("--gallery", metavar="DIR", help="Write contact-sheet PNGs to DIR.")
+    parser.add_argument("--columns", type=int, default=DEFAULT_COLUMNS)
+    parser.add_argument("--thumb", type=int, default=DEFAULT_THUMB)
+    args = parser.parse_args(argv)
+
+    seeds = range(args.seed, args.seed + args.boards)
+    start = time.perf_counter()
+    with RenderFarm(args.workers) as farm:
+        if args.gallery:
+            paths = farm.gallery(seeds, args.gallery, args.columns, args.thumb)
+            what = f"{len(paths)} sheets in {args.gallery}"
+        else:
+            for _ in farm.render(seeds):
+                pass
+            what = "boards"
+        workers = farm.workers
+    elapsed = time.perf_counter() - start
+    print(f"{args.boards} boards ({what}) on {workers} workers in {elapsed:.2f}s "
+          f"({args.boards / elapsed:.1f} boards/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,257 @@
+"""
+Deterministic replay log.
+
+Every game writes a compact, append-only binary stream: the game's seed, mode
+and player count, each board in play (snakes and ladders, plus the seed it was
+generated from) and each roll. Records are written as they happen and read
+back one at a time, so logs of long sessions are never held in memory:
+
+    python headless.py --mode classic --games 200 --record games.slr
+    python replay.py verify games.slr        # max-speed, rules only, no rendering
+    python replay.py play games.slr --index 3  # watch one game at normal speed
+"""
+import os
+import sys
+import time
+import struct
+import argparse
+
+from rules import FINAL_CELL
+from game_state import ROLL_STRIDE, CLASSIC_MOVES, jump_table, move_table
+
+MAGIC = b"SLRP"
+VERSION = 1
+MODES = ("classic", "special")
+READ_CHUNK = 1 << 16
+
+# Record layouts (little endian); each record starts with its one-byte tag.
+FILE_HEADER = struct.Struct("<4sB")   # magic, version
+GAME_START = struct.Struct("<cBBQ")   # b"G", mode index, player count, game seed
+BOARD = struct.Struct("<cIBB")        # b"B", board seed, snake count, ladder count; then (start, end) byte pairs
+ROLL = struct.Struct("<cBB")          # b"R", player index, dice value
+GAME_END = struct.Struct("<cBI")      # b"E", winner, roll count
+
+# --- WRITING ---
+class ReplayWriter:
+    """
+    Appends game records to a replay file.
+    A new file gets the header; an existing one must already be a replay log.
+    """
+    def __init__(self, path):
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, "rb") as fh:
+                _check_header(fh.read(FILE_HEADER.size))
+        self.fh = open(path, "ab")
+        if not exists:
+            self.fh.write(FILE_HEADER.pack(MAGIC, VERSION))
+        self.rolls = 0
+
+    def start_game(self, mode, players, seed):
+        self.rolls = 0
+        self.fh.write(GAME_START.pack(b"G", MODES.index(mode), players, seed))
+
+    def board(self, seed, snakes, ladders):
+        """Records the board in play from now on (seed 0 for the fixed classic board)."""
+        self.fh.write(BOARD.pack(b"B", seed, len(snakes), len(ladders)))
+        self.fh.write(bytes(cell for pair in snakes.items() for cell in pair))
+        self.fh.write(bytes(cell for pair in ladders.items() for cell in pair))
+
+    def roll(self, player, value):
+        self.rolls += 1
+        self.fh.write(ROLL.pack(b"R", player, value))
+
+    def end_game(self, winner):
+        self.fh.write(GAME_END.pack(b"E", winner, self.rolls))
+        self.fh.flush()  # A finished game is always complete on disk.
+
+    def close(self):
+        self.fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# --- READING ---
+def _check_header(header):
+    if len(header) < FILE_HEADER.size:
+        raise ValueError("not a replay log (file too short)")
+    magic, version = FILE_HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} replay log")
+
+def read_records(path):
+    """
+    Streams the records of a replay log as tuples:
+    ("G", mode, players, seed), ("B", seed, snakes, ladders), ("R", player, value), ("E", winner, rolls).
+    A record cut short at the end of the file (e.g. after a crash) ends the stream.
+    """
+    with open(path, "rb") as fh:
+        _check_header(fh.read(FILE_HEADER.size))
+        buf, pos = b"", 0
+        while True:
+            chunk = fh.read(READ_CHUNK)
+            buf, pos = buf[pos:] + chunk, 0
+            end = len(buf)
+            while pos < end:
+                tag = buf[pos:pos + 1]
+                if tag == b"R":
+                    if pos + ROLL.size > end: break
+                    _, player, value = ROLL.unpack_from(buf, pos)
+                    pos += ROLL.size
+                    yield ("R", player, value)
+                elif tag == b"B":
+                    if pos + BOARD.size > end: break
+                    _, seed, n_snakes, n_ladders = BOARD.unpack_from(buf, pos)
+                    size = BOARD.size + 2 * (n_snakes + n_ladders)
+                    if pos + size > end: break
+                    cells = buf[pos + BOARD.size:pos + size]
+                    snakes = dict(zip(cells[0:2 * n_snakes:2], cells[1:2 * n_snakes:2]))
+                    ladders = dict(zip(cells[2 * n_snakes::2], cells[2 * n_snakes + 1::2]))
+                    pos += size
+                    yield ("B", seed, snakes, ladders)
+                elif tag == b"G":
+                    if pos + GAME_START.size > end: break
+                    _, mode, players, seed = GAME_START.unpack_from(buf, pos)
+                    pos += GAME_START.size
+                    yield ("G", MODES[mode], players, seed)
+                elif tag == b"E":
+                    if pos + GAME_END.size > end: break
+                    _, winner, rolls = GAME_END.unpack_from(buf, pos)
+                    pos += GAME_END.size
+                    yield ("E", winner, rolls)
+                else:
+                    raise ValueError(f"corrupt replay log: unknown record {tag!r}")
+            if not chunk:
+                return
+
+def iter_games(path):
+    """Streams complete games as dicts with seed, mode, players, boards, rolls and winner."""
+    game = None
+    for record in read_records(path):
+        kind = record[0]
+        if kind == "G":
+            game = {"mode": record[1], "players": record[2], "seed": record[3],
+                    "boards": [], "rolls": [], "winner": None}
+        elif game is None:
+            continue
+        elif kind == "B":
+            game["boards"].append((len(game["rolls"]), record[1], record[2], record[3]))
+        elif kind == "R":
+            game["rolls"].append((record[1], record[2]))
+        else:
+            game["winner"] = record[1]
+            yield game
+            game = None
+
+# --- HEADLESS REPLAY ---
+def replay_headless(path):
+    """
+    Re-plays every game in a log with the rules alone (no pygame, no rendering)
+    and checks each recomputed winner against the recorded one.
+    Returns a summary dict with throughput and any mismatching game indices.
+    """
+    games = rolls = 0
+    mismatches = []
+    positions, moves = [], CLASSIC_MOVES
+    winner = None
+    start = time.perf_counter()
+    for record in read_records(path):
+        kind = record[0]
+        if kind == "R":
+            # rules.resolve_move as one lookup in the board's move table.
+            _, player, value = record
+            cell = moves[positions[player] * ROLL_STRIDE + value]
+            positions[player] = cell
+            rolls += 1
+            if cell == FINAL_CELL and winner is None:
+                winner = player
+        elif kind == "B":
+            moves = move_table(jump_table(record[2], record[3]))
+        elif kind == "G":
+            positions, winner = [1] * record[2], None
+        else:
+            if winner != record[1]:
+                mismatches.append(games)
+            games += 1
+    seconds = time.perf_counter() - start
+    return {
+        "games": games,
+        "rolls": rolls,
+        "seconds": seconds,
+        "games_per_second": games / seconds if seconds else 0.0,
+        "mismatches": mismatches,
+    }
+
+# --- INTERACTIVE REPLAY ---
+def play_interactive(path, index=0):
+    """
+    Opens a window and replays one logged game at normal speed through
+    SnakeLaddersGame. The game is rebuilt from its seed and rolls itself;
+    every roll is checked against the log as it happens.
+    """
+    import pygame
+    import display
+    from game import SnakeLaddersGame, DICE_POS
+    from headless import DEFAULT_AVATARS, AutoDicePolicy
+
+    game_log = next((g for i, g in enumerate(iter_games(path)) if i == index), None)
+    if game_log is None:
+        raise SystemExit(f"{path}: no game #{index}")
+
+    pygame.init()
+    screen = display.open_window(f"Replay #{index} (seed {game_log['seed']})")
+    infos = [{"avatar": DEFAULT_AVATARS[i % len(DEFAULT_AVATARS)]} for i in range(game_log["players"])]
+    game = SnakeLaddersGame(screen, infos, mode=game_log["mode"], seed=game_log["seed"])
+    policy = AutoDicePolicy(DICE_POS)
+    expected = iter(game_log["rolls"])
+    clock = pygame.time.Clock()
+    finished_at = None
+
+    while finished_at is None or time.time() - finished_at < 2:
+        policy.post_events(game)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return False
+            rolling = game.dice_rolling
+            game.handle_event(event)
+            if game.dice_rolling and not rolling:
+                logged = next(expected, None)
+                if logged != (game.current_turn, game.roll_value):
+                    print(f"replay diverged at roll by player {game.current_turn + 1}: "
+                          f"log {logged}, game rolled {game.roll_value}")
+                    pygame.quit()
+                    return False
+        game.update()
+        game.draw()
+        pygame.display.flip()
+        clock.tick(60)
+        if game.game_over and finished_at is None:
+            finished_at = time.time()
+    pygame.quit()
+    return game.winner == game_log["winner"]
+
+# --- ENTRY POINT ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and replay Snakes & Ladders game logs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    verify = sub.add_parser("verify", help="Replay every game at maximum speed (rules only).")
+    verify.add_argument("log")
+    play = sub.add_parser("play", help="Watch one game at normal speed.")
+    play.add_argument("log")
+    play.add_argument("--index", type=int, default=0, help="Which game in the log (default 0).")
+    args = parser.parse_args(argv)
+
+    if args.command == "verify":
+        result = replay_headless(args.log)
+        print(f"{result['games']} games, {result['rolls']} rolls in {result['seconds'] * 1000:.1f}ms "
+              f"({result['games_per_second']:.0f} games/s); mismatches: {result['mismatches'] or 'none'}")
+        return 1 if result["mismatches"] else 0
+    return 0 if play_interactive(args.log, args.index) else 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,23 @@
+"""
+Snakes & Ladders movement rules, free of pygame.
+
+Shared by the game, replay and anything else that needs to play a move
+without drawing it.
+"""
+FINAL_CELL = 100
+
+# Classic board snakes and ladders (start cell -> end cell).
+CLASSIC_LADDERS = {17: 36, 35: 67, 40: 42, 58: 76, 59: 80, 71: 89}
+CLASSIC_SNAKES = {31: 14, 48: 28, 56: 22, 73: 21, 82: 42, 92: 75, 98: 66}
+
+def landing_cell(pos, roll):
+    """The cell a roll lands on before any snake or ladder; overshooting 100 bounces back."""
+    target = pos + roll
+    return target if target <= FINAL_CELL else 2 * FINAL_CELL - target
+
+def resolve_move(pos, roll, snakes, ladders):
+    """Returns (landing cell, final cell) for a roll, following at most one snake or ladder."""
+    landing = landing_cell(pos, roll)
+    if landing in ladders:
+        return landing, ladders[landing]
+    return landing, snakes.get(landing, landing)
@@ -0,0 +1,238 @@
+import sys
+import time
+
+import pygame
+
+from transitions import CurtainTransition
+import display
+import telemetry
+
+# --- CONFIGURATION ---
+FPS = 60
+WARM_BUDGET = 0.004      # Seconds per frame handed to background warm-up work.
+TRANSITION_DURATION = 0.5
+FULLSCREEN_KEY = pygame.K_F11
+
+# --- SCENE BASE CLASS ---
+class Scene:
+    """
+    One screen of the application, driven by a SceneManager.
+
+    The manager calls handle_event/update/draw once per frame while the scene
+    is on top of the stack. enter() runs when the scene becomes the top one
+    (with the payload it was opened with), resume() when a scene pushed over
+    it is popped, and exit() when it leaves the stack. Resident scenes keep
+    their instance (and all of their state) after exit() and are reused the
+    next time they are opened.
+    """
+    resident = False
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.screen = manager.screen
+
+    def enter(self, payload=None):
+        """Called when the scene becomes the top of the stack."""
+
+    def resume(self, result=None):
+        """Called when the scene above this one is popped."""
+
+    def exit(self):
+        """Called when the scene leaves the stack."""
+
+    def handle_event(self, event):
+        """Handles one pygame event."""
+
+    def update(self, dt):
+        """Advances the scene by dt seconds."""
+
+    def draw(self, screen):
+        """Draws the scene."""
+
+    def warm_up(self):
+        """
+        Optional background preparation, as a generator.
+        The manager runs it a slice at a time (between yields) while another
+        scene is in the foreground, within WARM_BUDGET per frame.
+        """
+        return iter(())
+
+# --- SCENE MANAGER ---
+class SceneManager:
+    """
+    A stack of scenes driven by a single frame loop with one Clock.
+
+    Scenes are registered by name with a factory; push/pop/switch change the
+    stack, optionally behind a curtain transition. Scenes named in warm() are
+    created ahead of time and their warm_up() work is spread over idle frame
+    time, so opening them later costs nothing.
+    """
+    def __init__(self, screen, fps=FPS, profiler=None, stats=None, target=None):
+        self.screen = screen
+        self.target = target  # Optional render_backend backend frames are drawn through instead of screen.
+        self.fps = fps
+        self.profiler = profiler
+        self.stats = stats  # Optional stats_store.StatsStore that finished games are recorded in.
+        self.clock = pygame.time.Clock()
+        self.factories = {}   # name -> callable(manager) returning a Scene
+        self.instances = {}   # name -> live Scene (resident, stacked, or warmed)
+        self.stack = []       # [(name, Scene)], top last
+        self.warming = []     # [(name, warm_up generator)]
+        self.warmed = set()   # Names whose warm_up() has been queued (and may be done).
+        self.transition = None
+
+    def register(self, name, factory):
+        self.factories[name] = factory
+
+    def scene(self, name):
+        """Returns the live instance of a scene, creating it if needed."""
+        if name not in self.instances:
+            self.instances[name] = self.factories[name](self)
+        return self.instances[name]
+
+    @property
+    def top(self):
+        return self.stack[-1][1] if self.stack else None
+
+    @property
+    def top_name(self):
+        return self.stack[-1][0] if self.stack else None
+
+    # --- Stack operations ---
+    def push(self, name, payload=None):
+        """Opens a scene on top of the current one."""
+        telemetry.emit("scene", action="push", scene=name, previous=self.top_name)
+        self._open(name, payload)
+
+    def pop(self, result=None):
+        """Closes the top scene and resumes the one below it."""
+        name, scene = self.stack.pop()
+        telemetry.emit("scene", action="pop", scene=self.top_name, previous=name)
+        self._release(name, scene)
+        if self.top:
+            self.top.resume(result)
+
+    def switch(self, name, payload=None, transition=False, duration=TRANSITION_DURATION, on_covered=None):
+        """
+        Replaces the top scene. With transition=True a curtain closes over the
+        current frame first; the swap (and on_covered, if given) happens while
+        the screen is hidden, and the curtain opens on the new scene live.
+        """
+        if not transition:
+            self._replace(name, payload)
+            return
+
+        def swap():
+            if on_covered:
+                on_covered()
+            self._replace(name, payload)
+
+        if self.target and self.top:
+            self.top.draw(self.screen)  # A backend keeps no CPU-side copy of the frame to cover.
+        self.transition = CurtainTransition(
+            self.screen.get_size(), self.screen.copy(), lambda screen: self.top.draw(screen),
+            duration=duration, on_covered=swap,
+        )
+
+    def warm(self, name, work=None):
+        """
+        Creates a scene now and runs its warm_up() in idle frame time, once: a
+        scene warmed (or warming) already is not queued again. work, another
+        generator, queues extra warm-up of the scene's own instead.
+        """
+        scene = self.scene(name)
+        if work is None:
+            if name in self.warmed:
+                return
+            self.warmed.add(name)
+            work = scene.warm_up()
+        self.warming.append((name, work))
+
+    def quit(self):
+        """Exits every scene on the stack, then the application."""
+        while self.stack:
+            name, scene = self.stack.pop()
+            scene.exit()
+        if self.stats:
+            self.stats.close()  # Commits any games still queued.
+        pygame.quit()
+        sys.exit()
+
+    def _open(self, name, payload):
+        scene = self.scene(name)
+        self.stack.append((name, scene))
+        scene.enter(payload)
+
+    def _replace(self, name, payload):
+        telemetry.emit("scene", action="switch", scene=name, previous=self.top_name)
+        if self.stack:
+            self._release(*self.stack.pop())
+        self._open(name, payload)
+
+    def _release(self, name, scene):
+        scene.exit()
+        if not scene.resident and all(s is not scene for _, s in self.stack):
+            self.instances.pop(name, None)
+            self.warmed.discard(name)
+
+    def _run_warm_up(self):
+        deadline = time.perf_counter() + WARM_BUDGET
+        while self.warming and time.perf_counter() < deadline:
+            name, work = self.warming[0]
+            if next(work, StopIteration) is StopIteration:
+                self.warming.pop(0)
+
+    # --- Main loop ---
+    def run(self, first_frame=None):
+        """Runs frames until quit() is called; first_frame() is called once the first frame is on screen."""
+        profiler = self.profiler
+        target = self.target or self.screen
+        dt = 0.0
+        while True:
+            if profiler: profiler.begin_frame()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or event.type == pygame.WINDOWCLOSE:
+                    self.quit()
+                if event.type == pygame.KEYDOWN and event.key == FULLSCREEN_KEY:
+                    if self.target:
+                        self.target.toggle_fullscreen()
+                    else:
+                        display.toggle_fullscreen()
+                    continue
+                if profiler and profiler.handle_event(event):
+                    continue
+                if not self.transition:  # Input is ignored while the curtain moves.
+                    self.top.handle_event(event)
+            if profiler: profiler.lap("events")
+
+            if self.transition:
+                self.transition.update(dt)
+                if self.transition.phase != "cover":
+                    self.top.update(dt)
+            else:
+                self.top.update(dt)
+            self._run_warm_up()
+            if profiler: profiler.lap("update")
+
+            if self.transition:
+                self.transition.draw(target)
+                if self.transition.done:
+                    self.transition = None
+            else:
+                self.top.draw(target)
+            if profiler:
+                profiler.draw(target)
+                profiler.lap("text")
+            if self.target:
+                self.target.present()
+            else:
+                pygame.display.flip()
+            if first_frame:
+                first_frame()
+                first_frame = None
+            if profiler: profiler.lap("flip")
+            dt = self.clock.tick(self.fps) / 1000.0
+            telemetry.frame(dt * 1000, scene=self.top_name)
+            if profiler:
+                profiler.lap("tick")
+                profiler.end_frame()
@@ -1,12 +1,15 @@
 # player_select_screen_hover_with_hint.py
-import sys
-import pygame
+import functools
 
-pygame.init()
+import pygame
+import asset_manager
+from asset_manager import AssetRequest
+from sprite_cache import ScaledFrameCache
+from scenes import Scene
+from display import LOGICAL_SIZE
 
 # ---- CONFIG ----
-WINDOW_SIZE = (1280, 730)
-FPS = 60
+WINDOW_SIZE = LOGICAL_SIZE  # Logical size; SDL scales it to the real window (see display.py).
 
 # Asset paths
 BG_IMG = "assets/bg/bg_main.png"
@@ -33,69 +36,112 @@ MODE_GAP_X = 0.12
 MODE_BTN_REL_W, MODE_BTN_MAX_WH = 0.17, (450, 150)
 MODE_HIGHLIGHT_COLOR = (255, 220, 120)
 MODE_DEFAULT = "classic"
+ANIMATED_BOARD_KEY = pygame.K_a  # Toggles swaying snakes for special mode.
 
 # ---- UTILITIES ----
-def load_img(path):
-    """Safely loads an image, providing a fallback surface if the asset is missing."""
-    try:
-        return pygame.image.load(path)
-    except (pygame.error, FileNotFoundError):
-        # Create a fallback gray surface if the image can't be loaded.
-        surf = pygame.Surface((10, 10), pygame.SRCALPHA)
-        surf.fill((200, 200, 200, 255))
-        return surf
-
-def scale_fit(img, out_size):
-    """Scales an image to fit within a given size while maintaining aspect ratio."""
-    iw, ih = img.get_size(); W, H = out_size
-    s = min(W/iw, H/ih)
-    return pygame.transform.smoothscale(img, (int(iw*s), int(ih*s)))
-
-def autoscale_by_width(img, target_w, max_w, max_h):
-    """Scales an image to a target width, constrained by max width and height."""
-    iw, ih = img.get_size()
+FALLBACK_COLOR = (200, 200, 200, 255)  # Gray stand-in for missing assets.
+
+def load_img(path, size=None):
+    """Loads a cached image, providing a fallback surface if the asset is missing."""
+    return asset_manager.image(path, size, fallback=FALLBACK_COLOR)
+
+def scale_fit(path, out_size, alpha=True):
+    """Loads an image scaled to fit within a given size while maintaining aspect ratio."""
+    return asset_manager.fit(path, out_size, alpha=alpha, fallback=FALLBACK_COLOR)
+
+def autoscale_size(src_size, target_w, max_w, max_h):
+    """Computes the size for a target width, constrained by max width and height."""
+    iw, ih = src_size
     w = min(int(target_w), max_w); s = w/iw
     w, h = int(iw*s), int(ih*s)
     if h > max_h:
         s = max_h/ih; w, h = int(iw*s), int(ih*s)
-    return pygame.transform.smoothscale(img, (w, h))
-
-def draw_neobrutalist_box(screen, text, center_pos, font, bg_color=(255, 255, 255), text_color=(0, 0, 0), border_color=(0, 0, 0), shadow_offset=(8, 8), padding=(20, 12), border_width=4):
-    """Draws a text box with a neo-brutalist style (sharp edges, shadow)."""
+    return w, h
+
+def autoscale_by_width(path, rel_w, max_wh):
+    """Size of an asset scaled to a fraction of the window width (read from its header, not decoded)."""
+    src_size = asset_manager.source_size(path, default=(10, 10))
+    return autoscale_size(src_size, WINDOW_SIZE[0]*rel_w, *max_wh)
+
+def hover_size(size):
+    """Size of a sprite's enlarged hover image."""
+    return (int(size[0]*HOVER_SCALE), int(size[1]*HOVER_SCALE))
+
+def hover_sprite(path, size, center):
+    """Builds a HoverSprite whose normal and hover images both come from the asset cache."""
+    return HoverSprite(load_img(path, size), center, load_img(path, hover_size(size)))
+
+def layout_sizes():
+    """Target size of every button and avatar on this screen (computed from image headers)."""
+    sizes = {BTN_BACK: autoscale_by_width(BTN_BACK, 0.1, (200, 100))}
+    for path in (BTN_MODE_CLASSIC, BTN_MODE_SPECIAL):
+        sizes[path] = autoscale_by_width(path, MODE_BTN_REL_W, MODE_BTN_MAX_WH)
+    for path in (BTN_2P, BTN_3P, BTN_4P):
+        sizes[path] = autoscale_by_width(path, BTN_REL_W, BTN_MAX_WH)
+    for path in AVATAR_FILES:
+        sizes[path] = autoscale_by_width(path, AVA_REL_W, AVA_MAX_WH)
+    return sizes
+
+def asset_requests():
+    """Every image this screen loads, for the startup preloader."""
+    bg_size = asset_manager.ASSETS.fit_size(BG_IMG, WINDOW_SIZE, allow_missing=True)
+    requests = [AssetRequest(BG_IMG, bg_size, alpha=False, fallback=FALLBACK_COLOR)]
+    for path, size in layout_sizes().items():
+        requests.append(AssetRequest(path, size, fallback=FALLBACK_COLOR))
+        requests.append(AssetRequest(path, hover_size(size), fallback=FALLBACK_COLOR))
+    return requests
+
+def warm_assets():
+    """Makes sure every image of this screen is cached (cheap when already preloaded)."""
+    for req in asset_requests():
+        asset_manager.ASSETS.request(req)
+
+@functools.lru_cache(maxsize=64)
+def neobrutalist_box(text, font, bg_color=(255, 255, 255), text_color=(0, 0, 0), border_color=(0, 0, 0), shadow_offset=(8, 8), padding=(20, 12), border_width=4):
+    """
+    Renders a text box with a neo-brutalist style (sharp edges, shadow) into
+    its own surface, shadow included; returns (surface, box size). Cached, so
+    a hint only costs a blit until its text changes.
+    """
     text_surf = font.render(text, True, text_color)
     text_rect = text_surf.get_rect()
 
-    box_size = (text_rect.width + padding[0] * 2, text_rect.height + padding[1] * 2)
-    box_rect = pygame.Rect((0, 0), box_size)
-    box_rect.center = center_pos
+    box_rect = pygame.Rect((0, 0), (text_rect.width + padding[0] * 2, text_rect.height + padding[1] * 2))
+    shadow_rect = box_rect.move(shadow_offset)
+    box = pygame.Surface(box_rect.union(shadow_rect).size, pygame.SRCALPHA)
 
-    shadow_rect = box_rect.copy()
-    shadow_rect.x += shadow_offset[0]
-    shadow_rect.y += shadow_offset[1]
-
-    pygame.draw.rect(screen, border_color, shadow_rect, border_radius=6)
-    pygame.draw.rect(screen, bg_color, box_rect, border_radius=6)
-    pygame.draw.rect(screen, border_color, box_rect, border_width, border_radius=6)
+    pygame.draw.rect(box, border_color, shadow_rect, border_radius=6)
+    pygame.draw.rect(box, bg_color, box_rect, border_radius=6)
+    pygame.draw.rect(box, border_color, box_rect, border_width, border_radius=6)
 
     text_rect.center = box_rect.center
-    screen.blit(text_surf, text_rect)
+    box.blit(text_surf, text_rect)
+    return box, box_rect.size
+
+def draw_neobrutalist_box(screen, text, center_pos, font, **style):
+    """Draws a neo-brutalist text box centered on center_pos (its shadow hangs off the bottom right)."""
+    box, box_size = neobrutalist_box(text, font, **style)
+    box_rect = pygame.Rect((0, 0), box_size)
+    box_rect.center = center_pos
+    screen.blit(box, box_rect.topleft)
 
 # ---- HoverSprite Class ----
 class HoverSprite:
     """A versatile sprite for handling hover effects and clicks on UI elements."""
-    def __init__(self, img: pygame.Surface, center):
-        self.normal = img.convert_alpha()
-        w, h = self.normal.get_size()
-        self.hover  = pygame.transform.smoothscale(self.normal, (int(w*HOVER_SCALE), int(h*HOVER_SCALE))).convert_alpha()
+    def __init__(self, img: pygame.Surface, center, hover: pygame.Surface = None):
+        self.normal = img
+        self.hover  = hover or ScaledFrameCache(img, mode="smooth").frame(HOVER_SCALE)
         self.center = center
-        self.rect   = self.normal.get_rect(center=center)
+        # Both states are fixed, so their rects are computed once.
+        self.normal_rect = self.normal.get_rect(center=center)
+        self.hover_rect  = self.hover.get_rect(center=center)
+        self.rect   = self.normal_rect
         self.is_hover = False
 
     def update_hover(self, pos):
         """Updates the hover state based on the mouse position."""
-        cur = self.hover if self.is_hover else self.normal
-        self.is_hover = cur.get_rect(center=self.center).collidepoint(pos)
-        self.rect = (self.hover if self.is_hover else self.normal).get_rect(center=self.center)
+        self.is_hover = self.rect.collidepoint(pos)
+        self.rect = self.hover_rect if self.is_hover else self.normal_rect
 
     def clicked(self, event):
         """Checks if the sprite was clicked."""
@@ -108,117 +154,140 @@ class HoverSprite:
 # ---- MAIN PLAYER SELECTION SCREEN ----
 BTN_BACK = "assets/button/back.png"
 
-def run_player_select(screen):
-    """Runs the main loop for the player selection screen."""
-    clock  = pygame.time.Clock()
-    font   = pygame.font.SysFont("Pixeltype", 48)
-    mode_font = pygame.font.SysFont("Pixeltype", 40)
-
-    # Scale and center the background image.
-    bg = scale_fit(load_img(BG_IMG), WINDOW_SIZE).convert()
-    bg_rect = bg.get_rect(center=(WINDOW_SIZE[0]//2, WINDOW_SIZE[1]//2))
-
-    # Create and position the back button.
-    back_img = autoscale_by_width(load_img(BTN_BACK), WINDOW_SIZE[0]*0.1, 200, 100)
-    back_btn = HoverSprite(back_img, (100, 75))
-
-    # Create and position the game mode buttons (Classic/Special).
-    classic_img = autoscale_by_width(
-        load_img(BTN_MODE_CLASSIC), WINDOW_SIZE[0] * MODE_BTN_REL_W, *MODE_BTN_MAX_WH
-    )
-    special_img = autoscale_by_width(
-        load_img(BTN_MODE_SPECIAL), WINDOW_SIZE[0] * MODE_BTN_REL_W, *MODE_BTN_MAX_WH
-    )
-    mode_center_x = WINDOW_SIZE[0] // 2
-    mode_y = int(WINDOW_SIZE[1] * MODE_ROW_Y)
-    mode_gap = int(WINDOW_SIZE[0] * MODE_GAP_X)
-    classic_btn = HoverSprite(classic_img, (mode_center_x - mode_gap, mode_y))
-    special_btn = HoverSprite(special_img, (mode_center_x + mode_gap, mode_y))
-    mode_buttons = {"classic": classic_btn, "special": special_btn}
-
-    # Create buttons for selecting 2, 3, or 4 players.
-    two_img   = autoscale_by_width(load_img(BTN_2P), WINDOW_SIZE[0]*BTN_REL_W, *BTN_MAX_WH)
-    three_img = autoscale_by_width(load_img(BTN_3P), WINDOW_SIZE[0]*BTN_REL_W, *BTN_MAX_WH)
-    four_img  = autoscale_by_width(load_img(BTN_4P), WINDOW_SIZE[0]*BTN_REL_W, *BTN_MAX_WH)
-
-    cx, H = WINDOW_SIZE[0]//2, WINDOW_SIZE[1]
-    top_y = int(H*TOP_ROW_Y); gap = int(WINDOW_SIZE[0]*TOP_GAP_X)
-
-    two_btn   = HoverSprite(two_img,   (cx - (two_img.get_width()//2 + gap), top_y))
-    three_btn = HoverSprite(three_img, (cx,                                   top_y))
-    four_btn  = HoverSprite(four_img,  (cx + (four_img.get_width()//2 + gap), top_y))
-    top_buttons = [two_btn, three_btn, four_btn]
-
-    # Load and position the four avatar images.
-    avatars = [autoscale_by_width(load_img(p), WINDOW_SIZE[0]*AVA_REL_W, *AVA_MAX_WH) for p in AVATAR_FILES]
-    W = WINDOW_SIZE[0]
-    spacing = int(W * AVATAR_GAP_X)
-    total_w = sum(img.get_width() for img in avatars) + spacing*(len(avatars)-1)
-    x = (W - total_w)//2
-    y = int(H*BOTTOM_ROW_Y)
-
-    tiles = []
-    for img in avatars:
-        center = (x + img.get_width()//2, y)
-        tiles.append(HoverSprite(img, center))
-        x += img.get_width() + spacing
-
-    # --- Game State ---
-    target_players = None   # Number of players to be selected (2, 3, or 4).
-    selected_order = []     # Stores the indices of avatars in the order they are picked.
-    selected_mode = MODE_DEFAULT # Game mode, "classic" or "special".
-
-    while True:
-        clock.tick(FPS)
-        # --- Event Handling ---
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT: pygame.quit(); sys.exit(0)
-            if e.type == pygame.KEYDOWN:
-                if e.key in (pygame.K_ESCAPE, pygame.K_q): return None # Exit to main menu
-                # Confirm selection and proceed to the game.
-                if e.key in (pygame.K_RETURN, pygame.K_KP_ENTER) and target_players and len(selected_order)==target_players:
-                    avatar_paths = [AVATAR_FILES[i] for i in selected_order]
-                    player_infos = [{"avatar": path} for path in avatar_paths]
-                    return player_infos, selected_mode
-
-            if back_btn.clicked(e): return None # Exit to main menu
-
-            # Handle clicks on the player number selection buttons.
-            if two_btn.clicked(e):   target_players, selected_order = 2, []
-            if three_btn.clicked(e): target_players, selected_order = 3, []
-            if four_btn.clicked(e):  target_players, selected_order = 4, []
-
-            # Handle clicks on the game mode selection buttons.
-            if classic_btn.clicked(e): selected_mode = "classic"
-            if special_btn.clicked(e): selected_mode = "special"
-
-            # Handle avatar selection logic.
-            if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 and target_players:
-                for idx, t in enumerate(tiles):
-                    if t.rect.collidepoint(e.pos):
-                        if idx in selected_order:
-                            # Deselect if already selected.
-                            selected_order.remove(idx)
-                        elif len(selected_order) < target_players:
-                            # Select if there's space.
-                            selected_order.append(idx)
-                        else:
-                            # If selection is full, use as a queue (remove first, add last).
-                            selected_order.pop(0); selected_order.append(idx)
-
-        # --- Updates ---
+class PlayerSelectScene(Scene):
+    """
+    The player count, game mode and avatar selection screen.
+
+    Resident: the layout is built once, and the current selection survives a
+    trip into a game and back. While it is open the game scene warms up in
+    the background.
+    """
+    resident = True
+
+    def __init__(self, manager):
+        super().__init__(manager)
+        self.font   = pygame.font.SysFont("Pixeltype", 48)
+        self.mode_font = pygame.font.SysFont("Pixeltype", 40)
+
+        # Scale and center the background image. Every image on this screen comes
+        # from the shared asset cache, so building it does no decoding or rescaling.
+        self.bg = scale_fit(BG_IMG, WINDOW_SIZE, alpha=False)
+        self.bg_rect = self.bg.get_rect(center=(WINDOW_SIZE[0]//2, WINDOW_SIZE[1]//2))
+
+        sizes = layout_sizes()
+
+        # Create and position the back button.
+        self.back_btn = hover_sprite(BTN_BACK, sizes[BTN_BACK], (100, 75))
+
+        # Create and position the game mode buttons (Classic/Special).
+        mode_center_x = WINDOW_SIZE[0] // 2
+        mode_y = int(WINDOW_SIZE[1] * MODE_ROW_Y)
+        mode_gap = int(WINDOW_SIZE[0] * MODE_GAP_X)
+        classic_btn = hover_sprite(BTN_MODE_CLASSIC, sizes[BTN_MODE_CLASSIC], (mode_center_x - mode_gap, mode_y))
+        special_btn = hover_sprite(BTN_MODE_SPECIAL, sizes[BTN_MODE_SPECIAL], (mode_center_x + mode_gap, mode_y))
+        self.mode_buttons = {"classic": classic_btn, "special": special_btn}
+
+        # Create buttons for selecting 2, 3, or 4 players.
+        two_size, three_size, four_size = sizes[BTN_2P], sizes[BTN_3P], sizes[BTN_4P]
+
+        cx, H = WINDOW_SIZE[0]//2, WINDOW_SIZE[1]
+        top_y = int(H*TOP_ROW_Y); gap = int(WINDOW_SIZE[0]*TOP_GAP_X)
+
+        two_btn   = hover_sprite(BTN_2P, two_size,   (cx - (two_size[0]//2 + gap), top_y))
+        three_btn = hover_sprite(BTN_3P, three_size, (cx,                          top_y))
+        four_btn  = hover_sprite(BTN_4P, four_size,  (cx + (four_size[0]//2 + gap), top_y))
+        self.player_buttons = {2: two_btn, 3: three_btn, 4: four_btn}
+
+        # Load and position the four avatar images.
+        avatar_sizes = [sizes[p] for p in AVATAR_FILES]
+        W = WINDOW_SIZE[0]
+        spacing = int(W * AVATAR_GAP_X)
+        total_w = sum(w for w, _ in avatar_sizes) + spacing*(len(avatar_sizes)-1)
+        x = (W - total_w)//2
+        y = int(H*BOTTOM_ROW_Y)
+
+        self.tiles = []
+        for path, size in zip(AVATAR_FILES, avatar_sizes):
+            center = (x + size[0]//2, y)
+            self.tiles.append(hover_sprite(path, size, center))
+            x += size[0] + spacing
+
+        # --- Game State ---
+        self.target_players = None   # Number of players to be selected (2, 3, or 4).
+        self.selected_order = []     # Stores the indices of avatars in the order they are picked.
+        self.selected_mode = MODE_DEFAULT # Game mode, "classic" or "special".
+        self.animated_board = False  # Special mode option: snakes sway (see snake_animation).
+        self.pointer = (-1, -1)      # Last mouse position from events, which are in logical pixels with any renderer.
+
+    def enter(self, payload=None):
+        pygame.event.clear() # Drop clicks that belonged to the previous screen.
+        self.pointer = pygame.mouse.get_pos()
+        self.manager.warm("game")
+        if self.selected_mode == "special":
+            self.manager.scene("game").warm_special()
+
+    def handle_event(self, e):
+        if e.type == pygame.MOUSEMOTION:
+            self.pointer = e.pos
+        if e.type == pygame.KEYDOWN:
+            if e.key in (pygame.K_ESCAPE, pygame.K_q): # Exit to main menu
+                self.manager.switch("main_menu")
+                return
+            # Confirm selection and proceed to the game.
+            if e.key in (pygame.K_RETURN, pygame.K_KP_ENTER) and self.target_players and len(self.selected_order)==self.target_players:
+                avatar_paths = [AVATAR_FILES[i] for i in self.selected_order]
+                player_infos = [{"avatar": path} for path in avatar_paths]
+                self.manager.switch("game", (player_infos, self.selected_mode, self.animated_board))
+                return
+            if e.key == ANIMATED_BOARD_KEY and self.selected_mode == "special":
+                self.animated_board = not self.animated_board
+
+        if self.back_btn.clicked(e): # Exit to main menu
+            self.manager.switch("main_menu")
+            return
+
+        # Handle clicks on the player number selection buttons.
+        for count, btn in self.player_buttons.items():
+            if btn.clicked(e): self.target_players, self.selected_order = count, []
+
+        # Handle clicks on the game mode selection buttons.
+        for mode, btn in self.mode_buttons.items():
+            if btn.clicked(e):
+                self.selected_mode = mode
+                if mode == "special":
+                    self.manager.scene("game").warm_special()
+
+        # Handle avatar selection logic.
+        if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 and self.target_players:
+            selected_order = self.selected_order
+            for idx, t in enumerate(self.tiles):
+                if t.rect.collidepoint(e.pos):
+                    if idx in selected_order:
+                        # Deselect if already selected.
+                        selected_order.remove(idx)
+                    elif len(selected_order) < self.target_players:
+                        # Select if there's space.
+                        selected_order.append(idx)
+                    else:
+                        # If selection is full, use as a queue (remove first, add last).
+                        selected_order.pop(0); selected_order.append(idx)
+
+    def update(self, dt):
         # Update hover states for all interactive elements.
-        mx, my = pygame.mouse.get_pos()
-        back_btn.update_hover((mx,my))
-        for b in top_buttons: b.update_hover((mx,my))
-        for btn in mode_buttons.values(): btn.update_hover((mx,my))
-        for t in tiles: t.update_hover((mx,my))
+        mx, my = self.pointer
+        self.back_btn.update_hover((mx,my))
+        for b in self.player_buttons.values(): b.update_hover((mx,my))
+        for btn in self.mode_buttons.values(): btn.update_hover((mx,my))
+        for t in self.tiles: t.update_hover((mx,my))
 
-        # --- Drawing ---
-        screen.blit(bg, bg_rect)
-        back_btn.draw(screen)
+    def draw(self, screen):
+        font, mode_font = self.font, self.mode_font
+        target_players, selected_order = self.target_players, self.selected_order
+
+        screen.blit(self.bg, self.bg_rect)
+        self.back_btn.draw(screen)
 
-        for btn in mode_buttons.values():
+        for btn in self.mode_buttons.values():
             btn.draw(screen)
 
         # ==== Dynamic Hint and Mode Display ====
@@ -230,7 +299,9 @@ def run_player_select(screen):
         else:
             hint = "Press ENTER to confirm"
 
-        mode_label = "Classic" if selected_mode == "classic" else "Special"
+        mode_label = "Classic" if self.selected_mode == "classic" else "Special"
+        if self.selected_mode == "special":
+            mode_label += " (animated)" if self.animated_board else " (A: animate)"
         mode_text = f"Mode: {mode_label}"
 
         row_y = int(WINDOW_SIZE[1] * 0.115)
@@ -255,13 +326,11 @@ def run_player_select(screen):
         draw_neobrutalist_box(screen, mode_text, (mode_center_x, row_y), mode_font)
 
         # Draw player count buttons and avatars.
-        for b in top_buttons: b.draw(screen)
-        for i, t in enumerate(tiles):
+        for b in self.player_buttons.values(): b.draw(screen)
+        for i, t in enumerate(self.tiles):
             t.draw(screen)
             # If an avatar is selected, display its player order (P1, P2, etc.).
             if i in selected_order:
                 rank = selected_order.index(i) + 1
                 label = font.render(f"P{rank}", True, (255,255,255))
                 screen.blit(label, label.get_rect(midbottom=(t.rect.centerx, t.rect.top - 6)))
-
-        pygame.display.flip()
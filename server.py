@@ -0,0 +1,200 @@
+"""
+Authoritative asyncio game server.
+
+One event loop hosts any number of tables. The server owns every table's
+state, resolves rolls itself and sends clients only deltas (see
+net_protocol.py); clients just send "roll" intents and render what comes back:
+
+    python server.py --port 8765
+    python netclient.py --port 8765 --table 1 --players 2
+"""
+import os
+import sys
+import random
+import signal
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import net_protocol as proto
+from game_state import GameState, board_maps
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# --- TABLE ---
+class Table:
+    """
+    One game's seats around its authoritative GameState, which draws from its
+    rng exactly like SnakeLaddersGame does, so a table's seed reproduces it locally too.
+    """
+    __slots__ = ("table_id", "state", "seats", "busy", "next_board", "dealt")
+
+    def __init__(self, table_id, players, mode, seed):
+        self.table_id = table_id
+        self.state = GameState(players, mode, seed)
+        self.seats = [None] * players  # StreamWriter per seat.
+        self.busy = False  # A roll is being resolved (special boards are generated off-loop).
+        self.next_board = None  # (seed, future layout) of the board the next special roll uses.
+        self.dealt = False  # START went out; a seat freed after this stays closed.
+
+    @property
+    def started(self):
+        return all(self.seats)
+
+    def roll(self):
+        """Rolls for the current seat and returns the MOVE delta (plus WIN if the game ended)."""
+        state = self.state
+        value = state.draw_roll()
+        seat, landing, cell = state.play_roll(value)
+        out = proto.MOVE.pack(b"M", seat, value, landing, cell, state.turn)
+        if state.winner is not None:
+            out += proto.WIN.pack(b"E", seat)
+        return out
+
+    def board_message(self):
+        state = self.state
+        snakes, ladders = board_maps(state.jumps)
+        return proto.encode_board(state.board_seed if state.mode == "special" else 0, snakes, ladders)
+
+    def broadcast(self, data):
+        for writer in self.seats:
+            if writer is not None:
+                writer.write(data)
+
+# --- SERVER ---
+def _board_layout(seed):
+    """Runs in a board worker process, which imports the generator on its first board."""
+    from board_generator import generate_board_layout
+    return generate_board_layout(seed)
+
+class GameServer:
+    """Accepts connections, seats players at tables and relays their rolls."""
+    def __init__(self, board_workers=None):
+        self.tables = {}
+        self.messages = 0
+        # Board generation uses the global random state and is CPU-bound, so it
+        # runs in worker processes (one per core by default), never on the loop.
+        self.board_workers = ProcessPoolExecutor(max_workers=board_workers or os.cpu_count())
+
+    def layout(self, seed):
+        """A future of the (snakes, ladders) layout of the special board for seed."""
+        return asyncio.get_running_loop().run_in_executor(self.board_workers, _board_layout, seed)
+
+    def prefetch_board(self, table):
+        """Starts generating the board the table's next special roll will draw, while its players take their turn."""
+        seed = table.state.peek_board_seed()
+        table.next_board = (seed, self.layout(seed))
+
+    async def next_layout(self, table):
+        """Draws the table's next board seed and returns its layout, prefetched if possible."""
+        seed = table.state.next_board_seed()
+        prefetched, table.next_board = table.next_board, None
+        future = prefetched[1] if prefetched and prefetched[0] == seed else self.layout(seed)
+        return await future
+
+    async def join(self, writer, table_id, players, mode):
+        table = self.tables.get(table_id)
+        if table is None:
+            # The table is only published once its board is ready, so nobody joins a table without one.
+            table = Table(table_id, players, proto.MODES[mode], random.getrandbits(32))
+            if table.state.mode == "special":
+                table.state.set_board(*await self.layout(table.state.board_seed))
+                self.prefetch_board(table)
+            # Someone may have created the same table while this board was generated: join theirs.
+            table = self.tables.setdefault(table_id, table)
+        state = table.state
+        if table.started or state.winner is not None:
+            writer.write(proto.ERROR.pack(b"X", proto.ERR_TABLE_FULL))
+            return None, None
+        if table.dealt:
+            # Clients only ever get deltas, so a latecomer could not learn the positions or the turn.
+            writer.write(proto.ERROR.pack(b"X", proto.ERR_IN_PROGRESS))
+            return None, None
+        seat = table.seats.index(None)
+        table.seats[seat] = writer
+        writer.write(proto.WELCOME.pack(b"W", table_id, seat, state.players,
+                                        proto.MODES.index(state.mode), state.seed))
+        writer.write(table.board_message())
+        if table.started:
+            table.dealt = True
+            table.broadcast(proto.START.pack(b"S"))
+        return table, seat
+
+    async def roll(self, writer, table, seat):
+        state = table.state
+        if not table.started:
+            error = proto.ERR_NOT_STARTED
+        elif state.winner is not None:
+            error = proto.ERR_GAME_OVER
+        elif state.turn != seat or table.busy:
+            error = proto.ERR_NOT_YOUR_TURN
+        else:
+            error = None
+        if error:
+            writer.write(proto.ERROR.pack(b"X", error))
+            return
+
+        if state.mode == "special":
+            # Like the local game: a fresh board before every roll.
+            table.busy = True
+            try:
+                state.set_board(*await self.next_layout(table))
+            finally:
+                table.busy = False
+            table.broadcast(table.board_message())
+        table.broadcast(table.roll())
+        if state.mode == "special" and state.winner is None:
+            self.prefetch_board(table)
+
+    async def handle_client(self, reader, writer):
+        table = seat = None
+        try:
+            while True:
+                message = await proto.read_message(reader)
+                self.messages += 1
+                tag = message[0]
+                if tag == b"J" and table is None:
+                    table, seat = await self.join(writer, *message[1:])
+                elif tag == b"R" and table is not None:
+                    await self.roll(writer, table, seat)
+                else:
+                    writer.write(proto.ERROR.pack(b"X", proto.ERR_BAD_MESSAGE))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            if table is not None:
+                table.seats[seat] = None
+                if not any(table.seats):
+                    self.tables.pop(table.table_id, None)
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        # SIGTERM (e.g. from loadtest.py) stops serving cleanly, so the board workers exit too.
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        if ready:
+            ready(server.sockets[0].getsockname()[1])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.board_workers.shutdown(cancel_futures=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the authoritative Snakes & Ladders server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port.")
+    parser.add_argument("--board-workers", type=int, default=None,
+                        help="Processes generating special boards (default: one per core).")
+    args = parser.parse_args(argv)
+    ready = lambda port: print(f"listening on {args.host}:{port}", flush=True)
+    try:
+        asyncio.run(GameServer(args.board_workers).serve(args.host, args.port, ready))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
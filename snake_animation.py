@@ -0,0 +1,170 @@
+"""
+Animated snakes for special boards.
+
+Each snake of a generated board becomes a mesh of NumPy arrays: its body
+curve resampled to SAMPLES points, the normal at each point, its taper
+half-widths and its stripe positions along the body. Every frame a single
+vectorized step sways all snakes at once along their normals with a
+travelling sine wave (zero at head and tail, so both stay on their cells).
+Then only the snake layer is re-rasterized, with two filled polygons per
+body plus its stripe quads and head. The background and ladders sit in a
+cached layer underneath that is never redrawn.
+"""
+import math
+
+import numpy as np
+import pygame
+
+import asset_manager
+import board_generator as bg
+
+SAMPLES = 48            # Points per snake body mesh.
+SWAY = 0.1              # Largest sideways offset of a body, in cells.
+WAVES_PER_BODY = 1.5    # Sine periods along one body.
+WAVE_SPEED = 0.6        # Periods per second travelling from head to tail.
+TAPER_START = 0.8       # Fraction of the body where the tail starts thinning (as in draw_snake).
+HEAD_ANGLE_STEP = 3     # Head rotations are cached at this many degrees apart.
+
+def _resample(curve, samples):
+    """samples points spaced evenly along curve's arc length, and that length."""
+    points = np.asarray(curve, dtype=float)
+    arc = np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(points, axis=0).T))))
+    even = np.linspace(0.0, arc[-1], samples)
+    return np.column_stack((np.interp(even, arc, points[:, 0]), np.interp(even, arc, points[:, 1]))), arc[-1]
+
+def _frames(points):
+    """Unit tangents and normals (-ty, tx) of a stack of polylines shaped (snakes, samples, 2)."""
+    tangents = np.empty_like(points)
+    tangents[:, 1:-1] = points[:, 2:] - points[:, :-2]
+    tangents[:, 0] = points[:, 1] - points[:, 0]
+    tangents[:, -1] = points[:, -1] - points[:, -2]
+    tangents /= np.maximum(np.linalg.norm(tangents, axis=2, keepdims=True), 1e-9)
+    normals = tangents[..., ::-1] * (-1.0, 1.0)
+    return tangents, normals
+
+class SnakeLayer:
+    """
+    The snakes of one board, drawn at size onto their own transparent
+    surface. frame(t) deforms and redraws them; the board's background and
+    ladders are a separate, static surface (see generate_animated_board_assets).
+    """
+    def __init__(self, snake_defs, curves, patterns, source_size, size, ladder_overlay=None):
+        self.source_size = source_size
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.ladder_overlay = ladder_overlay  # Drawn over the snakes when ladders go on top.
+        scale = np.array((size[0] / source_size[0], size[1] / source_size[1]))
+        unit = float(scale.mean())
+        frac = np.linspace(0.0, 1.0, SAMPLES)
+
+        # Rest pose: one (snakes, SAMPLES, 2) stack, so every frame is one NumPy step for all snakes.
+        bodies, lengths = zip(*(_resample(curve, SAMPLES) for curve in curves)) if curves else ((), ())
+        self.rest = np.array(bodies).reshape(len(bodies), SAMPLES, 2) * scale
+        self.rest_normals = _frames(self.rest)[1]
+        self.sway = SWAY * bg.CELL_SIZE * unit * np.sin(math.pi * frac)  # Zero at head and tail.
+        self.phase = 2 * math.pi * (WAVES_PER_BODY * frac + np.arange(len(bodies))[:, None] * 0.37)
+
+        taper = np.clip((frac - TAPER_START) / (1.0 - TAPER_START), 0.0, None) ** 1.5
+        self.outline_half = ((bg.SNAKE_MAX_OUTLINE - (bg.SNAKE_MAX_OUTLINE - bg.SNAKE_MIN_OUTLINE) * taper) / 2 * unit)[:, None]
+        inner_half = (bg.SNAKE_MAX_INNER - (bg.SNAKE_MAX_INNER - bg.SNAKE_MIN_INNER) * taper) / 2 * unit
+        self.inner_half = inner_half[:, None]
+
+        # Stripes: the owning snake, the sample they sit after and how far toward the next one.
+        owners, spots = [], []
+        for i, (positions, length) in enumerate(zip(patterns, lengths)):
+            owners += [i] * len(positions)
+            spots += [min(p / length, 1.0) * (SAMPLES - 1) if length else 0.0 for p in positions]
+        spots = np.array(spots, dtype=float)
+        self.stripe_owner = np.array(owners, dtype=int)
+        self.stripe_index = np.minimum(spots.astype(int), SAMPLES - 2)
+        self.stripe_t = (spots - self.stripe_index)[:, None]
+        self.stripe_half_w = (np.interp(spots, np.arange(SAMPLES), inner_half) * bg.SNAKE_PATTERN_SIZE_MULTIPLIER)[:, None]
+        self.stripe_half_h = bg.SNAKE_STRIPE_HEIGHT / 2 * unit
+        counts = np.bincount(self.stripe_owner, minlength=len(bodies))
+        self.stripe_ranges = list(zip(np.cumsum(counts) - counts, np.cumsum(counts)))
+
+        self.colors = [
+            (color, bg.darken(color, 0.6), pattern, bg.darken(color, 0.5))
+            for color, pattern in (d["colors"] for d in snake_defs)
+        ]
+        head_size = round(bg.BASE_HEAD_SIZE * unit)
+        self.heads = [asset_manager.image(d["head_path"], (head_size, head_size), fallback=d["colors"][0])
+                      for d in snake_defs]
+        self._rotated = {}  # (snake, angle step) -> rotated head.
+
+    def deform(self, t):
+        """The body points, tangents and normals of every snake at time t (seconds)."""
+        offset = self.sway * np.sin(self.phase - 2 * math.pi * WAVE_SPEED * t)
+        points = self.rest + self.rest_normals * offset[..., None]
+        return (points, *_frames(points))
+
+    def trace(self, snake, times):
+        """One snake's body with point i where deform(times[i]) puts it (a point per SAMPLES)."""
+        offset = self.sway * np.sin(self.phase[snake] - 2 * math.pi * WAVE_SPEED * np.asarray(times))
+        return self.rest[snake] + self.rest_normals[snake] * offset[:, None]
+
+    def _head(self, snake, angle):
+        step = round(angle / HEAD_ANGLE_STEP)
+        head = self._rotated.get((snake, step))
+        if head is None:
+            head = self._rotated[(snake, step)] = pygame.transform.rotate(self.heads[snake], step * HEAD_ANGLE_STEP)
+        return head
+
+    def frame(self, t):
+        """Redraws the snakes as they are at time t and returns the layer surface."""
+        surface = self.surface
+        surface.fill((0, 0, 0, 0))
+        if not len(self.rest):
+            return surface
+        points, tangents, normals = self.deform(t)
+
+        # Body outlines as polygons: one side of the body, then the other side back.
+        outline = normals * self.outline_half
+        inner = normals * self.inner_half
+        outlines = np.concatenate((points + outline, (points - outline)[:, ::-1]), axis=1).tolist()
+        inners = np.concatenate((points + inner, (points - inner)[:, ::-1]), axis=1).tolist()
+
+        owner, index = self.stripe_owner, self.stripe_index
+        centers = points[owner, index] * (1 - self.stripe_t) + points[owner, index + 1] * self.stripe_t
+        along = tangents[owner, index] * self.stripe_half_h
+        across = normals[owner, index] * self.stripe_half_w
+        stripes = np.stack((centers - along + across, centers + along + across,
+                            centers + along - across, centers - along - across), axis=1).tolist()
+
+        heads = points[:, 0].tolist()
+        angles = (np.degrees(np.arctan2(-tangents[:, 0, 1], tangents[:, 0, 0])) - 90).tolist()
+
+        draw_polygon = pygame.draw.polygon
+        for snake, (body, outline_color, pattern, pattern_outline) in enumerate(self.colors):
+            draw_polygon(surface, outline_color, outlines[snake])
+            draw_polygon(surface, body, inners[snake])
+            first, last = self.stripe_ranges[snake]
+            for quad in stripes[first:last]:
+                draw_polygon(surface, pattern, quad)
+                draw_polygon(surface, pattern_outline, quad, 2)
+            head = self._head(snake, angles[snake])
+            surface.blit(head, head.get_rect(center=heads[snake]))
+
+        if self.ladder_overlay:
+            surface.blit(self.ladder_overlay, (0, 0))
+        return surface
+
+def generate_animated_board_assets(size, seed=None):
+    """
+    The board generate_space_board_assets(include_curves=True, seed=seed)
+    makes, set up for animation: returns (surface, snake_layer, snakes_map,
+    ladders_map, grid_map, curves_map), where surface holds only the
+    background and ladders, already scaled to size, and snake_layer draws the
+    snakes at that size.
+    """
+    with bg.seeded_random(seed):
+        snake_pos, ladder_pos, snake_defs, snake_curves, snake_patterns, _ = bg.generate_board_state()
+
+    base = bg.render_board_surface([], [] if bg.LADDER_ON_TOP else ladder_pos, [], [], [], [], draw_background=True)
+    source_size = base.get_size()
+    overlay = None
+    if bg.LADDER_ON_TOP:
+        overlay = bg.render_board_surface([], ladder_pos, [], [], [], [], draw_background=False)
+        overlay = pygame.transform.smoothscale(overlay.convert_alpha(), size)
+    surface = pygame.transform.smoothscale(base.convert_alpha(), size)
+    layer = SnakeLayer(snake_defs, snake_curves, snake_patterns, source_size, size, overlay)
+    return (surface, layer, *bg.board_maps(snake_pos, ladder_pos, snake_curves))
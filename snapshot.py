@@ -0,0 +1,127 @@
+"""
+Snapshot/restore of a SnakeLaddersGame's logic state.
+
+A snapshot is one fixed-layout 31-byte record: mode, turn, flags, positions,
+the game seed, the seed of the board in play and the number of rolls made.
+Boards are stored by seed, not pixels, and the rng is rebuilt by replaying
+the draws of `rolls` rolls from the game seed, so a snapshot is small and
+cheap enough to take every turn (crash recovery, moving a table elsewhere).
+"""
+import os
+import time
+import struct
+from array import array
+from collections import namedtuple
+
+from rules import CLASSIC_SNAKES, CLASSIC_LADDERS
+from timeline import Timeline
+
+MAGIC = b"SLSN"
+VERSION = 1
+MODES = ("classic", "special")
+MAX_PLAYERS = 4
+NO_WINNER = 0xFF
+
+# magic, version, mode, players, turn, flags, winner, roll value, 4 positions, seed, board seed, rolls
+RECORD = struct.Struct("<4sBBBBBBB4BQII")
+
+# Flag bits.
+DICE_ROLLING = 1
+PLAYER_MOVING = 2
+AFTER_MOVE_CHECK = 4
+GAME_OVER = 8
+SEEDED_BOARD = 16  # The board in play is the generated one for board_seed (not the classic fallback).
+
+Snapshot = namedtuple("Snapshot", "mode players turn flags winner roll_value positions seed board_seed rolls")
+
+# --- ENCODING ---
+def take_snapshot(game):
+    """Packs a SnakeLaddersGame's logic state into a snapshot record (bytes)."""
+    players = len(game.players)
+    if players > MAX_PLAYERS:
+        raise ValueError(f"snapshots hold at most {MAX_PLAYERS} players")
+    positions = list(game.state.positions) + [0] * (MAX_PLAYERS - players)
+    flags = ((DICE_ROLLING if game.dice_rolling else 0)
+             | (PLAYER_MOVING if game.player_moving else 0)
+             | (AFTER_MOVE_CHECK if game.after_move_check else 0)
+             | (GAME_OVER if game.game_over else 0)
+             | (SEEDED_BOARD if game.mode == "special" and game.seeded_board else 0))
+    return RECORD.pack(
+        MAGIC, VERSION, MODES.index(game.mode), players, game.current_turn, flags,
+        NO_WINNER if game.winner is None else game.winner, game.roll_value,
+        *positions, game.seed, game.board_seed, game.rolls,
+    )
+
+def read_snapshot(data):
+    """Unpacks a snapshot record into a Snapshot tuple."""
+    if len(data) != RECORD.size:
+        raise ValueError(f"snapshot must be {RECORD.size} bytes, got {len(data)}")
+    (magic, version, mode, players, turn, flags, winner, roll_value,
+     p0, p1, p2, p3, seed, board_seed, rolls) = RECORD.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} snapshot")
+    return Snapshot(
+        MODES[mode], players, turn, flags, None if winner == NO_WINNER else winner,
+        roll_value, (p0, p1, p2, p3)[:players], seed, board_seed, rolls,
+    )
+
+# --- LOGIC RESTORE ---
+def board_layout(snap):
+    """The (snakes, ladders) maps in play, generated from the board seed without rendering."""
+    if not snap.flags & SEEDED_BOARD:
+        return dict(CLASSIC_SNAKES), dict(CLASSIC_LADDERS)
+    from board_generator import generate_board_layout
+    return generate_board_layout(snap.board_seed)
+
+# --- GAME RESTORE ---
+def restore_game(screen, data, player_infos, time_source=time.time):
+    """
+    Rebuilds a SnakeLaddersGame from a snapshot. Only the board in play is
+    generated and rendered; an interrupted dice roll restarts its animation
+    and an interrupted move places the token on its destination.
+    """
+    from game import SnakeLaddersGame
+    from board_generator import generate_space_board_assets
+
+    snap = read_snapshot(data)
+    if len(player_infos) != snap.players:
+        raise ValueError(f"snapshot has {snap.players} players, got {len(player_infos)} avatars")
+    seeded = bool(snap.flags & SEEDED_BOARD)
+    board_assets = generate_space_board_assets(include_curves=True, seed=snap.board_seed) if seeded else None
+    game = SnakeLaddersGame(screen, player_infos, mode="special" if seeded else "classic",
+                            time_source=time_source, board_assets=board_assets, seed=snap.seed)
+    state = game.state
+    state.mode = snap.mode
+    state.board_seed = snap.board_seed
+    state.rolls = snap.rolls
+    state.park()  # The rng is rebuilt from seed and rolls on the next draw.
+    state.positions[:] = array("B", snap.positions)
+    state.turn = snap.turn
+    state.winner = snap.winner
+    game.place_players()
+
+    now = game.now()
+    game.roll_value = snap.roll_value
+    game.current_dice = game.dice_imgs[snap.roll_value - 1]
+    game.dice_rolling = bool(snap.flags & DICE_ROLLING)
+    game.roll_time = now
+    game.player_moving = bool(snap.flags & PLAYER_MOVING)
+    game.after_move_check = bool(snap.flags & AFTER_MOVE_CHECK)
+    game.game_over = bool(snap.flags & GAME_OVER)
+    game.game_over_time = now if game.game_over else None
+    # The timeline starts over from the restored state, not the all-start one the game was built with.
+    game.timeline = Timeline(snap.players)
+    game.record_snapshot(snap.roll_value)
+    return game
+
+# --- FILES ---
+def save_snapshot(path, data):
+    """Writes a snapshot atomically (a crash leaves either the old or the new one)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+def load_snapshot(path):
+    with open(path, "rb") as fh:
+        return fh.read()
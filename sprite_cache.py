@@ -0,0 +1,61 @@
+import math
+
+from asset_manager import SCALE_MODES
+
+# --- CONFIGURATION ---
+SCALE_STEP = 0.005       # Scale factors are rounded to this step before caching.
+MAX_CACHED_SCALES = 64   # Distinct scaled copies kept per source surface.
+PULSE_FRAMES = 120       # Time slots per pulse period (slots with the same scale share a surface).
+
+# --- SCALED FRAMES ---
+class ScaledFrameCache:
+    """
+    Scaled copies of one surface, keyed by quantized scale factor.
+
+    Nearby scale factors share a frame, and at most max_frames copies are
+    kept (oldest dropped first), so an animation that revisits the same
+    scales allocates nothing once every frame has been built.
+    """
+    def __init__(self, surface, mode="fast", step=SCALE_STEP, max_frames=MAX_CACHED_SCALES):
+        self.surface = surface
+        self.scale_fn = SCALE_MODES[mode]
+        self.step = step
+        self.max_frames = max_frames
+        self.frames = {}  # Quantized scale step -> pygame.Surface
+
+    def frame(self, scale):
+        """Returns the surface scaled by `scale` (rounded to the cache step)."""
+        key = round(scale / self.step)
+        surf = self.frames.get(key)
+        if surf is None:
+            if key == round(1 / self.step):
+                surf = self.surface
+            else:
+                w, h = self.surface.get_size()
+                q = key * self.step
+                surf = self.scale_fn(self.surface, (max(1, int(w * q)), max(1, int(h * q))))
+            if len(self.frames) >= self.max_frames:
+                del self.frames[next(iter(self.frames))]
+            self.frames[key] = surf
+        return surf
+
+# --- PULSE ANIMATION ---
+class PulseAnimation:
+    """
+    A sine-wave size pulse around a fixed center, precomputed for one period.
+
+    frame_at(t) indexes the period by time and returns a (surface, rect) pair
+    that is shared between calls, so drawing the pulse allocates nothing.
+    """
+    def __init__(self, surface, center, amplitude=0.05, speed=3.0, frames=PULSE_FRAMES, mode="fast"):
+        self.period = 2 * math.pi / speed
+        cache = ScaledFrameCache(surface, mode, max_frames=frames)
+        self.frames = []
+        for i in range(frames):
+            img = cache.frame(1 + amplitude * math.sin(2 * math.pi * i / frames))
+            self.frames.append((img, img.get_rect(center=center)))
+
+    def frame_at(self, t):
+        """Returns the (surface, rect) shown `t` seconds into the animation."""
+        index = int(t / self.period * len(self.frames)) % len(self.frames)
+        return self.frames[index]
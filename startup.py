@@ -0,0 +1,56 @@
+"""
+Cold-start timing for `python main.py --profile-startup`.
+
+begin() runs before main.py's own imports and times every module main.py
+imports (each including whatever it pulls in); mark() then records the init
+steps up to the first menu frame, and report() formats both. Nothing here
+imports pygame, so the pygame import itself is measured too.
+"""
+import sys
+import time
+import builtins
+
+_original_import = builtins.__import__
+_began = None
+_imports = []  # (module name, seconds) for each first-time import made by __main__.
+_marks = []    # (label, seconds since the previous mark).
+_last = None
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules or not globals or globals.get("__name__") != "__main__":
+        return _original_import(name, globals, locals, fromlist, level)
+    t0 = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _imports.append((name, time.perf_counter() - t0))
+
+def begin(enabled=True):
+    """Starts the clock and, if enabled, times main.py's imports from here on."""
+    global _began, _last
+    if not enabled:
+        return
+    _began = _last = time.perf_counter()
+    builtins.__import__ = _timed_import
+
+def mark(label):
+    """Records the time since the previous mark (or since begin) under label."""
+    global _last
+    if _began is None:
+        return
+    now = time.perf_counter()
+    if label == "imports":
+        builtins.__import__ = _original_import  # Only main.py's top-level imports are timed.
+    _marks.append((label, now - _last))
+    _last = now
+
+def report():
+    """The import and init breakdown, slowest imports first, as printable text."""
+    if _began is None:
+        return ""
+    lines = [f"startup: {(_last - _began) * 1000:.0f}ms to first menu frame"]
+    lines += [f"  {label:<22}{seconds * 1000:8.1f}ms" for label, seconds in _marks]
+    lines.append("  imports:")
+    for name, seconds in sorted(_imports, key=lambda item: -item[1]):
+        lines.append(f"    {name:<20}{seconds * 1000:8.1f}ms")
+    return "\n".join(lines)
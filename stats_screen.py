@@ -0,0 +1,83 @@
+# stats_screen.py
+import os
+import pygame
+import asset_manager
+from scenes import Scene
+from howtoplay import BACK_IMG, BACK_SIZE
+
+TITLE_COLOR = (255, 215, 0)
+TEXT_COLOR = (235, 235, 235)
+HEADER_COLOR = (150, 150, 150)
+BOARD_ROWS = 6  # Most played boards listed.
+ROW_HEIGHT = 36
+COLUMNS = (320, 580, 720, 880, 1020)  # Clear of the back button in the bottom-left corner.
+
+def avatar_name(path):
+    """'assets/players/player_kao.png' -> 'kao'."""
+    return os.path.splitext(os.path.basename(path))[0].removeprefix("player_")
+
+class StatsScene(Scene):
+    """
+    Win rates per avatar and per board from the stats store, pushed over the
+    main menu with S. The tables are read and rendered once on enter (the
+    store's summary tables make that instant), so draw() only blits.
+    ESC or the back button pops it.
+    """
+    resident = True
+
+    def __init__(self, manager):
+        super().__init__(manager)
+        sw, sh = self.screen.get_size()
+        self.title_font = pygame.font.SysFont("Pixeltype", 96)
+        self.font = pygame.font.SysFont("Pixeltype", 40)
+        self.back_img = asset_manager.image(BACK_IMG, BACK_SIZE, mode="fast")
+        self.back_rect = self.back_img.get_rect(topleft=(24, sh - self.back_img.get_height() - 24))
+        self.lines = []  # [(text surface, position)], rebuilt on enter.
+
+    def enter(self, payload=None):
+        store = self.manager.stats
+        sw = self.screen.get_width()
+        lines = []
+
+        def text(value, pos, color=TEXT_COLOR):
+            lines.append((self.font.render(value, True, color), pos))
+
+        title = self.title_font.render("Statistics", True, TITLE_COLOR)
+        lines.append((title, title.get_rect(midtop=(sw // 2, 40))))
+        if store is None:
+            text("No stats store is open.", (COLUMNS[0], 180))
+            self.lines = lines
+            return
+
+        def row(values, y, color=TEXT_COLOR):
+            for value, x in zip(values, COLUMNS):
+                text(value, (x, y), color)
+
+        y = 150
+        text(f"{store.total_games()} games played", (COLUMNS[0], y), HEADER_COLOR)
+        y += 50
+        row(("Avatar", "Games", "Win rate", "Snakes", "Ladders"), y, HEADER_COLOR)
+        for stats in store.avatar_stats():
+            y += ROW_HEIGHT
+            row((avatar_name(stats.avatar), str(stats.games), f"{stats.win_rate:.1%}",
+                 str(stats.snake_hits), str(stats.ladder_hits)), y)
+
+        y += 60
+        row(("Board", "Games", "P1 wins", "Avg turns"), y, HEADER_COLOR)
+        for stats in store.board_stats(BOARD_ROWS):
+            y += ROW_HEIGHT
+            board = "Classic" if stats.mode == "classic" else f"Special #{stats.board_seed}"
+            row((board, str(stats.games), f"{stats.first_seat_win_rate:.1%}", f"{stats.average_turns:.1f}"), y)
+        self.lines = lines
+
+    def handle_event(self, e):
+        # Return to the main menu if ESC is pressed or the back button is clicked.
+        if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
+            self.manager.pop()
+        elif e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 and self.back_rect.collidepoint(e.pos):
+            self.manager.pop()
+
+    def draw(self, screen):
+        screen.fill((18, 18, 18))
+        screen.blits(self.lines, doreturn=False)
+        screen.blit(self.back_img, self.back_rect)
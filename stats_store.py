@@ -0,0 +1,221 @@
+"""
+Persistent game statistics in a local SQLite database (WAL mode).
+
+record_game() only puts the result on a queue, so the game loop never
+waits on disk. A worker thread owns the write connection. It takes whatever
+has queued up (waiting up to BATCH_WINDOW for more) and commits it in one
+transaction. The same transaction updates the per-avatar and per-board
+summary tables, which are keyed (indexed) on exactly what the stats screen
+asks for. Opening the screen therefore reads a few small rows, however many
+games are stored. Readers use their own connection; WAL lets them read while
+the worker writes.
+
+    python stats_store.py                    # print the summary
+    python stats_store.py --fake 200000      # fill a scratch database, then time the queries
+"""
+import sys
+import time
+import queue
+import random
+import sqlite3
+import argparse
+import threading
+from collections import namedtuple
+
+from game_state import initial_board_seed
+
+DEFAULT_PATH = "stats.sqlite3"
+BATCH_SIZE = 500       # Games committed per transaction, at most.
+BATCH_WINDOW = 0.25    # Seconds the worker waits for more games before committing.
+CLASSIC_BOARD = 0      # board_seed stored for the classic board (as in replay logs).
+
+# One seat of a finished game.
+SeatResult = namedtuple("SeatResult", "avatar snake_hits ladder_hits")
+# A finished game; winner is a seat index.
+GameResult = namedtuple("GameResult", "mode seed board_seed turns winner seats played_at")
+
+AvatarStats = namedtuple("AvatarStats", "avatar games wins win_rate snake_hits ladder_hits")
+BoardStats = namedtuple("BoardStats", "mode board_seed games first_seat_win_rate average_turns")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    mode TEXT NOT NULL,
+    seed INTEGER,
+    board_seed INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    winner INTEGER
+);
+CREATE TABLE IF NOT EXISTS seats (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    seat INTEGER NOT NULL,
+    avatar TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    snake_hits INTEGER NOT NULL,
+    ladder_hits INTEGER NOT NULL,
+    PRIMARY KEY (game_id, seat)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS seats_by_avatar ON seats (avatar, won);
+CREATE INDEX IF NOT EXISTS games_by_board ON games (mode, board_seed);
+
+-- Running totals, kept in step with the tables above by the writer.
+CREATE TABLE IF NOT EXISTS avatar_totals (
+    avatar TEXT PRIMARY KEY,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    snake_hits INTEGER NOT NULL,
+    ladder_hits INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS board_totals (
+    mode TEXT NOT NULL,
+    board_seed INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    first_seat_wins INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    PRIMARY KEY (mode, board_seed)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS board_totals_by_games ON board_totals (games DESC);
+"""
+
+def connect(path):
+    """A connection in WAL mode; autocommit, so transactions are explicit."""
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; a crash loses at most the last batch.
+    conn.executescript(SCHEMA)
+    return conn
+
+def _write_batch(conn, games):
+    """Inserts finished games and updates the running totals, in one transaction."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for game in games:
+            cursor = conn.execute(
+                "INSERT INTO games (played_at, mode, seed, board_seed, players, turns, winner) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (game.played_at, game.mode, game.seed, game.board_seed, len(game.seats), game.turns, game.winner))
+            seats = [(cursor.lastrowid, i, s.avatar, int(i == game.winner), s.snake_hits, s.ladder_hits)
+                     for i, s in enumerate(game.seats)]
+            conn.executemany("INSERT INTO seats VALUES (?, ?, ?, ?, ?, ?)", seats)
+            conn.executemany(
+                "INSERT INTO avatar_totals VALUES (?, 1, ?, ?, ?) ON CONFLICT (avatar) DO UPDATE SET "
+                "games = games + 1, wins = wins + excluded.wins, "
+                "snake_hits = snake_hits + excluded.snake_hits, ladder_hits = ladder_hits + excluded.ladder_hits",
+                [(avatar, won, snakes, ladders) for _, _, avatar, won, snakes, ladders in seats])
+            conn.execute(
+                "INSERT INTO board_totals VALUES (?, ?, 1, ?, ?) ON CONFLICT (mode, board_seed) DO UPDATE SET "
+                "games = games + 1, first_seat_wins = first_seat_wins + excluded.first_seat_wins, "
+                "turns = turns + excluded.turns",
+                (game.mode, game.board_seed, int(game.winner == 0), game.turns))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+class StatsStore:
+    """Queues game results for the writer thread and answers the stats screen's queries."""
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.queue = queue.SimpleQueue()
+        self.reader = connect(path)  # Created first, so the schema exists before any write.
+        self.written = 0
+        self._thread = threading.Thread(target=self._run, name="stats-writer", daemon=True)
+        self._thread.start()
+
+    # --- Writes (game loop side) ---
+    def record_game(self, result):
+        """Queues a GameResult; returns immediately."""
+        self.queue.put(result)
+
+    def _run(self):
+        conn = connect(self.path)
+        try:
+            while True:
+                batch = [self.queue.get()]
+                deadline = time.monotonic() + BATCH_WINDOW
+                while len(batch) < BATCH_SIZE and batch[-1] is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self.queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                stopping = batch[-1] is None
+                games = [game for game in batch if game is not None]
+                if games:
+                    _write_batch(conn, games)
+                    self.written += len(games)
+                if stopping:
+                    return
+        finally:
+            conn.close()
+
+    def close(self):
+        """Commits everything queued so far and stops the writer."""
+        self.queue.put(None)
+        self._thread.join()
+        self.reader.close()
+
+    # --- Reads (stats screen) ---
+    def avatar_stats(self):
+        """Win rate and hit totals per avatar, most games first."""
+        rows = self.reader.execute(
+            "SELECT avatar, games, wins, snake_hits, ladder_hits FROM avatar_totals ORDER BY games DESC, avatar")
+        return [AvatarStats(a, g, w, w / g if g else 0.0, s, l) for a, g, w, s, l in rows]
+
+    def board_stats(self, limit=10):
+        """The most played boards, with the first seat's win rate and the average game length."""
+        rows = self.reader.execute(
+            "SELECT mode, board_seed, games, first_seat_wins, turns FROM board_totals "
+            "ORDER BY games DESC LIMIT ?", (limit,))
+        return [BoardStats(m, b, g, f / g if g else 0.0, t / g if g else 0.0) for m, b, g, f, t in rows]
+
+    def total_games(self):
+        return self.reader.execute("SELECT COALESCE(SUM(games), 0) FROM board_totals").fetchone()[0]
+
+def game_result(game):
+    """The GameResult of a finished SnakeLaddersGame, on the board it started with."""
+    board_seed = initial_board_seed(game.seed) if game.mode == "special" else CLASSIC_BOARD
+    seats = [SeatResult(p.image_path, snakes, ladders) for p, (snakes, ladders) in zip(game.players, game.hits)]
+    return GameResult(game.mode, game.seed, board_seed, game.rolls, game.winner, seats, time.time())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show (or stress-test) the local game statistics.")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    parser.add_argument("--fake", type=int, default=0, metavar="N", help="First record N random games.")
+    args = parser.parse_args(argv)
+
+    store = StatsStore(args.db)
+    if args.fake:
+        rng = random.Random(0)
+        avatars = ["kao", "king", "phum", "sorkhaw"]
+        start = time.perf_counter()
+        for _ in range(args.fake):
+            players = rng.randint(2, 4)
+            mode = rng.choice(("classic", "special"))
+            seats = [SeatResult(a, rng.randint(0, 6), rng.randint(0, 6)) for a in rng.sample(avatars, players)]
+            board = CLASSIC_BOARD if mode == "classic" else rng.randrange(1, 5000)
+            store.record_game(GameResult(mode, rng.getrandbits(32), board, rng.randint(20, 150),
+                                         rng.randrange(players), seats, time.time()))
+        queued = time.perf_counter() - start
+        store.close()
+        print(f"queued {args.fake} games in {queued * 1000:.0f}ms, committed in "
+              f"{time.perf_counter() - start:.2f}s")
+        store = StatsStore(args.db)
+
+    start = time.perf_counter()
+    avatars, boards, total = store.avatar_stats(), store.board_stats(), store.total_games()
+    print(f"{total} games (queries took {(time.perf_counter() - start) * 1000:.1f}ms)")
+    for row in avatars:
+        print(f"  {row.avatar:<40} {row.games:>8} games  {row.win_rate:6.1%} wins  "
+              f"{row.snake_hits} snakes  {row.ladder_hits} ladders")
+    for row in boards:
+        print(f"  {row.mode:<8} board {row.board_seed:<12} {row.games:>8} games  "
+              f"P1 wins {row.first_seat_win_rate:6.1%}  {row.average_turns:.1f} turns")
+    store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,138 @@
+"""
+Structured runtime telemetry as JSON lines.
+
+emit(kind, **fields) stamps an event and appends it to an in-memory deque.
+That is all the render loop ever pays: there are no locks and no I/O. A
+daemon thread wakes every flush_interval seconds, serializes whatever is
+buffered and appends it to the log in one write. It rotates the file at
+max_bytes and keeps `backups` old files (log.1, log.2, ...). When the writer
+falls behind, the oldest events are dropped and counted, never waited for.
+Frame times are sampled at sample_rate; every other event is always recorded.
+Until start() is called every call is a no-op:
+
+    python main.py --telemetry telemetry.jsonl --telemetry-sample 0.1
+
+Event kinds: session, frame, scene, board, asset, game.
+"""
+import os
+import json
+import time
+import atexit
+import threading
+from collections import deque
+
+DEFAULT_SAMPLE_RATE = 0.05     # Fraction of frames whose time is recorded.
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUPS = 3
+DEFAULT_FLUSH_INTERVAL = 1.0   # Seconds between background flushes.
+MAX_BUFFERED = 50_000          # Events held in memory before the oldest are dropped.
+
+class TelemetrySink:
+    """The event buffer and the background thread that writes it out."""
+    def __init__(self, path, sample_rate=DEFAULT_SAMPLE_RATE, max_bytes=DEFAULT_MAX_BYTES,
+                 backups=DEFAULT_BACKUPS, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.buffer = deque(maxlen=MAX_BUFFERED)
+        self.dropped = 0
+        self.written = 0
+        self._frame_credit = 0.0
+        self._wake = threading.Event()
+        self._stopping = False
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+
+    # --- Producer side (any thread, never blocks) ---
+    def emit(self, kind, fields):
+        buffer = self.buffer
+        if len(buffer) == MAX_BUFFERED:
+            self.dropped += 1  # deque(maxlen) drops the oldest on append.
+        buffer.append({"t": round(time.time(), 4), "kind": kind, **fields})
+
+    def frame(self, ms, fields):
+        """Records one frame time in every 1 / sample_rate frames."""
+        self._frame_credit += self.sample_rate
+        if self._frame_credit >= 1.0:
+            self._frame_credit -= 1.0
+            fields["ms"] = round(ms, 3)
+            self.emit("frame", fields)
+
+    # --- Writer side (background thread) ---
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush()
+
+    def _flush(self):
+        buffer = self.buffer
+        count = len(buffer)
+        if not count:
+            return
+        lines = [json.dumps(buffer.popleft(), separators=(",", ":")) for _ in range(count)]
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        self.written += count
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        """log -> log.1 -> log.2 ..., keeping `backups` old files (like logging's RotatingFileHandler)."""
+        self._file.close()
+        if self.backups:
+            for i in range(self.backups - 1, 0, -1):
+                older = f"{self.path}.{i}"
+                if os.path.exists(older):
+                    os.replace(older, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        """Writes out everything still buffered and stops the thread."""
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        self._flush()
+        self._file.close()
+
+# --- MODULE API ---
+_sink = None
+
+def start(path, sample_rate=DEFAULT_SAMPLE_RATE, max_bytes=DEFAULT_MAX_BYTES, backups=DEFAULT_BACKUPS,
+          flush_interval=DEFAULT_FLUSH_INTERVAL):
+    """Starts recording to path (appending); stop() runs at exit."""
+    global _sink
+    stop()
+    _sink = TelemetrySink(path, sample_rate, max_bytes, backups, flush_interval)
+    atexit.register(stop)
+    emit("session", event="start", pid=os.getpid(), sample_rate=sample_rate)
+    return _sink
+
+def stop():
+    """Flushes and closes the log, if one is open."""
+    global _sink
+    sink, _sink = _sink, None
+    if sink:
+        sink.emit("session", {"event": "end", "dropped": sink.dropped})
+        sink.close()
+
+def enabled():
+    return _sink is not None
+
+def emit(kind, **fields):
+    """Records an event, e.g. emit("scene", scene="game"); free when telemetry is off."""
+    if _sink is not None:
+        _sink.emit(kind, fields)
+
+def frame(ms, **fields):
+    """Records a frame time, subject to the sample rate."""
+    if _sink is not None:
+        _sink.frame(ms, fields)
@@ -0,0 +1,88 @@
+"""
+Rewind timeline: the last N turn states of a game in a fixed-size ring buffer.
+
+Each snapshot is one compact SNAPSHOT record (positions, whose turn it is,
+the roll that led there, the turn index, the board seed in play, the number
+of rolls made and the snake/ladder hit counters) packed into a bytearray allocated once up front.
+Recording overwrites the oldest record when the buffer is full, so memory
+stays at capacity * SNAPSHOT.size bytes however long the session runs.
+
+The timeline keeps a cursor on the state being shown. back() and forward()
+step it through the buffer (undo, redo and debug stepping). Recording while
+the cursor is not on the newest snapshot drops the newer ones, as an editor's
+undo history does. SnakeLaddersGame.restore() puts a snapshot back on the board.
+"""
+import struct
+from collections import namedtuple
+
+DEFAULT_CAPACITY = 256  # Turns kept; 256 * SNAPSHOT.size is about 8.5 KB.
+MAX_SEATS = 4
+
+# positions[4], seat to move, roll that led here, turn index, board seed, rolls made, [snake hits, ladder hits] per seat.
+SNAPSHOT = struct.Struct(f"<{MAX_SEATS}BBBIII{2 * MAX_SEATS}H")
+
+Snapshot = namedtuple("Snapshot", "turn_index seat roll board_seed rolls positions hits")
+
+class Timeline:
+    """A ring buffer of Snapshot records with a cursor for stepping through them."""
+    def __init__(self, players, capacity=DEFAULT_CAPACITY):
+        if not 1 <= players <= MAX_SEATS:
+            raise ValueError(f"a timeline holds 1 to {MAX_SEATS} seats")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.players = players
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * SNAPSHOT.size)
+        # Absolute record numbers: records first..last-1 are held, cursor is the one shown.
+        self.first = 0
+        self.last = 0
+        self.cursor = -1
+
+    def __len__(self):
+        return self.last - self.first
+
+    def footprint(self):
+        """Bytes held by the record buffer (constant)."""
+        return len(self.buffer)
+
+    def record(self, turn_index, seat, roll, board_seed, rolls, positions, hits):
+        """Stores a snapshot after the cursor, dropping any newer ones, and moves the cursor to it."""
+        self.last = self.cursor + 1
+        padding = MAX_SEATS - len(positions)
+        flat_hits = [min(count, 0xFFFF) for pair in hits for count in pair]
+        SNAPSHOT.pack_into(self.buffer, (self.last % self.capacity) * SNAPSHOT.size,
+                           *positions, *[0] * padding, seat, roll, turn_index, board_seed & 0xFFFFFFFF, rolls,
+                           *flat_hits, *[0] * (2 * padding))
+        self.last += 1
+        self.first = max(self.first, self.last - self.capacity)
+        self.cursor = self.last - 1
+
+    def snapshot(self, number):
+        """The snapshot with absolute record number `number` (first <= number < last)."""
+        if not self.first <= number < self.last:
+            raise IndexError("snapshot is no longer (or not yet) in the timeline")
+        fields = SNAPSHOT.unpack_from(self.buffer, (number % self.capacity) * SNAPSHOT.size)
+        players = self.players
+        positions = fields[:players]
+        seat, roll, turn_index, board_seed, rolls = fields[MAX_SEATS:MAX_SEATS + 5]
+        hits = fields[MAX_SEATS + 5:]
+        return Snapshot(turn_index, seat, roll, board_seed, rolls, positions,
+                        [[hits[2 * i], hits[2 * i + 1]] for i in range(players)])
+
+    def current(self):
+        """The snapshot under the cursor, or None before anything is recorded."""
+        return self.snapshot(self.cursor) if self.cursor >= self.first else None
+
+    def back(self):
+        """Moves the cursor one snapshot older and returns it (None at the oldest one kept)."""
+        if self.cursor <= self.first:
+            return None
+        self.cursor -= 1
+        return self.snapshot(self.cursor)
+
+    def forward(self):
+        """Moves the cursor one snapshot newer and returns it (None at the newest one)."""
+        if self.cursor >= self.last - 1:
+            return None
+        self.cursor += 1
+        return self.snapshot(self.cursor)
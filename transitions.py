@@ -1,80 +1,87 @@
-import pygame
-import sys
+import asset_manager
 
-def curtain_transition(screen, old_surface, new_surface, curtain_image_path, duration=0.6):
+CURTAIN_IMAGE = "assets/bg/transitions.png"
+CURTAIN_FALLBACK_COLOR = (20, 20, 40)
+HOLD_DURATION = 0.1  # Seconds the curtain stays closed between the two phases.
+
+def curtain_request(screen_size, curtain_image_path=CURTAIN_IMAGE):
+    """The curtain image request, for the startup preloader."""
+    return asset_manager.AssetRequest(curtain_image_path, screen_size, "fast", True, CURTAIN_FALLBACK_COLOR)
+
+def smoothstep(progress):
+    """Eases a 0-1 progress value in and out."""
+    return progress * progress * (3.0 - 2.0 * progress)
+
+class CurtainTransition:
     """
-    Performs a two-phase curtain transition between two surfaces.
+    A two-phase curtain animation driven by the caller's frame loop.
 
-    Phase 1: A curtain image slides down from the top to cover the old_surface.
-    Phase 2: After a brief pause, the new_surface is revealed as the curtain
-             continues to slide down and off the screen.
+    Phase 1 ("cover"): the curtain slides down from the top over the old scene.
+    Hold: the curtain rests over the screen for a moment.
+    Phase 2 ("reveal"): the curtain keeps sliding down and off, revealing the new scene.
 
-    Args:
-        screen (pygame.Surface): The main display surface.
-        old_surface (pygame.Surface): The surface to transition from.
-        new_surface (pygame.Surface): The surface to transition to.
-        curtain_image_path (str): Path to the image used for the curtain.
-        duration (float): The duration of each phase of the transition in seconds.
+    Nothing blocks: call update(dt) and draw(screen) once per frame. The old and
+    new scenes may be Surfaces or callables that draw onto the screen, and
+    on_covered (if given) runs once when the curtain first fully covers the
+    screen, so the next scene can be built while nothing of it is visible yet.
+    The curtain surface comes from the asset cache, so it is decoded only once.
     """
-    clock = pygame.time.Clock()
-    screen_width, screen_height = screen.get_size()
-    
-    # Load the curtain image.
-    try:
-        curtain = pygame.image.load(curtain_image_path).convert_alpha()
-        curtain = pygame.transform.scale(curtain, (screen_width, screen_height))
-    except pygame.error:
-        # If the image fails to load, use a solid dark color as a fallback.
-        curtain = pygame.Surface((screen_width, screen_height))
-        curtain.fill((20, 20, 40))
-    
-    # ========== Phase 1: Curtain slides down to cover the screen ==========
-    elapsed = 0
-    while elapsed < duration:
-        dt = clock.tick(60) / 1000.0
-        elapsed += dt
-        
-        # Use a smoothstep function for eased animation.
-        progress = min(elapsed / duration, 1.0)
-        smooth_progress = progress * progress * (3.0 - 2.0 * progress)
-        
-        # The curtain starts at y = -screen_height (off-screen top) and moves to y = 0.
-        curtain_y = -screen_height + int(smooth_progress * screen_height)
-        
-        screen.blit(old_surface, (0, 0))
-        screen.blit(curtain, (0, curtain_y))
-        pygame.display.flip()
-        
-        # Ensure the application can be closed during the transition.
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-    
-    # Pause for a moment when the curtain fully covers the screen.
-    screen.blit(old_surface, (0, 0))
-    screen.blit(curtain, (0, 0))
-    pygame.display.flip()
-    pygame.time.wait(100)  # Pause for 0.1 seconds.
+    def __init__(self, screen_size, old_scene, new_scene=None, curtain_image_path=CURTAIN_IMAGE,
+                 duration=0.6, hold=HOLD_DURATION, on_covered=None):
+        self.width, self.height = screen_size
+        self.old_scene = old_scene
+        self.new_scene = new_scene
+        self.duration = duration
+        self.hold = hold
+        self.on_covered = on_covered
+        self.curtain = asset_manager.ASSETS.request(curtain_request(screen_size, curtain_image_path))
+        self.elapsed = 0.0
+
+    @property
+    def phase(self):
+        if self.elapsed < self.duration:
+            return "cover"
+        if self.elapsed < self.duration + self.hold:
+            return "hold"
+        if self.elapsed < 2 * self.duration + self.hold:
+            return "reveal"
+        return "done"
+
+    @property
+    def done(self):
+        return self.phase == "done"
+
+    def update(self, dt):
+        """Advances the animation by dt seconds."""
+        was_covering = self.elapsed < self.duration
+        self.elapsed += dt
+        if was_covering and self.elapsed >= self.duration and self.on_covered:
+            callback, self.on_covered = self.on_covered, None
+            callback()
+
+    def _draw_scene(self, screen, scene):
+        if scene is None:
+            screen.fill((0, 0, 0))
+        elif callable(scene):
+            scene(screen)
+        else:
+            screen.blit(scene, (0, 0))
 
-    # ========== Phase 2: Curtain slides away to reveal the new screen ==========
-    elapsed = 0
-    while elapsed < duration:
-        dt = clock.tick(60) / 1000.0
-        elapsed += dt
-        
-        progress = min(elapsed / duration, 1.0)
-        smooth_progress = progress * progress * (3.0 - 2.0 * progress)
-        
-        # The curtain starts at y = 0 and moves down to y = screen_height (off-screen bottom).
-        curtain_y = int(smooth_progress * screen_height)
-        
-        # Draw the new surface underneath the moving curtain.
-        screen.blit(new_surface, (0, 0))
-        screen.blit(curtain, (0, curtain_y))
-        pygame.display.flip()
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
\ No newline at end of file
+    def draw(self, screen):
+        """Draws the scene that is currently visible with the curtain over it."""
+        phase = self.phase
+        if phase == "cover":
+            # The curtain starts at y = -height (off-screen top) and moves to y = 0.
+            progress = smoothstep(min(self.elapsed / self.duration, 1.0))
+            self._draw_scene(screen, self.old_scene)
+            screen.blit(self.curtain, (0, -self.height + int(progress * self.height)))
+        elif phase == "hold":
+            self._draw_scene(screen, self.old_scene)
+            screen.blit(self.curtain, (0, 0))
+        else:
+            # The curtain moves from y = 0 down to y = height (off-screen bottom).
+            reveal = self.elapsed - self.duration - self.hold
+            progress = smoothstep(min(reveal / self.duration, 1.0))
+            self._draw_scene(screen, self.new_scene)
+            if phase == "reveal":
+                screen.blit(self.curtain, (0, int(progress * self.height)))
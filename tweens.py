@@ -0,0 +1,149 @@
+import math
+from bisect import bisect_left
+
+# --- CONFIGURATION ---
+HOP_DURATION = 0.16      # Seconds spent hopping from one tile to the next.
+HOP_HEIGHT = 18          # Peak height (pixels) of each tile hop.
+SLIDE_SPEED = 420        # Pixels per second when sliding along a snake or ladder.
+MIN_SLIDE_DURATION = 0.35
+ARC_LENGTH_SAMPLES = 64  # Resolution of the arc-length lookup table for slides.
+
+# --- EASING FUNCTIONS ---
+def ease_linear(u):
+    """No easing."""
+    return u
+
+def ease_in_out_quad(u):
+    """Accelerates through the first half and decelerates through the second."""
+    return 2 * u * u if u < 0.5 else 1 - (-2 * u + 2) ** 2 / 2
+
+def ease_out_quad(u):
+    """Starts fast and decelerates to a stop."""
+    return 1 - (1 - u) * (1 - u)
+
+def smoothstep(u):
+    """The same curve used by the curtain transition."""
+    return u * u * (3.0 - 2.0 * u)
+
+# --- ARC-LENGTH TABLES ---
+def build_arc_length_table(points, samples=ARC_LENGTH_SAMPLES):
+    """
+    Resamples a polyline into points spaced evenly by distance travelled.
+
+    Returns (table, length) where table[i] is the point reached after
+    travelling i / (len(table) - 1) of the total length. Evaluating a
+    position along the curve is then a single index computation.
+    """
+    if len(points) < 2:
+        point = tuple(points[0]) if points else (0.0, 0.0)
+        return [point, point], 0.0
+
+    # Cumulative distance at every vertex of the polyline.
+    cumulative = [0.0]
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        cumulative.append(cumulative[-1] + math.hypot(x1 - x0, y1 - y0))
+    length = cumulative[-1]
+    if length == 0:
+        point = tuple(points[0])
+        return [point, point], 0.0
+
+    table = []
+    for i in range(samples + 1):
+        target = length * i / samples
+        j = max(1, min(bisect_left(cumulative, target), len(points) - 1))
+        seg = cumulative[j] - cumulative[j - 1]
+        ratio = (target - cumulative[j - 1]) / seg if seg > 0 else 0.0
+        (x0, y0), (x1, y1) = points[j - 1], points[j]
+        table.append((x0 + (x1 - x0) * ratio, y0 + (y1 - y0) * ratio))
+    return table, length
+
+def slide_times(points, speed=SLIDE_SPEED):
+    """
+    Seconds into an add_slide(points[1:]) slide from points[0] (default
+    easing) at which the token passes each point, e.g. to bend a moving
+    path to where it will be by then.
+    """
+    cumulative = [0.0]
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        cumulative.append(cumulative[-1] + math.hypot(x1 - x0, y1 - y0))
+    length = cumulative[-1]
+    if length == 0:
+        return [0.0] * len(points)
+    duration = max(MIN_SLIDE_DURATION, length / speed)
+    # Inverse of ease_in_out_quad: the time fraction at which a distance fraction is reached.
+    return [duration * (math.sqrt(u / 2) if u < 0.5 else 1 - math.sqrt((1 - u) / 2))
+            for u in (d / length for d in cumulative)]
+
+# --- TRACK CLASS ---
+class Track:
+    """
+    A precomputed parametric movement track.
+
+    A track is a short sequence of phases (tile hops followed by an optional
+    slide). Every phase is evaluated in constant time from the elapsed time,
+    so nothing is consumed or reallocated while the token animates.
+    """
+    __slots__ = ("start_time", "duration", "phases", "end")
+
+    def __init__(self, start_time, origin):
+        self.start_time = start_time
+        self.duration = 0.0
+        self.phases = []  # (t0, duration, kind, data) tuples.
+        self.end = tuple(origin)
+
+    def add_hops(self, points, hop_duration=HOP_DURATION, height=HOP_HEIGHT, easing=ease_in_out_quad):
+        """Appends one eased, arced hop per point, starting from the current end."""
+        if not points:
+            return self
+        stops = [self.end] + [tuple(p) for p in points]
+        duration = hop_duration * len(points)
+        self.phases.append((self.duration, duration, "hops", (stops, hop_duration, height, easing)))
+        self.duration += duration
+        self.end = stops[-1]
+        return self
+
+    def add_slide(self, points, speed=SLIDE_SPEED, easing=ease_in_out_quad):
+        """Appends a slide along a polyline, traversed at constant arc-length speed."""
+        table, length = build_arc_length_table([self.end] + [tuple(p) for p in points])
+        if length == 0:
+            return self
+        duration = max(MIN_SLIDE_DURATION, length / speed)
+        self.phases.append((self.duration, duration, "slide", (table, easing)))
+        self.duration += duration
+        self.end = table[-1]
+        return self
+
+    def finished(self, now):
+        """Returns True once the whole track has been traversed."""
+        return now - self.start_time >= self.duration
+
+    def position(self, now):
+        """Evaluates the track at the given time."""
+        t = now - self.start_time
+        if t >= self.duration:
+            return self.end
+        if t < 0:
+            t = 0.0
+
+        # A move has at most a couple of phases, so this scan is bounded.
+        for t0, duration, kind, data in self.phases:
+            if t < t0 + duration:
+                local = t - t0
+                break
+        else:
+            return self.end
+
+        if kind == "hops":
+            stops, hop_duration, height, easing = data
+            index = min(int(local / hop_duration), len(stops) - 2)
+            u = easing(min((local - index * hop_duration) / hop_duration, 1.0))
+            (x0, y0), (x1, y1) = stops[index], stops[index + 1]
+            lift = height * 4 * u * (1 - u)
+            return (x0 + (x1 - x0) * u, y0 + (y1 - y0) * u - lift)
+
+        table, easing = data
+        s = easing(local / duration) * (len(table) - 1)
+        index = min(int(s), len(table) - 2)
+        frac = s - index
+        (x0, y0), (x1, y1) = table[index], table[index + 1]
+        return (x0 + (x1 - x0) * frac, y0 + (y1 - y0) * frac)